@@ -1,7 +1,9 @@
 from .managers import ComponentManager  
 from .outputs import DashboardOutput
+from .routes import init_app
 
 __all__ = [
     'ComponentManager',
-    'DashboardOutput'
+    'DashboardOutput',
+    'init_app',
 ]
\ No newline at end of file
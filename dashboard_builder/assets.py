@@ -0,0 +1,329 @@
+# dashboard_builder/assets.py
+
+import functools
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+
+import plotly.offline
+from flask import url_for
+from werkzeug.routing import BuildError
+
+from .cache import get_default_cache
+from .serialization import dumps_json
+
+PLOTLY_JS_VERSION = plotly.offline.get_plotlyjs_version()
+PLOTLY_JS_CDN = f"https://cdn.plot.ly/plotly-{PLOTLY_JS_VERSION}.min.js"
+
+# Where assets are stored when no cache backend is configured, and the limits
+# they are pruned to, see set_asset_dir()
+_asset_dir = os.path.join(tempfile.gettempdir(), 'dashboard_builder_assets')
+_max_age = None
+_max_size = None
+
+# The asset directory is pruned after this many files were written to it
+PRUNE_INTERVAL = 100
+_writes = 0
+_writes_lock = threading.Lock()
+
+# Digests are used as file names, so only accept plain hash-like names
+_DIGEST = re.compile(r'[A-Za-z0-9_-]{1,128}')
+
+
+def set_asset_dir(path, max_age=None, max_size=None):
+    """
+    Set the directory generated assets (chart images, chart data) are stored
+    in when no cache backend is configured with
+    `ComponentManager.configure_cache()`. Every worker process of an
+    application must use the same directory, so any of them can serve an
+    asset rendered by another; for several hosts, point it at a shared volume.
+
+    With limits, the directory is pruned with `prune_assets` after every
+    PRUNE_INTERVAL files a process writes. Keep `max_age` above the expiry of
+    cached pages, which refer to their assets without storing them again.
+
+    Args:
+        path (str): The directory. Defaults to a `dashboard_builder_assets`
+            directory in the system's temporary directory.
+        max_age (float, optional): Seconds after which an asset that has not
+            been stored again is deleted. Defaults to None (no limit).
+        max_size (int, optional): Bytes the directory may hold; the least
+            recently stored assets are deleted beyond it. Defaults to None (no
+            limit).
+    """
+    global _asset_dir, _max_age, _max_size
+    _asset_dir = os.fspath(path)
+    _max_age = max_age
+    _max_size = max_size
+
+
+def prune_assets(max_age=None, max_size=None):
+    """
+    Delete assets from the asset directory, e.g. from a periodic job. Storing
+    an asset again marks it as used, so assets of pages that are still
+    rendered are kept longest.
+
+    Args:
+        max_age (float, optional): Delete assets not stored for this many
+            seconds. Defaults to None (no limit).
+        max_size (int, optional): Then delete the least recently stored assets
+            until the directory holds at most this many bytes. Defaults to None
+            (no limit).
+
+    Returns:
+        int: The number of deleted assets.
+    """
+    # An asset's data and its mimetype share the name before the first dot
+    assets = {}
+    try:
+        entries = list(os.scandir(_asset_dir))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        name = entry.name.split('.')[0]
+        used, size, paths = assets.get(name, (0, 0, []))
+        assets[name] = (
+            max(used, stat.st_mtime), size + stat.st_size, paths + [entry.path])
+
+    now = time.time()
+    total = sum(size for _, size, _ in assets.values())
+    deleted = 0
+    for used, size, paths in sorted(assets.values()):
+        expired = max_age is not None and now - used > max_age
+        oversized = max_size is not None and total > max_size
+        if not expired and not oversized:
+            break
+        # The data first, so the mimetype exists whenever the data does
+        for path in sorted(paths, key=len):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        total -= size
+        deleted += 1
+    return deleted
+
+
+def _asset_path(name):
+    return os.path.join(_asset_dir, name)
+
+
+def _touch_file(name):
+    # Mark an existing file as used, see prune_assets()
+    try:
+        os.utime(_asset_path(name))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _write_file(name, data):
+    """
+    Write a file of the asset directory unless it exists. Written to a
+    temporary file first and renamed, so readers never see partial content.
+    """
+    global _writes
+    if _touch_file(name):
+        return
+    path = _asset_path(name)
+    os.makedirs(_asset_dir, exist_ok=True)
+    descriptor, staging = tempfile.mkstemp(dir=_asset_dir)
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+        os.replace(staging, path)
+    except BaseException:
+        os.unlink(staging)
+        raise
+
+    if _max_age is not None or _max_size is not None:
+        with _writes_lock:
+            _writes += 1
+            prune = _writes % PRUNE_INTERVAL == 0
+        if prune:
+            prune_assets(_max_age, _max_size)
+
+
+def _read_file(name):
+    try:
+        with open(_asset_path(name), 'rb') as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def store_asset(data, mimetype, extension):
+    """
+    Store generated content (e.g. a rendered chart image) under the hash of its
+    bytes and return the URL it is served from.
+
+    Identical content is stored once and always gets the same URL, which lets
+    browsers cache it indefinitely. Assets are kept in the cache backend set
+    with `ComponentManager.configure_cache()`, so a shared backend lets every
+    worker serve assets rendered by the others; its size and expiry must leave
+    room for the assets of the pages it caches. Without a backend, assets are
+    files of a content-addressed directory shared by the workers of a host,
+    see `set_asset_dir`.
+
+    Args:
+        data (bytes): The content to store.
+        mimetype (str): Mimetype the content is served with.
+        extension (str): File extension used in the URL, e.g. 'png'.
+
+    Returns:
+        str: URL of the asset.
+
+    Raises:
+        RuntimeError: If the dashboard builder routes are not registered on the
+            Flask application.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    cache = get_default_cache()
+    if cache is not None:
+        # Set even if present, which renews its expiry like a new page's would
+        cache.set('asset:' + digest, (mimetype, data))
+    else:
+        # The mimetype is written first, so it exists whenever the data does
+        _write_file(digest + '.mimetype', mimetype.encode('ascii'))
+        _write_file(digest, data)
+
+    return dashboard_url('dashboard_builder.asset', filename=f"{digest}.{extension}")
+
+
+def dashboard_url(endpoint, **values):
+    """
+    Build the URL of one of the dashboard builder routes.
+
+    Raises:
+        RuntimeError: If the dashboard builder routes are not registered on the
+            Flask application.
+    """
+    try:
+        return url_for(endpoint, **values)
+    except BuildError:
+        raise RuntimeError(
+            "The dashboard builder routes are not registered. Call "
+            "dashboard_builder.init_app(app) when creating the Flask app.") from None
+
+
+def get_asset(digest):
+    """
+    Look up a stored asset by its hash.
+
+    Returns:
+        tuple or None: (mimetype, data), or None if the asset is unknown.
+    """
+    cache = get_default_cache()
+    if cache is not None:
+        return cache.get('asset:' + digest)
+    if not _DIGEST.fullmatch(digest):
+        return None
+    data = _read_file(digest)
+    if data is None:
+        return None
+    return _read_file(digest + '.mimetype').decode('ascii'), data
+
+
+def store_chart_data(values, digest=None):
+    """
+    Store the rows of a chart dataset as gzip-compressed JSON and return the
+    URL they are served from.
+
+    Like other assets, the data is addressed by its hash: identical data gets
+    the same URL, so browsers fetch it once and cache it indefinitely.
+
+    Args:
+        values (list): The rows of the dataset.
+        digest (str, optional): A hash already identifying the data, e.g. the
+            content-hashed name Altair gives its datasets. Saves serializing
+            data that has been stored before. Defaults to the hash of the
+            serialized data.
+
+    Returns:
+        str: URL of the data.
+
+    Raises:
+        RuntimeError: If the dashboard builder routes are not registered on the
+            Flask application.
+    """
+    data = None
+    if digest is None:
+        data = dumps_json(values).encode('utf8')
+        digest = hashlib.sha256(data).hexdigest()
+    if not _DIGEST.fullmatch(digest):
+        raise ValueError(f"Invalid chart data digest {digest!r}.")
+
+    cache = get_default_cache()
+    if cache is not None:
+        key = 'chart-data:' + digest
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = _compress_chart_data(values, data)
+        # Set even if present, which renews its expiry like a new page's would
+        cache.set(key, compressed)
+    elif not _touch_file(digest + '.json.gz'):
+        _write_file(digest + '.json.gz', _compress_chart_data(values, data))
+
+    return dashboard_url('dashboard_builder.chart_data', filename=f"{digest}.json")
+
+
+def _compress_chart_data(values, data):
+    if data is None:
+        data = dumps_json(values).encode('utf8')
+    # mtime=0 keeps the compressed bytes, and so the ETag, deterministic
+    return gzip.compress(data, mtime=0)
+
+
+def get_chart_data(digest):
+    """
+    Look up stored chart data by its hash.
+
+    Returns:
+        bytes or None: The gzip-compressed JSON, or None if the data is unknown.
+    """
+    cache = get_default_cache()
+    if cache is not None:
+        return cache.get('chart-data:' + digest)
+    if not _DIGEST.fullmatch(digest):
+        return None
+    return _read_file(digest + '.json.gz')
+
+
+@functools.lru_cache(maxsize=1)
+def plotly_js_bundle():
+    """
+    Return the plotly.js bundle shipped with the installed plotly package.
+
+    Returns:
+        bytes: The minified plotly.js source.
+    """
+    return plotly.offline.get_plotlyjs().encode('utf8')
+
+
+def plotly_js_url(source='cdn'):
+    """
+    Resolve where pages load plotly.js from.
+
+    Args:
+        source (str, optional): "cdn" for the plotly CDN, "local" for the copy
+            bundled with the plotly package, served by the dashboard builder
+            routes, or any other string as the URL itself. Both "cdn" and "local"
+            match the plotly.js version of the installed plotly package.
+            Defaults to "cdn".
+
+    Returns:
+        str: URL of the plotly.js bundle.
+    """
+    if source == 'cdn':
+        return PLOTLY_JS_CDN
+    if source == 'local':
+        return dashboard_url('dashboard_builder.plotly_js', version=PLOTLY_JS_VERSION)
+    return source
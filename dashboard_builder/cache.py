@@ -0,0 +1,605 @@
+import abc
+import contextlib
+import functools
+import hashlib
+import logging
+import pickle
+import shelve
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class BaseCache(abc.ABC):
+    """
+    Interface shared by the cache backends.
+
+    The output render cache, the compiled page templates and memoized functions
+    all talk to their cache through these methods, so any backend can be plugged
+    in with `ComponentManager.configure_cache()`. Keys are strings; backends that
+    store data outside the process pickle the values.
+    """
+    def __init__(self, ttl=None):
+        """
+        Args:
+            ttl (float, optional): Default number of seconds after which an entry
+                expires. Defaults to None (entries never expire).
+        """
+        self.default_ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @abc.abstractmethod
+    def get(self, key, default=None):
+        """
+        Retrieve a cached value.
+
+        Args:
+            key (str): Key of the entry.
+            default (optional): Value returned when the key is not cached.
+                Defaults to None.
+        """
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl=None):
+        """
+        Store a value.
+
+        Args:
+            key (str): Key of the entry.
+            value: The value to store.
+            ttl (float, optional): Seconds after which the entry expires. Defaults
+                to the cache's default ttl.
+        """
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """
+        Remove an entry.
+
+        Returns:
+            bool: Whether the key was cached.
+        """
+
+    @abc.abstractmethod
+    def ttl(self, key):
+        """
+        Remaining lifetime of an entry.
+
+        Returns:
+            float or None: Seconds until the entry expires, or None if it never
+            expires.
+
+        Raises:
+            KeyError: If the key is not cached.
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove every entry from the cache and reset the counters."""
+
+    @abc.abstractmethod
+    def size(self):
+        """Return the number of cached entries."""
+
+    def stats(self):
+        """
+        Return the hit/miss counters of this process and the current size of the
+        cache.
+
+        Returns:
+            dict: With the keys 'hits', 'misses', 'size' and 'maxsize'.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': self.size(),
+            'maxsize': getattr(self, 'maxsize', None),
+        }
+
+    def _expires_at(self, ttl, now):
+        ttl = self.default_ttl if ttl is None else ttl
+        return None if ttl is None else now + ttl
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+
+class LRUCache(BaseCache):
+    """
+    A small thread-safe in-memory cache that evicts the least recently used entry
+    once it holds `maxsize` items, optionally expiring entries after `ttl` seconds.
+    """
+    def __init__(self, maxsize=128, ttl=None):
+        """
+        Initialize a new instance of the LRUCache.
+
+        Args:
+            maxsize (int, optional): Maximum number of entries to keep.
+                Defaults to 128.
+            ttl (float, optional): Seconds after which an entry expires. Defaults
+                to None (entries never expire).
+        """
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, key):
+        # Must be called with the lock held
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None \
+                and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        expires_at = self._expires_at(ttl, time.monotonic())
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def ttl(self, key):
+        with self._lock:
+            entry = self._entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return None if entry[1] is None else entry[1] - time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def size(self):
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._entry(key) is not None
+
+    def __len__(self):
+        return self.size()
+
+
+class SQLiteCache(BaseCache):
+    """
+    A cache stored in a SQLite database file. Every process that opens the same
+    file shares its entries, so gunicorn workers on one host can reuse each
+    other's results. Values are pickled, and the least recently used entries are
+    removed once the cache holds more than `maxsize` items.
+    """
+    def __init__(self, path, maxsize=1024, ttl=None):
+        """
+        Initialize a new instance of the SQLiteCache.
+
+        Args:
+            path (str): Path of the SQLite database file. It is created if it
+                does not exist.
+            maxsize (int, optional): Maximum number of entries to keep.
+                Defaults to 1024.
+            ttl (float, optional): Seconds after which an entry expires. Defaults
+                to None (entries never expire).
+        """
+        super().__init__(ttl)
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB, "
+                "expires_at REAL, accessed_at REAL)"
+            )
+
+    def _connect(self):
+        # sqlite3 connections can't be shared between threads, keep one per thread
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _row(self, connection, key, now):
+        row = connection.execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None and row[1] is not None and row[1] <= now:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return None
+        return row
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._connect() as connection:
+            row = self._row(connection, key, now)
+            if row is None:
+                self.misses += 1
+                return default
+            connection.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (key, data, self._expires_at(ttl, now), now),
+            )
+            connection.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def delete(self, key):
+        with self._connect() as connection:
+            cursor = connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def ttl(self, key):
+        now = time.time()
+        with self._connect() as connection:
+            row = self._row(connection, key, now)
+        if row is None:
+            raise KeyError(key)
+        return None if row[1] is None else row[1] - now
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM cache")
+        self.hits = 0
+        self.misses = 0
+
+    def size(self):
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class ShelveCache(BaseCache):
+    """
+    A cache stored on disk with the standard library `shelve` module. Access is
+    serialized with an exclusive lock on a companion `.lock` file, so several
+    processes can share the same shelf (on platforms with `fcntl`). Once more
+    than `maxsize` entries are stored, the oldest ones are dropped.
+    """
+    def __init__(self, path, maxsize=1024, ttl=None):
+        """
+        Initialize a new instance of the ShelveCache.
+
+        Args:
+            path (str): Base path of the shelf files.
+            maxsize (int, optional): Maximum number of entries to keep.
+                Defaults to 1024.
+            ttl (float, optional): Seconds after which an entry expires. Defaults
+                to None (entries never expire).
+        """
+        super().__init__(ttl)
+        self.path = path
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _shelf(self):
+        with self._lock, open(self.path + '.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                with shelve.open(self.path) as shelf:
+                    yield shelf
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _entry(self, shelf, key):
+        entry = shelf.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del shelf[key]
+            return None
+        return entry
+
+    def get(self, key, default=None):
+        with self._shelf() as shelf:
+            entry = self._entry(shelf, key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        with self._shelf() as shelf:
+            shelf[key] = (value, self._expires_at(ttl, now), now)
+            if len(shelf) > self.maxsize:
+                oldest = sorted(shelf.keys(), key=lambda k: shelf[k][2])
+                for old_key in oldest[:len(oldest) - self.maxsize]:
+                    del shelf[old_key]
+
+    def delete(self, key):
+        with self._shelf() as shelf:
+            if key not in shelf:
+                return False
+            del shelf[key]
+            return True
+
+    def ttl(self, key):
+        with self._shelf() as shelf:
+            entry = self._entry(shelf, key)
+        if entry is None:
+            raise KeyError(key)
+        return None if entry[1] is None else entry[1] - time.time()
+
+    def clear(self):
+        with self._shelf() as shelf:
+            shelf.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def size(self):
+        with self._shelf() as shelf:
+            return len(shelf)
+
+
+class RedisCache(BaseCache):
+    """
+    A cache stored in a Redis (or Redis-protocol compatible) server, shared by
+    every process and host that connects to it. The client speaks the Redis
+    serialization protocol directly over a socket, so no extra dependency is
+    needed. Expiry is handled by the server; eviction when the server is full
+    follows its `maxmemory-policy`.
+
+    While the server cannot be reached, `get` reports a miss and `set` does
+    nothing, so pages are computed instead of failing; the errors are logged.
+    """
+    def __init__(self, host='localhost', port=6379, db=0, password=None,
+                 prefix='dashboard_builder:', ttl=None, timeout=5):
+        """
+        Initialize a new instance of the RedisCache.
+
+        Args:
+            host (str, optional): Server host. Defaults to 'localhost'.
+            port (int, optional): Server port. Defaults to 6379.
+            db (int, optional): Database number. Defaults to 0.
+            password (str, optional): Password sent with AUTH. Defaults to None.
+            prefix (str, optional): Prefix added to every key. Defaults to
+                'dashboard_builder:'.
+            ttl (float, optional): Seconds after which an entry expires. Defaults
+                to None (entries never expire).
+            timeout (float, optional): Socket timeout in seconds. Defaults to 5.
+        """
+        super().__init__(ttl)
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        # Sockets are not shared between threads, keep one connection per thread
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            sock = socket.create_connection((self.host, self.port), self.timeout)
+            connection = (sock, sock.makefile('rb'))
+            self._local.connection = connection
+            if self.password is not None:
+                self._command('AUTH', self.password)
+            if self.db:
+                self._command('SELECT', self.db)
+        return connection
+
+    def _command(self, *args):
+        sock, reader = self._connection()
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode('utf8')
+            parts.append(f"${len(arg)}\r\n".encode())
+            parts.append(arg + b"\r\n")
+        try:
+            sock.sendall(b"".join(parts))
+            return self._read_reply(reader)
+        except OSError:
+            self._local.connection = None
+            sock.close()
+            raise
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the Redis server.")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode()
+        if kind == b'-':
+            raise RuntimeError(payload.decode())
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length == -1:
+                return None
+            return reader.read(length + 2)[:-2]
+        if kind == b'*':
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read_reply(reader) for _ in range(length)]
+        raise RuntimeError(f"Unexpected reply from the Redis server: {line!r}")
+
+    def get(self, key, default=None):
+        try:
+            data = self._command('GET', self.prefix + key)
+        except OSError as error:
+            logger.warning("Redis cache %s:%s unavailable: %s",
+                           self.host, self.port, error)
+            data = None
+        if data is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(data)
+
+    def set(self, key, value, ttl=None):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        ttl = self.default_ttl if ttl is None else ttl
+        expiry = () if ttl is None else ('PX', int(ttl * 1000))
+        try:
+            self._command('SET', self.prefix + key, data, *expiry)
+        except OSError as error:
+            logger.warning("Redis cache %s:%s unavailable: %s",
+                           self.host, self.port, error)
+
+    def delete(self, key):
+        return self._command('DEL', self.prefix + key) > 0
+
+    def ttl(self, key):
+        milliseconds = self._command('PTTL', self.prefix + key)
+        if milliseconds == -2:
+            raise KeyError(key)
+        return None if milliseconds == -1 else milliseconds / 1000
+
+    def _keys(self):
+        cursor = '0'
+        while True:
+            cursor, keys = self._command('SCAN', cursor, 'MATCH', self.prefix + '*')
+            cursor = cursor.decode()
+            yield from keys
+            if cursor == '0':
+                break
+
+    def clear(self):
+        keys = list(self._keys())
+        if keys:
+            self._command('DEL', *keys)
+        self.hits = 0
+        self.misses = 0
+
+    def size(self):
+        return sum(1 for _ in self._keys())
+
+
+_default_cache = None
+
+
+def set_default_cache(cache):
+    """
+    Set the cache backend used by memoized functions that were not given their
+    own backend.
+    """
+    global _default_cache
+    _default_cache = cache
+
+
+def get_default_cache():
+    """Return the configured default cache backend, or None."""
+    return _default_cache
+
+
+def _freeze(value):
+    """
+    Convert call arguments into a hashable structure with a stable repr.
+    """
+    if value is None or isinstance(value, (str, bytes, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(_freeze(item)) for item in value))
+    raise TypeError(
+        f"Cannot build a cache key from an argument of type "
+        f"{type(value).__name__}; pass key= to memoize() to choose which "
+        f"arguments identify a call.")
+
+
+def memoize(maxsize=128, ttl=None, backend=None, key=None):
+    """
+    Decorator caching the return value of a function.
+
+    By default calls are identified by their arguments, which must be plain
+    values such as the strings and numbers captured from input components.
+    Use `key` to choose the identifying values when the function also receives
+    objects like DataFrames that stay the same between calls.
+
+    Args:
+        maxsize (int, optional): Maximum number of results kept by the default
+            in-memory backend. Defaults to 128.
+        ttl (float, optional): Seconds after which a result of the default
+            backend expires. Defaults to None (no expiry).
+        backend (optional): Cache object with `get(key, default)` and
+            `set(key, value)` methods, e.g. a SQLiteCache shared across worker
+            processes. Defaults to the cache set with `set_default_cache()`, or
+            an in-process LRUCache(maxsize, ttl) if none is set.
+        key (callable, optional): Called with the function's arguments, returns
+            the values identifying the call.
+
+    Example:
+        >>> @memoize(ttl=300, key=lambda df, values: values)
+        ... def process_data(df, values):
+        ...     ...
+    """
+    local_cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            identity = key(*args, **kwargs) if key is not None else (args, kwargs)
+            digest = hashlib.sha256(repr(_freeze(identity)).encode('utf8'))
+            cache_key = f"{name}:{digest.hexdigest()}"
+
+            cache = resolve_cache()
+            result = cache.get(cache_key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.set(cache_key, result)
+            return result
+
+        def resolve_cache():
+            if backend is not None:
+                return backend
+            return _default_cache if _default_cache is not None else local_cache
+
+        wrapper.get_cache = resolve_cache
+        return wrapper
+    return decorator
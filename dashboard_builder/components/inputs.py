@@ -1,7 +1,7 @@
 # components/inputs.py
 
-from flask import render_template_string
-from ..utils import get_jinja_subtemplate
+from ..options import column_options
+from ..utils import render_subtemplate
 from ..themes import THEME_COLORS
 from ..theme_utils import get_global_theme
 
@@ -43,8 +43,9 @@ class InputDropdown(BaseInput):
         Args:
             name (str): Name of the dropdown component.
             label (str): Display label for the dropdown.
-            values: Either a list of dropdown values or a tuple containing a DataFrame 
-            and column name.
+            values: Either a list of dropdown values or a tuple containing a DataFrame
+            (or the name of a dataset registered with `register_dataset`) and
+            column name.
             action_url (str, optional): URL to which the form submits. Defaults to "/".
             selected_value (str, optional): Initially selected value in the dropdown. 
             Defaults to "Select All".
@@ -72,8 +73,10 @@ class InputDropdown(BaseInput):
         super().__init__(name, selected_value)
         
         self.label = label
-        if isinstance(values, tuple) and len(values) == 2 and hasattr(values[0], 'loc'):
-            self.values = ["Select All"] + values[0][values[1]].unique().tolist()
+        if isinstance(values, tuple) and len(values) == 2 and (
+                hasattr(values[0], 'loc') or isinstance(values[0], str)):
+            # Distinct values are cached per frame (or dataset version) and column
+            self.values = ["Select All"] + column_options(*values)
         elif isinstance(values, list):
             self.values = ["Select All"] + values
         else:
@@ -104,8 +107,8 @@ class InputDropdown(BaseInput):
         Returns:
             str: HTML representation of the dropdown component.
         """
-        return render_template_string(
-            get_jinja_subtemplate("inputs/inputdropdown.j2"), 
+        return render_subtemplate(
+            "inputs/inputdropdown.j2", 
             name=self.name, 
             label=self.label, 
             values=self.values, 
@@ -146,8 +149,8 @@ class TextInput(BaseInput):
         Returns:
             str: HTML representation of the text input component.
         """
-        return render_template_string(
-            get_jinja_subtemplate("inputs/textinput.j2"),
+        return render_subtemplate(
+            "inputs/textinput.j2",
             name=self.name, label=self.label, 
             default_value=self.default_value,
             theme_colors=self.theme_colors)
@@ -194,8 +197,8 @@ class InputSlider_Numerical(BaseInput):
         Returns:
             str: HTML representation of the numerical slider input component.
         """
-        return render_template_string(
-            get_jinja_subtemplate("inputs/inputslider_numerical.j2"),
+        return render_subtemplate(
+            "inputs/inputslider_numerical.j2",
             name=self.name, label=self.label, 
             min_value=self.min_value, max_value=self.max_value, step=self.step, 
             default_value=self.default_value, theme_colors=self.theme_colors)
@@ -245,8 +248,8 @@ class InputSlider_Categorical(BaseInput):
         """
         # Position is zero-indexed based on categories list
         default_position = self.categories.index(self.default_value)
-        return render_template_string(
-            get_jinja_subtemplate("inputs/inputslider_categorical.j2"),
+        return render_subtemplate(
+            "inputs/inputslider_categorical.j2",
             name=self.name, label=self.label, max_position=len(self.categories)-1, 
             default_position=default_position, categories=self.categories,
             theme_colors=self.theme_colors)
@@ -305,7 +308,7 @@ class InputRadio(BaseInput):
         Returns:
             str: HTML representation of the radio button input component.
         """
-        return render_template_string(
-            get_jinja_subtemplate("inputs/inputradio.j2"),
+        return render_subtemplate(
+            "inputs/inputradio.j2",
             name=self.name, label=self.label, options=self.options, 
             default_value=self.default_value, theme_colors=self.theme_colors)
@@ -1,5 +1,5 @@
-from flask import render_template_string
-from ..utils import get_jinja_subtemplate
+from ..rendering import render_components
+from ..utils import render_subtemplate
 
 class ColumnLayout:
     """
@@ -26,6 +26,13 @@ class ColumnLayout:
         for component in components:
             self.columns[col_index].append(component)
 
+    def iter_components(self):
+        """
+        Iterate over the components of every column, in column order.
+        """
+        for column in self.columns:
+            yield from column
+
     def render(self):
         """
         Render the entire column layout as an HTML string. 
@@ -37,7 +44,7 @@ class ColumnLayout:
         """
         rendered_columns = []
         for column in self.columns:
-            rendered_components = [comp.render() for comp in column]
+            rendered_components = render_components(column)
             rendered_columns.append(
                 f"<div class='flex-grow w-full md:flex-grow-0 md:w-1/2 px-2 max-h-[75vh] max-w-[90%] overflow-y-auto'>{'' .join(rendered_components)}</div>")  # noqa: E501
         return f"<div class='flex flex-col md:flex-row space-y-2 md:space-y-0 md:space-x-2'>{'' .join(rendered_columns)}</div>"  # noqa: E501
@@ -64,6 +71,12 @@ class ExpanderLayout:
         self.id = id
         self.components = components
 
+    def iter_components(self):
+        """
+        Iterate over the components inside the expander.
+        """
+        return iter(self.components)
+
     def render(self):
         """
         Render the entire expander layout as an HTML string.
@@ -74,8 +87,8 @@ class ExpanderLayout:
             str: HTML representation of the expander layout with all the 
                 added components.
         """
-        return render_template_string(
-            get_jinja_subtemplate("layouts/expanderlayout.j2"),
+        return render_subtemplate(
+            "layouts/expanderlayout.j2",
             label=self.label,
             id=self.id,
-            components=[comp.render() for comp in self.components])
+            components=render_components(self.components))
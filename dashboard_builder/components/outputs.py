@@ -1,16 +1,179 @@
 # components/outputs.py
 
-from ..utils import get_jinja_subtemplate
+from ..utils import render_markdown, render_subtemplate
+from ..assets import dashboard_url, store_asset, store_chart_data
+from ..cache import LRUCache
+from ..downsampling import (
+    altair_series,
+    downsample_frame,
+    downsample_plotly,
+    downsampled_lines,
+)
+from ..plotly_encoding import (
+    TYPED_ARRAYS_SUPPORTED,
+    WEBGL_THRESHOLD,
+    encode_typed_arrays,
+    use_webgl,
+)
+from ..rendering import run_in_process
+from ..serialization import dumps_json, set_json_serializer  # noqa: F401
+from ..tables import (
+    iter_table_html,
+    register_table,
+    render_table_html,
+    table_page,
+)
+from ..theme_utils import get_global_theme
 
-from flask import render_template_string
 import io
 import base64
-import json
-from markdown import markdown
+import contextlib
+import functools
+import hashlib
+import uuid
+import matplotlib
+import numpy as np
+import pandas as pd
 import plotly.io as pio
+from flask import has_request_context, request
 
 
-class OutputText:
+# Opt-in cache of rendered output HTML, see enable_render_cache()
+_render_cache = None
+
+
+def enable_render_cache(maxsize=256, ttl=None, backend=None):
+    """
+    Enable the content-addressed render cache for output components.
+
+    Rendered HTML is stored under a hash of the component type, its content and
+    the active theme, so an output whose content has not changed is served from
+    memory instead of being rendered again.
+
+    Args:
+        maxsize (int, optional): Maximum number of rendered outputs to keep.
+            Defaults to 256.
+        ttl (float, optional): Seconds after which a cached output expires.
+            Defaults to None (no expiry).
+        backend (optional): A cache from `dashboard_builder.cache` to store the
+            rendered HTML in instead of an in-process LRUCache(maxsize, ttl).
+    """
+    global _render_cache
+    if backend is None:
+        backend = LRUCache(maxsize=maxsize, ttl=ttl)
+    _render_cache = backend
+
+
+def disable_render_cache():
+    """Disable the render cache and drop every cached output."""
+    global _render_cache
+    _render_cache = None
+
+
+def render_cache_stats():
+    """
+    Return the hit/miss counters of the render cache.
+
+    Returns:
+        dict or None: The cache statistics, or None if the cache is disabled.
+    """
+    return _render_cache.stats() if _render_cache is not None else None
+
+
+def cached_render(render):
+    """
+    Decorator for the `render` method of output components which serves the
+    rendered HTML from the render cache when it is enabled and the component
+    provides a cache key.
+    """
+    @functools.wraps(render)
+    def wrapper(self):
+        cache = _render_cache
+        if cache is None:
+            return render(self)
+
+        key = self.cache_key()
+        if key is None:
+            return render(self)
+        key = 'render:' + key
+
+        html = cache.get(key)
+        if html is None:
+            html = render(self)
+            cache.set(key, html)
+        return html
+    return wrapper
+
+
+def _update_digest(digest, value):
+    """
+    Feed a figure or spec, made of dicts, lists, NumPy arrays and scalars, to
+    a hash. Numeric arrays are hashed from their buffers and other arrays
+    with `pandas.util.hash_array`, instead of serializing them to JSON.
+    """
+    if isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value, key=str):
+            digest.update(repr(key).encode('utf8'))
+            _update_digest(digest, value[key])
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)) and value and \
+            isinstance(value[0], (dict, list, tuple)):
+        digest.update(b'[')
+        for item in value:
+            _update_digest(digest, item)
+        digest.update(b']')
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        array = np.asarray(value)
+        digest.update(repr((array.dtype.str, array.shape)).encode('utf8'))
+        if array.dtype.kind in 'biufcmM':
+            digest.update(np.ascontiguousarray(array).tobytes())
+        else:
+            try:
+                digest.update(pd.util.hash_array(array.ravel()).tobytes())
+            except TypeError:
+                # Unhashable items (e.g. lists)
+                digest.update(repr(array.tolist()).encode('utf8'))
+    else:
+        digest.update(repr(value).encode('utf8'))
+
+
+class BaseOutput:
+    """
+    Base class for output components.
+    """
+    def cache_content(self):
+        """
+        Return the parts of the component's content that determine its rendered
+        HTML, or None if the component cannot be cached.
+        """
+        return None
+
+    def cache_key(self):
+        """
+        Compute a stable hash of the component type, its content and the active
+        theme.
+
+        Returns:
+            str or None: Hex digest used as the render cache key, or None if the
+            component cannot be cached.
+        """
+        content = self.cache_content()
+        if content is None:
+            return None
+
+        digest = hashlib.sha256()
+        for part in (type(self).__name__, get_global_theme(), *content):
+            if isinstance(part, str):
+                part = part.encode('utf8')
+            elif not isinstance(part, bytes):
+                part = repr(part).encode('utf8')
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+        return digest.hexdigest()
+
+
+class OutputText(BaseOutput):
     """
     Represents a text output component for a dashboard or view.
     This class facilitates rendering plain text content using a specified template.
@@ -24,6 +187,10 @@ class OutputText:
         """
         self.content = content
 
+    def cache_content(self):
+        return (str(self.content),)
+
+    @cached_render
     def render(self):
         """
         Render the text content as an HTML string using the specified template.
@@ -31,105 +198,410 @@ class OutputText:
         Returns:
             str: HTML representation of the text content.
         """
-        return render_template_string(
-            get_jinja_subtemplate("outputs/outputtext.j2"),
+        return render_subtemplate(
+            "outputs/outputtext.j2",
             content=self.content)
 
-class OutputChart_Matplotlib:
+class MatplotlibProfile:
+    """
+    Settings controlling how a matplotlib figure is turned into an image.
+
+    The default profile matches matplotlib's `bbox_inches='tight'` behaviour,
+    which draws the figure twice: once to measure it and once to save it. The
+    "fast" profile lays the figure out with its tight layout engine during the
+    single save draw instead, and lowers the PNG compression level.
+    """
+    def __init__(self, bbox_inches='tight', layout_engine=None, dpi=None,
+                 rasterize_threshold=None, pil_kwargs=None):
+        """
+        Initialize a new instance of the MatplotlibProfile class.
+
+        Args:
+            bbox_inches (str, optional): Passed to `savefig`. 'tight' crops the
+                image to the drawn content at the cost of an extra draw; None
+                keeps the figure size. Defaults to 'tight'.
+            layout_engine (str, optional): Layout engine set on the figure with
+                `fig.set_layout_engine` before saving, e.g. 'tight' or
+                'constrained'. Defaults to None (unchanged).
+            dpi (float, optional): Resolution of raster images, used when the
+                output component doesn't set one. Defaults to None.
+            rasterize_threshold (int, optional): In vector (SVG) output, lines and
+                collections with more points than this, and axes with more
+                patches than this, are rasterized instead of written as vector
+                paths. Defaults to None (never).
+            pil_kwargs (dict, optional): Passed to Pillow when writing PNG or WebP
+                images, e.g. {'compress_level': 1}. Defaults to None.
+        """
+        self.bbox_inches = bbox_inches
+        self.layout_engine = layout_engine
+        self.dpi = dpi
+        self.rasterize_threshold = rasterize_threshold
+        self.pil_kwargs = pil_kwargs
+
+    def __repr__(self):
+        return (f"MatplotlibProfile(bbox_inches={self.bbox_inches!r}, "
+                f"layout_engine={self.layout_engine!r}, dpi={self.dpi!r}, "
+                f"rasterize_threshold={self.rasterize_threshold!r}, "
+                f"pil_kwargs={self.pil_kwargs!r})")
+
+    @contextlib.contextmanager
+    def prepared(self, figure, format):
+        """
+        Temporarily apply the layout and rasterization settings to a figure,
+        e.g. while saving it, and restore its layout engine and the rasterized
+        flags of its artists afterwards.
+
+        Args:
+            figure (matplotlib.figure.Figure): The figure.
+            format (str): The image format the figure is saved as.
+        """
+        layout_engine = None
+        rasterized = []
+        try:
+            if self.layout_engine is not None and \
+                    hasattr(figure, 'set_layout_engine'):
+                layout_engine = (figure.get_layout_engine(),)
+                figure.set_layout_engine(self.layout_engine)
+
+            if self.rasterize_threshold is not None and format == "svg":
+                threshold = self.rasterize_threshold
+                for ax in getattr(figure, 'axes', []):
+                    artists = [line for line in ax.lines
+                               if len(line.get_xdata()) > threshold]
+                    artists += [collection for collection in ax.collections
+                                if len(collection.get_offsets()) > threshold]
+                    if len(ax.patches) > threshold:
+                        artists += ax.patches
+                    for artist in artists:
+                        rasterized.append((artist, artist.get_rasterized()))
+                        artist.set_rasterized(True)
+            yield figure
+        finally:
+            for artist, flag in rasterized:
+                artist.set_rasterized(flag)
+            if layout_engine is not None:
+                previous, = layout_engine
+                with contextlib.ExitStack() as stack:
+                    if previous is None:
+                        # set_layout_engine(None) picks an engine from these
+                        # rcParams when they are set
+                        stack.enter_context(matplotlib.rc_context({
+                            'figure.autolayout': False,
+                            'figure.constrained_layout.use': False}))
+                    figure.set_layout_engine(previous)
+
+    def savefig_kwargs(self, format, dpi=None):
+        """
+        Keyword arguments for `savefig` under this profile.
+        """
+        kwargs = {
+            'format': format,
+            'dpi': dpi if dpi is not None else self.dpi,
+            'bbox_inches': self.bbox_inches,
+        }
+        if self.pil_kwargs and format in ("png", "webp"):
+            kwargs['pil_kwargs'] = self.pil_kwargs
+        return kwargs
+
+
+MATPLOTLIB_PROFILES = {
+    'default': MatplotlibProfile(),
+    'fast': MatplotlibProfile(
+        bbox_inches=None,
+        layout_engine='tight',
+        rasterize_threshold=5000,
+        pil_kwargs={'compress_level': 1},
+    ),
+}
+
+
+def _savefig_bytes(output):
+    # Module level so it can be pickled into the rendering process pool
+    return output.savefig_bytes()
+
+
+class OutputChart_Matplotlib(BaseOutput):
     """
     Represents a chart output component for a dashboard or view.
     This class facilitates rendering Matplotlib plots in an HTML view.
     """
-    def __init__(self, content):
+    IMAGE_FORMATS = {
+        'png': 'image/png',
+        'svg': 'image/svg+xml',
+        'webp': 'image/webp',
+    }
+
+    def __init__(self, content, cache_key=None, mode="inline", format="png",
+                 dpi=None, profile="default", max_points=None, downsample="lttb"):
         """
         Initialize a new instance of the OutputChart_Matplotlib class.
 
         Args:
-            content: A Matplotlib figure or similar object that has 
+            content: A Matplotlib figure or similar object that has
                 a 'savefig' method.
+            cache_key (str, optional): A key identifying what the figure shows.
+                A figure cannot be hashed without drawing it, so it is only
+                served from the render cache when a key is given. Defaults to None.
+            mode (str, optional): "inline" embeds the image in the page as a
+                base64 data URL. "url" stores the image in a content-addressed
+                store and references it by URL, served with long-lived cache
+                headers; this requires `dashboard_builder.init_app(app)`.
+                Defaults to "inline".
+            format (str, optional): Image format, one of "png", "svg" or "webp".
+                Defaults to "png".
+            dpi (float, optional): Resolution of raster images. Defaults to None
+                (the profile's dpi, or matplotlib's savefig.dpi setting).
+            profile (str or MatplotlibProfile, optional): Render profile, either
+                the name of a profile in MATPLOTLIB_PROFILES ("default" or "fast")
+                or a MatplotlibProfile instance. Defaults to "default".
+            max_points (int, optional): Downsample lines with more points than
+                this while saving the figure; their data is restored afterwards.
+                Defaults to None (all points are drawn).
+            downsample (str, optional): Downsampling method, "lttb" or
+                "minmax". Defaults to "lttb".
+
+        Raises:
+            ValueError: If the mode, format or profile is not supported.
         """
+        if mode not in ("inline", "url"):
+            raise ValueError(f"Invalid mode '{mode}', expected 'inline' or 'url'.")
+        if format not in self.IMAGE_FORMATS:
+            raise ValueError(f"Invalid format '{format}', expected one of "
+                             f"{', '.join(self.IMAGE_FORMATS)}.")
+        if isinstance(profile, str):
+            if profile not in MATPLOTLIB_PROFILES:
+                raise ValueError(f"Invalid profile '{profile}', expected one of "
+                                 f"{', '.join(MATPLOTLIB_PROFILES)}.")
+            profile = MATPLOTLIB_PROFILES[profile]
+
         self.content = content
+        self.figure_cache_key = cache_key
+        self.mode = mode
+        self.format = format
+        self.dpi = dpi
+        self.profile = profile
+        self.max_points = max_points
+        self.downsample = downsample
+
+    def cache_content(self):
+        if self.figure_cache_key is None:
+            return None
+        return (self.figure_cache_key, self.mode, self.format, self.dpi,
+                repr(self.profile), self.max_points, self.downsample)
+
+    def savefig_bytes(self):
+        """
+        Save the figure to an in-memory buffer.
+
+        Returns:
+            bytes: The encoded image.
+        """
+        kwargs = self.profile.savefig_kwargs(self.format, self.dpi)
 
+        buf = io.BytesIO()
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(self.profile.prepared(self.content, self.format))
+            if self.max_points is not None:
+                stack.enter_context(downsampled_lines(
+                    self.content, self.max_points, self.downsample))
+            if self.format == "svg":
+                # Keep SVG output deterministic so identical figures share an asset
+                stack.enter_context(
+                    matplotlib.rc_context({'svg.hashsalt': 'dashboard_builder'}))
+                kwargs['metadata'] = {'Date': None}
+            self.content.savefig(buf, **kwargs)
+        return buf.getvalue()
+
+    @cached_render
     def render(self):
         """
         Render the Matplotlib plot as an embedded image in an HTML string using the 
         specified template.
 
         The method performs the following steps:
-        1. Converts the Matplotlib object to a figure.
-        2. Saves the figure as an image to an in-memory bytes buffer.
-        3. Encodes the bytes buffer to Base64.
-        4. Renders the encoded image using a specified template.
+        1. Saves the figure as an image to an in-memory bytes buffer, in the
+           rendering process pool when one is configured.
+        2. Either encodes the image to a Base64 data URL, or stores it in the
+           content-addressed asset store and uses its URL.
+        3. Renders the image source using a specified template.
 
         Returns:
             str: HTML representation of the embedded image chart.
         """
-        # Create a bytes buffer for the image to save to
-        buf = io.BytesIO()
+        return self.render_image(run_in_process(_savefig_bytes, self))
 
-        # Convert the plt object to a Figure, then save the figure to the buffer
-        self.content.savefig(buf, format="png", bbox_inches='tight')
-        buf.seek(0)
+    def render_image(self, image):
+        """
+        Render an already saved image of the figure.
 
-        # Convert bytes to a data URL (base64 encoding)
-        encoded_bytes = base64.b64encode(buf.getvalue())
-        data_url = "data:image/png;base64," + encoded_bytes.decode('utf8')
+        Args:
+            image (bytes): The encoded image, as returned by `savefig_bytes`.
+
+        Returns:
+            str: HTML representation of the embedded image chart.
+        """
+        mimetype = self.IMAGE_FORMATS[self.format]
 
-        buf.close()
+        if self.mode == "url":
+            src = store_asset(image, mimetype, self.format)
+        else:
+            # Convert bytes to a data URL (base64 encoding)
+            encoded_bytes = base64.b64encode(image)
+            src = f"data:{mimetype};base64," + encoded_bytes.decode('utf8')
 
-        return render_template_string(
-            get_jinja_subtemplate("outputs/outputchart_matplotlib.j2"),
-            image=data_url)
+        return render_subtemplate(
+            "outputs/outputchart_matplotlib.j2",
+            image=src)
 
 
-class OutputChart_Plotly:
+class OutputChart_Plotly(BaseOutput):
     """
     Represents a chart output component for a dashboard or view using Plotly.
     This class facilitates rendering Plotly charts in an HTML view.
     """
-    def __init__(self, content):
+    def __init__(self, content, max_points=None, downsample="lttb",
+                 webgl_threshold=WEBGL_THRESHOLD, typed_arrays=None,
+                 cache_key=None):
         """
         Initialize a new instance of the OutputChart_Plotly class.
 
         Args:
             content: A Plotly chart object.
+            max_points (int, optional): Downsample scatter and line traces with
+                more points than this before serializing them. Defaults to None
+                (all points are kept).
+            downsample (str, optional): Downsampling method, "lttb" (Largest-
+                Triangle-Three-Buckets, keeps the visual shape) or "minmax"
+                (keeps the lowest and highest point per bucket, so every
+                peak). Defaults to "lttb".
+            webgl_threshold (int, optional): Scatter traces with more points
+                than this are drawn as `scattergl` (WebGL) instead of SVG.
+                Defaults to WEBGL_THRESHOLD (50,000); None keeps every trace's
+                type.
+            typed_arrays (bool, optional): Send numeric arrays as base64 typed
+                arrays instead of lists of JSON numbers. Needs plotly.js 2.28
+                or later, so defaults to whether the plotly.js version pages
+                load (that of the installed plotly package) supports them.
+            cache_key (str, optional): A key identifying what the figure shows,
+                used by the render cache instead of hashing the figure's arrays
+                and layout. Defaults to None.
         """
         self.content = content
-
+        self.figure_cache_key = cache_key
+        self.max_points = max_points
+        self.downsample = downsample
+        self.webgl_threshold = webgl_threshold
+        self.typed_arrays = (TYPED_ARRAYS_SUPPORTED if typed_arrays is None
+                             else typed_arrays)
+        self._figure = None
+
+    def figure(self):
+        """
+        The figure to render, prepared once per component: downsampled when
+        `max_points` is set, with large scatter traces switched to WebGL and
+        numeric arrays encoded as typed arrays.
+        """
+        if self._figure is None:
+            if self.max_points is None and self.webgl_threshold is None and \
+                    not self.typed_arrays:
+                self._figure = self.content
+            else:
+                figure = self.content.to_dict()
+                if self.max_points is not None:
+                    downsample_plotly(figure, self.max_points, self.downsample)
+                if self.webgl_threshold is not None:
+                    use_webgl(figure, self.webgl_threshold)
+                if self.typed_arrays:
+                    encode_typed_arrays(figure)
+                self._figure = figure
+        return self._figure
+
+    def cache_content(self):
+        options = (self.max_points, self.downsample, self.webgl_threshold,
+                   self.typed_arrays)
+        if self.figure_cache_key is not None:
+            return (self.figure_cache_key, *options)
+        figure = self.content
+        if hasattr(figure, 'to_dict'):
+            figure = figure.to_dict()
+        digest = hashlib.sha256()
+        _update_digest(digest, figure)
+        return (digest.digest(), *options)
+
+    @cached_render
     def render(self):
         """
         Render the Plotly chart as an embedded HTML using the specified template.
 
         The method performs the following steps:
-        1. Converts the Plotly chart to an HTML string.
+        1. Converts the Plotly chart to an HTML string, without the plotly.js
+           bundle; `DashboardOutput` loads plotly.js once per page.
         2. Renders the HTML string using a specified template.
 
         Returns:
             str: HTML representation of the embedded Plotly chart.
         """
-        chart_html = pio.to_html(self.content, full_html=False)
+        chart_html = pio.to_html(
+            self.figure(), full_html=False, include_plotlyjs=False,
+            validate=False)
         
-        return render_template_string(
-            get_jinja_subtemplate("outputs/outputchart_plotly.j2"),
+        return render_subtemplate(
+            "outputs/outputchart_plotly.j2",
             chart_html=chart_html)
 
 
-class OutputTable_HTML:
+class OutputTable_HTML(BaseOutput):
     """
     Represents a table output component for a dashboard or view using HTML.
     This class facilitates rendering tabular data in an HTML view.
     """
-    def __init__(self, content):
+    def __init__(self, content, page_size=None):
         """
         Initialize a new instance of the OutputTable_HTML class.
 
         Args:
-            data (list): A list of dictionaries representing the rows of the table. 
-                         Each dictionary should have the same keys representing 
-                         the columns.
+            content (pandas.DataFrame): The table to display.
+            page_size (int, optional): Paginate the table with this many rows per
+                page. Only the first page is rendered into the page; further
+                pages, sorting and filtering are served as JSON by the dashboard
+                builder routes, which requires `dashboard_builder.init_app(app)`.
+                The DataFrame is kept referenced, not copied, by the running
+                process, in an LRU of the 64 most recent paginated tables.
+                When a request for a page reaches a process that does not hold
+                the table (another worker, or after eviction), the table posts
+                the page's input values back to the dashboard view, which
+                builds it again; the view must accept POST requests, as for
+                deferred outputs. Defaults to None (render every row).
+
+        Raises:
+            ValueError: If page_size is not a positive integer.
         """
-        self.content = content  # Assuming data is a list of dictionaries
+        if page_size is not None and (not isinstance(page_size, int) or page_size < 1): # noqa
+            raise ValueError("page_size must be a positive integer.")
+
+        self.content = content
+        self.page_size = page_size
+        self.table_id = None
+        if page_size is not None:
+            # Content-addressed, so identical tables share an id across requests
+            key = self.cache_key()
+            self.table_id = key[:32] if key else uuid.uuid4().hex
+            register_table(self.table_id, content, page_size)
+
+    def cache_content(self):
+        try:
+            row_hashes = pd.util.hash_pandas_object(self.content, index=True)
+        except TypeError:
+            # Unhashable cell values (e.g. lists)
+            return None
+        return (
+            repr(list(self.content.columns)),
+            repr(list(self.content.dtypes)),
+            row_hashes.values.tobytes(),
+            self.page_size,
+        )
 
+    @cached_render
     def render(self):
         """
         Render the tabular data as an HTML table using the specified template.
@@ -137,16 +609,57 @@ class OutputTable_HTML:
         Returns:
             str: HTML representation of the data in table format.
         """
+        if self.page_size is not None:
+            return self.render_page()
 
-        # transform to dictionary
+        # Same markup as outputs/outputtable_html.j2, built column-wise
+        return render_table_html(self.content)
 
-        dataframe = self.content.to_dict(orient='records')
+    def stream(self, chunk_size=10000):
+        """
+        Render the table in chunks of rows, for streaming very large tables to
+        the browser with `DashboardOutput.stream()`. The render cache is not
+        used, since the point is not to hold the whole table in memory.
 
-        return render_template_string(
-            get_jinja_subtemplate("outputs/outputtable_html.j2"),
-            data=dataframe)
+        Args:
+            chunk_size (int, optional): Rows per chunk. Defaults to 10000.
 
-class OutputMarkdown():
+        Yields:
+            str: Consecutive pieces of the table's HTML.
+        """
+        if self.page_size is not None:
+            yield self.render_page()
+            return
+        yield from iter_table_html(self.content, chunk_size)
+
+    def render_page(self):
+        """
+        Render the first page of a paginated table, with the controls that load
+        further pages from the table route.
+
+        Returns:
+            str: HTML representation of the paginated table.
+        """
+        page = table_page(self.table_id, self.content, page_size=self.page_size)
+        # The request that builds the table again. Any request building the
+        # same table will do, so rendered tables can be shared by the cache.
+        view_url, values = None, []
+        if has_request_context():
+            view_url = request.url
+            values = [(name, value)
+                      for name, value in request.form.items(multi=True)
+                      if not name.startswith('_db_')]
+        return render_subtemplate(
+            "outputs/outputtable_paginated.j2",
+            table_id=self.table_id,
+            url=dashboard_url('dashboard_builder.table', table_id=self.table_id),
+            view_url=view_url,
+            values=values,
+            table_field=TABLE_FIELD,
+            query_field=TABLE_QUERY_FIELD,
+            **page)
+
+class OutputMarkdown(BaseOutput):
     """
     Represents a markdown output component for a dashboard or view.
     This class facilitates rendering markdown content in an HTML view.
@@ -160,6 +673,10 @@ class OutputMarkdown():
         """
         self.content = content
 
+    def cache_content(self):
+        return (self.content,)
+
+    @cached_render
     def render(self):
         """
         Convert the markdown content to HTML and then render it 
@@ -169,9 +686,9 @@ class OutputMarkdown():
             str: HTML representation of the markdown content.
         """
 
-        html_content = markdown(self.content)    
-        return render_template_string(
-            get_jinja_subtemplate("outputs/outputmarkdown.j2"),
+        html_content = render_markdown(self.content)
+        return render_subtemplate(
+            "outputs/outputmarkdown.j2",
             content=html_content,
         )
 
@@ -179,12 +696,13 @@ class OutputMarkdown():
 
 
 
-class OutputChart_Altair:
+class OutputChart_Altair(BaseOutput):
     """
     Represents a chart output component for a dashboard or view using Altair.
     This class facilitates rendering Altair charts in an HTML view.
     """
-    def __init__(self, content, chart_title, chart_id):
+    def __init__(self, content, chart_title, chart_id, data_url=False,
+                 max_points=None, downsample="lttb", cache_key=None):
         """
         Initialize a new instance of the OutputChart_Altair class.
 
@@ -192,11 +710,87 @@ class OutputChart_Altair:
             content: An Altair chart object.
             chart_title (str): The title for the Altair chart.
             chart_id (str): A unique identifier for the chart.
+            data_url (bool, optional): Serve the chart's data separately from
+                its spec, as compressed JSON loaded by URL, instead of inlining
+                every row in the page. Data shared by several charts is loaded
+                once. Requires `dashboard_builder.init_app(app)`. Defaults to
+                False.
+            max_points (int, optional): Downsample the data of a chart plotting
+                DataFrame columns on its x and y axes to at most this many rows,
+                shared between the series of its color or detail field.
+                Defaults to None (all rows are kept).
+            downsample (str, optional): Downsampling method, "lttb" or
+                "minmax". Defaults to "lttb".
+            cache_key (str, optional): A key identifying what the chart shows,
+                used by the render cache instead of hashing the chart's data
+                and spec. Defaults to None.
         """
         self.content = content
+        self.figure_cache_key = cache_key
         self.chart_title = chart_title
         self.chart_id = chart_id
+        self.data_url = data_url
+        self.max_points = max_points
+        self.downsample = downsample
+        self._chart_json = None
+        self._data_urls = {}
 
+    def chart(self):
+        """
+        The chart to render, with its data downsampled when `max_points` is set
+        and its x and y fields can be found.
+        """
+        chart = self.content
+        series = altair_series(chart) if self.max_points is not None else None
+        if series is not None:
+            x, y, groups = series
+            data = downsample_frame(chart.data, x, y, self.max_points,
+                                    self.downsample, groups)
+            if data is not chart.data:
+                chart = chart.copy(deep=False)
+                chart.data = data
+        return chart
+
+    def chart_json(self):
+        """
+        Serialize the Altair chart to a JSON string, once per component.
+
+        With `data_url`, the datasets are stored as chart data assets and left
+        out of the spec, which refers to them by their content-hashed names.
+        """
+        if self._chart_json is None:
+            spec = self.chart().to_dict()
+            if self.data_url:
+                datasets = spec.pop('datasets', {})
+                self._data_urls = {
+                    name: store_chart_data(values, digest=name)
+                    for name, values in datasets.items()}
+            self._chart_json = dumps_json(spec)
+        return self._chart_json
+
+    def cache_content(self):
+        options = (self.data_url, self.max_points, self.downsample,
+                   self.chart_title, self.chart_id)
+        if self.figure_cache_key is not None:
+            return (self.figure_cache_key, *options)
+
+        chart = self.content
+        data = getattr(chart, 'data', None)
+        if not isinstance(data, pd.DataFrame):
+            return (dumps_json(chart.to_dict()), *options)
+        try:
+            row_hashes = pd.util.hash_pandas_object(data, index=True)
+        except TypeError:
+            # Unhashable cell values (e.g. lists)
+            return None
+        # The spec without the rows; one row keeps the field types inferred
+        # from the data
+        spec = chart.copy(deep=False)
+        spec.data = data.head(1)
+        return (row_hashes.values.tobytes(), repr(list(data.columns)),
+                repr(list(data.dtypes)), dumps_json(spec.to_dict()), *options)
+
+    @cached_render
     def render(self):
         """
         Render the Altair chart as an embedded JSON in an HTML string using the 
@@ -209,18 +803,18 @@ class OutputChart_Altair:
         Returns:
             str: HTML representation of the embedded Altair chart.
         """
-        chart_json = json.dumps(self.content.to_dict())
-        
-        return render_template_string(
-            get_jinja_subtemplate("outputs/outputchart_altair.j2"),
+        chart_json = self.chart_json()
+
+        return render_subtemplate(
+            "outputs/outputchart_altair.j2",
             chart_json=chart_json, chart_title = self.chart_title,
-            chart_id=self.chart_id)
+            chart_id=self.chart_id, data_urls=self._data_urls)
 
 
 
 
 
-class OutputImage:
+class OutputImage(BaseOutput):
     """
     Represents an image output component for a dashboard or view.
     This class facilitates rendering an image in an HTML view.
@@ -238,6 +832,10 @@ class OutputImage:
         self.src = src
         self.alt = alt
 
+    def cache_content(self):
+        return (self.src, self.alt)
+
+    @cached_render
     def render(self):
         """
         Render the image as an HTML <img> element using the specified template.
@@ -245,11 +843,133 @@ class OutputImage:
         Returns:
             str: HTML representation of the image.
         """
-        return render_template_string(
-            get_jinja_subtemplate("outputs/outputimage.j2"),
+        return render_subtemplate(
+            "outputs/outputimage.j2",
             src=self.src, alt=self.alt)
 
 
+# Form field naming the deferred output a request asks for
+FRAGMENT_FIELD = '_db_fragment'
 
-    
+# Form fields of the page requests of paginated tables, see
+# DashboardOutput.render_table()
+TABLE_FIELD = '_db_table'
+TABLE_QUERY_FIELD = '_db_table_query'
+
+# Form fields of partial updates, see DependentOutput
+PARTIAL_FIELD = '_db_partial'
+CHANGED_FIELD = '_db_changed'
+
+
+class DeferredOutput:
+    """
+    Wraps an output component so the page only contains a lightweight
+    placeholder, which loads the rendered component with a separate request
+    once the page is displayed.
+    """
+    def __init__(self, content):
+        """
+        Initialize a new instance of the DeferredOutput class.
+
+        Args:
+            content: The output component to load on demand.
+        """
+        self.content = content
+        self.fragment_id = None
+        self.url = None
+        self.values = {}
+
+    def render(self):
+        """
+        Render the placeholder, or the component itself if it has not been
+        given a fragment id by a ComponentManager.
+
+        Returns:
+            str: HTML representation of the placeholder.
+        """
+        if self.fragment_id is None:
+            return self.content.render()
+
+        return render_subtemplate(
+            "outputs/outputdeferred.j2",
+            fragment_id=self.fragment_id,
+            url=self.url,
+            values=self.values,
+            field=FRAGMENT_FIELD)
+
+    def render_fragment(self):
+        """
+        Render the wrapped component, in response to the placeholder's request.
+
+        Returns:
+            str: HTML representation of the component.
+        """
+        return self.content.render()
+
+
+class DependentOutput:
+    """
+    Wraps an output component with a declaration of the inputs it depends on.
+
+    Pages with dependent outputs submit their forms as partial updates: only
+    the names of the inputs that changed are sent along with the form, and
+    the server answers with the dependent outputs affected by those inputs,
+    which replace their previous version in the page.
+    """
+    def __init__(self, content, inputs):
+        """
+        Initialize a new instance of the DependentOutput class.
+
+        Args:
+            content: The output component.
+            inputs (list): Names of the input components the output depends on.
+        """
+        self.content = content
+        self.inputs = tuple(inputs)
+        self.output_id = None
+        # Set on the first dependent output of a page, which carries the script
+        self.include_script = False
+
+    def depends_on(self, changed_inputs):
+        """
+        Check whether the output is affected by a set of changed inputs.
+
+        Args:
+            changed_inputs (set): Names of the inputs that changed.
+
+        Returns:
+            bool: True if any of the output's inputs changed.
+        """
+        return not changed_inputs.isdisjoint(self.inputs)
+
+    def render(self):
+        """
+        Render the component inside a container that partial updates replace,
+        or the component alone if it has not been given an id by a
+        ComponentManager.
+
+        Returns:
+            str: HTML representation of the output.
+        """
+        html = self.content.render()
+        if self.output_id is None:
+            return html
+
+        return render_subtemplate(
+            "outputs/outputdependent.j2",
+            output_id=self.output_id,
+            inputs=self.inputs,
+            content=html,
+            include_script=self.include_script,
+            partial_field=PARTIAL_FIELD,
+            changed_field=CHANGED_FIELD)
+
+    def render_fragment(self):
+        """
+        Render the wrapped component for a partial update.
+
+        Returns:
+            str: HTML representation of the component.
+        """
+        return self.content.render()
 
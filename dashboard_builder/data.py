@@ -0,0 +1,302 @@
+# dashboard_builder/data.py
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Registered datasets by name, as (frame, version)
+_datasets = {}
+# id() of every registered frame mapped to its (name, version)
+_frame_versions = {}
+_lock = threading.Lock()
+# Counter versioning datasets whose content cannot be hashed
+_version = 0
+
+# Where memory-mapped datasets are stored, see set_storage_dir()
+_storage_dir = os.path.join(tempfile.gettempdir(), 'dashboard_builder_datasets')
+
+# Readers for file sources, by extension. Parquet and Arrow files need pyarrow.
+READERS = {
+    '.csv': pd.read_csv,
+    '.parquet': pd.read_parquet,
+    '.arrow': pd.read_feather,
+    '.feather': pd.read_feather,
+}
+
+FORMAT_VERSION = 2
+
+
+def set_storage_dir(path):
+    """
+    Set the directory memory-mapped datasets are written to. Every worker
+    process of an application must use the same directory to share them.
+
+    Args:
+        path (str): The directory. Defaults to a `dashboard_builder_datasets`
+            directory in the system's temporary directory.
+    """
+    global _storage_dir
+    _storage_dir = os.fspath(path)
+
+
+def _read_source(source, read_kwargs):
+    extension = os.path.splitext(os.fspath(source))[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Cannot read '{source}', expected one of "
+                         f"{', '.join(READERS)} files.")
+    try:
+        return READERS[extension](source, **read_kwargs)
+    except ImportError as error:
+        raise ImportError(
+            f"Reading {extension} files requires pyarrow: {error}") from None
+
+
+def _source_digest(name, source, read_kwargs):
+    """
+    Identify a file source by its path, size and modification time, so worker
+    processes can reuse stored data without reading the file again.
+    """
+    stat = os.stat(source)
+    options = sorted((key, repr(value)) for key, value in read_kwargs.items())
+    identity = (FORMAT_VERSION, name, os.path.realpath(source), stat.st_size,
+                stat.st_mtime_ns, options)
+    return hashlib.sha256(repr(identity).encode('utf8')).hexdigest()[:32]
+
+
+def _frame_digest(name, frame):
+    """
+    Identify a frame by its content, or return None if it cannot be hashed.
+    """
+    try:
+        row_hashes = pd.util.hash_pandas_object(frame, index=True)
+    except TypeError:
+        return None
+    digest = hashlib.sha256(repr((FORMAT_VERSION, name)).encode('utf8'))
+    digest.update(repr(list(frame.columns)).encode('utf8'))
+    digest.update(repr(list(frame.dtypes)).encode('utf8'))
+    digest.update(row_hashes.values.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def _column_arrays(column):
+    """
+    Convert a column to the arrays it is stored as: its values, plus the
+    categories for categorical and text columns, which are stored as
+    categorical codes.
+
+    Returns:
+        tuple or None: (kind, values, categories), or None if the column cannot
+        be stored as plain arrays.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        kind, categorical = 'categorical', column.array
+    elif column.dtype == object:
+        values = column.dropna()
+        if not all(isinstance(value, str) for value in values):
+            return None
+        kind, categorical = 'text', pd.Categorical(column)
+    elif isinstance(column.dtype, np.dtype) and column.dtype.kind in 'biufmM':
+        return ('values', column.to_numpy(), None)
+    else:
+        return None
+
+    categories = categorical.categories
+    if not all(isinstance(value, str) for value in categories):
+        return None
+    return (kind, categorical.codes, np.asarray(categories, dtype=str))
+
+
+def _write_dataset(frame, path):
+    """
+    Write a frame as one .npy file per column. Written to a temporary
+    directory first and renamed, so other processes never see partial data.
+
+    Returns:
+        bool: False if the frame cannot be stored as plain arrays.
+    """
+    if not isinstance(frame.index, pd.RangeIndex) or frame.index.start != 0 or \
+            frame.index.step != 1 or not frame.columns.is_unique:
+        return False
+
+    arrays = [_column_arrays(frame[column]) for column in frame.columns]
+    if any(array is None for array in arrays):
+        return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staging = tempfile.mkdtemp(dir=os.path.dirname(path))
+    try:
+        columns = []
+        for position, (column, (kind, values, categories)) in enumerate(
+                zip(frame.columns, arrays)):
+            np.save(os.path.join(staging, f"{position}.npy"), values,
+                    allow_pickle=False)
+            if categories is not None:
+                np.save(os.path.join(staging, f"{position}.categories.npy"),
+                        categories, allow_pickle=False)
+            columns.append({'name': column, 'kind': kind})
+        with open(os.path.join(staging, 'meta.json'), 'w') as file:
+            json.dump({'columns': columns, 'rows': len(frame)}, file)
+        os.rename(staging, path)
+    except OSError:
+        # Another process stored the same dataset first
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            raise
+    return True
+
+
+def _map_dataset(path, categorical=False):
+    """
+    Open a stored dataset as a DataFrame whose columns are read-only memory
+    maps of the stored files. Text columns are decoded into object columns,
+    unless `categorical` keeps them as categoricals of the mapped codes.
+    """
+    with open(os.path.join(path, 'meta.json')) as file:
+        meta = json.load(file)
+
+    columns = {}
+    for position, column in enumerate(meta['columns']):
+        values = np.load(os.path.join(path, f"{position}.npy"), mmap_mode='r')
+        if column['kind'] != 'values':
+            categories = np.load(os.path.join(path, f"{position}.categories.npy"))
+        if column['kind'] == 'categorical' or (
+                column['kind'] == 'text' and categorical):
+            values = pd.Categorical.from_codes(values, categories=categories)
+        elif column['kind'] == 'text':
+            # Code -1, a missing value, takes the NaN appended last
+            values = np.append(categories.astype(object), np.nan).take(values)
+        columns[column['name']] = values
+    # copy=False keeps the memory maps instead of consolidating them
+    return pd.DataFrame(columns, copy=False,
+                        index=pd.RangeIndex(meta['rows']))
+
+
+def register_dataset(name, source, memory_map=True, categorical=False,
+                     **read_kwargs):
+    """
+    Register a dataset under a name, replacing any dataset registered under
+    the same name before.
+
+    The data is stored once as a directory of NumPy files, one per column, with
+    text columns stored as categorical codes, and every process registering
+    the same data maps those files read-only instead of holding its own copy.
+    The directory of the version a new registration replaces is deleted.
+    Worker processes that register the same file find it already stored and
+    skip reading it. Datasets that cannot be stored as plain arrays (e.g.
+    columns of lists, or a custom index) are kept in memory.
+
+    Values derived from registered datasets, such as dropdown options, are
+    cached under the dataset's name and version. The version is a digest of
+    the data (of a file source's path, size and modification time), so every
+    worker process registering the same data agrees on it, and registering
+    new data gives the dataset a new version, which invalidates them. Data
+    that cannot be hashed gets a version local to the process.
+
+    Read the registered data with `get_dataset(name)`. Memory-mapped columns
+    are read-only. Text columns are decoded into regular object columns held
+    by each process, unless `categorical` keeps them as categoricals of the
+    shared codes.
+
+    Args:
+        name (str): Name of the dataset.
+        source (pandas.DataFrame or str): The data, or the path of a CSV,
+            Parquet or Arrow/Feather file. Parquet and Arrow need pyarrow.
+        memory_map (bool, optional): Store the data in the storage directory
+            and map it. Defaults to True.
+        categorical (bool, optional): Return the text columns of a
+            memory-mapped dataset with a categorical dtype, which shares their
+            memory between processes but changes how they group, compare and
+            accept new values. Defaults to False.
+        **read_kwargs: Passed to the pandas reader of a file source.
+
+    Returns:
+        str: The version of the dataset.
+    """
+    global _version
+
+    frame = source if isinstance(source, pd.DataFrame) else None
+    if frame is None:
+        digest = _source_digest(name, source, read_kwargs)
+    else:
+        digest = _frame_digest(name, frame)
+    if memory_map:
+        path = os.path.join(_storage_dir, digest or '')
+
+        stored = digest is not None and os.path.exists(
+            os.path.join(path, 'meta.json'))
+        if not stored:
+            if frame is None:
+                frame = _read_source(source, read_kwargs)
+            stored = digest is not None and _write_dataset(frame, path)
+            if not stored:
+                warnings.warn(f"Dataset {name!r} cannot be memory-mapped and is "
+                              "kept in memory.", stacklevel=2)
+        if stored:
+            frame = _map_dataset(path, categorical)
+    elif frame is None:
+        frame = _read_source(source, read_kwargs)
+
+    with _lock:
+        if digest is None:
+            _version += 1
+            digest = f'{os.getpid()}-{_version}'
+        previous = _datasets.get(name)
+        if previous is not None:
+            _frame_versions.pop(id(previous[0]), None)
+        _datasets[name] = (frame, digest)
+        _frame_versions[id(frame)] = (name, digest)
+
+    if previous is not None and previous[1] != digest:
+        # Frames already mapped keep their data after the files are deleted
+        shutil.rmtree(os.path.join(_storage_dir, previous[1]), ignore_errors=True)
+    return digest
+
+
+def get_dataset(name):
+    """
+    Retrieve a registered dataset.
+
+    Args:
+        name (str): Name of the dataset.
+
+    Returns:
+        pandas.DataFrame: The registered frame.
+
+    Raises:
+        KeyError: If no dataset is registered under the name.
+    """
+    try:
+        return _datasets[name][0]
+    except KeyError:
+        raise KeyError(f"No dataset registered under the name {name!r}.") from None
+
+
+def get_dataset_version(name):
+    """
+    Retrieve the version of a registered dataset, e.g. to use in cache keys.
+    Every process registering the same data gets the same version.
+
+    Raises:
+        KeyError: If no dataset is registered under the name.
+    """
+    try:
+        return _datasets[name][1]
+    except KeyError:
+        raise KeyError(f"No dataset registered under the name {name!r}.") from None
+
+
+def dataset_version(frame):
+    """
+    Look up the name and version of a registered frame.
+
+    Returns:
+        tuple or None: (name, version), or None if the frame is not registered.
+    """
+    return _frame_versions.get(id(frame))
@@ -0,0 +1,268 @@
+# dashboard_builder/downsampling.py
+
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+METHODS = ('lttb', 'minmax')
+
+
+def _numeric(values):
+    """
+    View a sequence as a float array, or return None if it is not numeric or
+    datetime-like.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'mM':
+        return values.view('int64').astype('float64')
+    if values.dtype.kind in 'biuf':
+        return values.astype('float64', copy=False)
+    return None
+
+
+def _bucket_bounds(length, buckets):
+    """
+    Split the points between the first and the last into equally sized
+    buckets, returning the start of each and the end of the last.
+    """
+    return np.linspace(1, length - 1, buckets + 1).astype(np.intp)
+
+
+def lttb(x, y, n_out):
+    """
+    Select the points of a series to keep with the Largest-Triangle-Three-
+    Buckets algorithm, which preserves the visual shape of the series.
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the point kept from the
+    previous bucket and the average of the next bucket.
+
+    Args:
+        x (numpy.ndarray): Float x values, sorted ascending.
+        y (numpy.ndarray): Float y values.
+        n_out (int): Number of points to keep, at least 3.
+
+    Returns:
+        numpy.ndarray: Ascending positions of the kept points.
+    """
+    length = len(x)
+    bounds = _bucket_bounds(length, n_out - 2)
+    starts, ends = bounds[:-1], bounds[1:]
+    # Averages of every bucket, plus the last point standing in for the bucket
+    # after the last one
+    sums_x = np.add.reduceat(x[:-1], starts)
+    sums_y = np.add.reduceat(y[:-1], starts)
+    sizes = ends - starts
+    next_x = np.append(sums_x[1:] / sizes[1:], x[-1])
+    next_y = np.append(sums_y[1:] / sizes[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, length - 1
+    previous = 0
+    for bucket, (start, end) in enumerate(zip(starts, ends)):
+        # Twice the triangle areas; the factor does not change the maximum
+        areas = np.abs(
+            (x[previous] - next_x[bucket]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y[bucket] - y[previous]))
+        if np.isnan(areas).all():
+            previous = start
+        else:
+            previous = start + int(np.nanargmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax(x, y, n_out):
+    """
+    Select the points of a series to keep by keeping the lowest and highest
+    point of equally sized buckets, which preserves every peak of the series.
+
+    Args:
+        x (numpy.ndarray): Float x values, sorted ascending.
+        y (numpy.ndarray): Float y values.
+        n_out (int): Number of points to keep, at least 4.
+
+    Returns:
+        numpy.ndarray: Ascending positions of the kept points.
+    """
+    length = len(x)
+    buckets = (n_out - 2) // 2
+    size = -(-(length - 2) // buckets)
+    buckets = -(-(length - 2) // size)
+    # Pad the inner points to a whole number of buckets; NaN never wins
+    inner = np.full(buckets * size, np.nan)
+    inner[:length - 2] = y[1:-1]
+    inner = inner.reshape(buckets, size)
+    offsets = np.arange(buckets) * size + 1
+    lows = offsets + np.argmin(np.where(np.isnan(inner), np.inf, inner), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(inner), -np.inf, inner), axis=1)
+    selected = np.concatenate(([0], lows, highs, [length - 1]))
+    return np.unique(np.minimum(selected, length - 1))
+
+
+def downsample_indices(x, y, max_points, method='lttb'):
+    """
+    Positions of the points to keep when drawing a series with at most
+    `max_points` points.
+
+    Args:
+        x (sequence or None): x values, numeric or datetime-like, sorted
+            ascending. None for a series indexed by position.
+        y (sequence): Numeric y values.
+        max_points (int): Maximum number of points to keep.
+        method (str, optional): "lttb" or "minmax". Defaults to "lttb".
+
+    Returns:
+        numpy.ndarray or None: Ascending positions of the kept points, or None
+        if the series is short enough or cannot be downsampled (non-numeric or
+        unsorted values).
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Invalid downsampling method '{method}', expected one "
+                         f"of {', '.join(METHODS)}.")
+    length = len(y)
+    if length <= max_points or max_points < 4:
+        return None
+
+    y = _numeric(y)
+    x = np.arange(length, dtype='float64') if x is None else _numeric(x)
+    if x is None or y is None or len(x) != length:
+        return None
+    if not (np.diff(x) >= 0).all():
+        return None
+    select = lttb if method == 'lttb' else minmax
+    return select(x, y, max_points)
+
+
+def downsample_plotly(figure, max_points, method='lttb'):
+    """
+    Downsample the scatter traces of a Plotly figure.
+
+    Args:
+        figure (dict): The figure as a dict, e.g. from `Figure.to_dict()`. Its
+            traces are replaced.
+        max_points (int): Maximum number of points per trace.
+        method (str, optional): "lttb" or "minmax". Defaults to "lttb".
+
+    Returns:
+        dict: The figure.
+    """
+    for trace in figure.get('data', []):
+        if trace.get('type', 'scatter') not in ('scatter', 'scattergl'):
+            continue
+        y = trace.get('y')
+        if y is None:
+            continue
+        length = len(y)
+        indices = downsample_indices(trace.get('x'), y, max_points, method)
+        if indices is None:
+            continue
+        for key in ('x', 'y', 'text', 'hovertext', 'customdata'):
+            values = trace.get(key)
+            if values is not None and not isinstance(values, str) and \
+                    len(values) == length:
+                trace[key] = np.asarray(values)[indices]
+        marker = trace.get('marker') or {}
+        for key in ('color', 'size', 'symbol'):
+            values = marker.get(key)
+            if values is not None and not isinstance(values, str) and \
+                    np.ndim(values) == 1 and len(values) == length:
+                marker[key] = np.asarray(values)[indices]
+    return figure
+
+
+def downsample_frame(frame, x, y, max_points, method='lttb', groups=()):
+    """
+    Downsample the rows of a DataFrame holding one or more series.
+
+    Args:
+        frame (pandas.DataFrame): The data, sorted by `x` within each series.
+        x (str): Column of x values.
+        y (str): Column of y values.
+        max_points (int): Maximum number of rows to keep, shared between series.
+        method (str, optional): "lttb" or "minmax". Defaults to "lttb".
+        groups (sequence, optional): Columns identifying separate series, e.g.
+            the color field of a chart. Defaults to none.
+
+    Returns:
+        pandas.DataFrame: The kept rows, or the frame itself if nothing was
+        dropped.
+    """
+    if len(frame) <= max_points:
+        return frame
+    if groups:
+        series = frame.groupby(list(groups), sort=False, dropna=False).indices
+        series = list(series.values())
+    else:
+        series = [np.arange(len(frame))]
+
+    budget = max(max_points // len(series), 4)
+    x_values, y_values = frame[x].to_numpy(), frame[y].to_numpy()
+    kept = []
+    for positions in series:
+        indices = downsample_indices(
+            x_values[positions], y_values[positions], budget, method)
+        kept.append(positions if indices is None else positions[indices])
+    kept = np.sort(np.concatenate(kept))
+    if len(kept) == len(frame):
+        return frame
+    return frame.take(kept)
+
+
+@contextlib.contextmanager
+def downsampled_lines(figure, max_points, method='lttb'):
+    """
+    Temporarily downsample the lines of a Matplotlib figure, e.g. while saving
+    it, and restore their data afterwards.
+
+    Args:
+        figure (matplotlib.figure.Figure): The figure.
+        max_points (int): Maximum number of points per line.
+        method (str, optional): "lttb" or "minmax". Defaults to "lttb".
+    """
+    replaced = []
+    try:
+        for ax in getattr(figure, 'axes', []):
+            for line in ax.lines:
+                x, y = line.get_xdata(), line.get_ydata()
+                indices = downsample_indices(x, y, max_points, method)
+                if indices is not None:
+                    replaced.append((line, x, y))
+                    line.set_data(np.asarray(x)[indices], np.asarray(y)[indices])
+        yield figure
+    finally:
+        for line, x, y in replaced:
+            line.set_data(x, y)
+
+
+def altair_series(chart):
+    """
+    Find the x, y and series fields of a single-view Altair chart.
+
+    Returns:
+        tuple or None: (x, y, groups), or None if the chart does not plot
+        fields of a DataFrame on both axes.
+    """
+    data = getattr(chart, 'data', None)
+    encoding = getattr(chart, 'encoding', None)
+    if not isinstance(data, pd.DataFrame) or not hasattr(encoding, 'x'):
+        return None
+
+    fields = {}
+    for channel in ('x', 'y', 'color', 'detail', 'strokeDash'):
+        definition = getattr(encoding, channel, None)
+        field = getattr(definition, 'field', None)
+        if not isinstance(field, str):
+            shorthand = getattr(definition, 'shorthand', None)
+            field = shorthand.split(':')[0] if isinstance(shorthand, str) else None
+        if field in data.columns:
+            fields[channel] = field
+    if 'x' not in fields or 'y' not in fields:
+        return None
+    groups = [fields[channel] for channel in ('color', 'detail', 'strokeDash')
+              if channel in fields]
+    return fields['x'], fields['y'], groups
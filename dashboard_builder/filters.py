@@ -0,0 +1,251 @@
+# dashboard_builder/filters.py
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache
+from .data import dataset_version, get_dataset
+
+# Input value meaning "do not filter on this input"
+SELECT_ALL = 'Select All'
+
+
+class _ValueIndex:
+    """
+    Row positions of every distinct value of a column, built with a single
+    pass over the column.
+    """
+    def __init__(self, column):
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy()
+            uniques = column.cat.categories
+        else:
+            codes, uniques = pd.factorize(column)
+        # Stable sort keeps the positions of each value in ascending order
+        self.order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        starts = np.searchsorted(codes[self.order], 0)
+        bounds = starts + np.concatenate(([0], np.cumsum(counts)))
+        self.slices = {}
+        for value, start, end in zip(uniques.tolist(), bounds[:-1], bounds[1:]):
+            self.slices[value] = (start, end)
+            # Form inputs submit text, so also match values by their text
+            self.slices.setdefault(str(value), (start, end))
+
+    def positions(self, value):
+        start, end = self.slices.get(value, (0, 0))
+        return self.order[start:end]
+
+
+class _RangeIndex:
+    """
+    A column's values in sorted order, for looking up the rows within a range
+    with a binary search.
+    """
+    def __init__(self, column):
+        values = column.to_numpy()
+        self.order = np.argsort(values, kind='stable')
+        self.sorted = values[self.order]
+        # NaN values sort last and never fall within a range
+        self.valid = len(values) - int(pd.isna(self.sorted).sum())
+
+    def positions(self, interval):
+        if np.isfinite(interval.left):
+            side = 'left' if interval.closed_left else 'right'
+            start = np.searchsorted(self.sorted[:self.valid], interval.left, side)
+        else:
+            start = 0
+        if np.isfinite(interval.right):
+            side = 'right' if interval.closed_right else 'left'
+            end = np.searchsorted(self.sorted[:self.valid], interval.right, side)
+        else:
+            end = self.valid
+        return np.sort(self.order[start:end])
+
+
+def _interval(bounds):
+    """
+    Convert range bounds to a pandas.Interval. A (low, high) tuple includes
+    its low bound and excludes its high bound; None means unbounded.
+    """
+    if isinstance(bounds, pd.Interval):
+        return bounds
+    low, high = bounds
+    return pd.Interval(-np.inf if low is None else low,
+                       np.inf if high is None else high, closed='left')
+
+
+class FilterEngine:
+    """
+    Filters a dataset by the values of input components.
+
+    Each input is mapped to a column, and the engine builds an index of the
+    column once per dataset version: the row positions of every distinct value
+    for inputs selecting a value, or the column's sorted values for inputs
+    selecting a range. Filtering then looks up and intersects row positions
+    instead of comparing every row of the column for every request. An input
+    set to "Select All" or left empty does not filter.
+    """
+    def __init__(self, source):
+        """
+        Initialize a new instance of the FilterEngine class.
+
+        Args:
+            source (pandas.DataFrame or str): The frame to filter, or the name
+                of a dataset registered with `register_dataset`. Indexes of a
+                registered dataset are rebuilt when it is registered again;
+                indexes of a frame are built once, so frames modified in place
+                should be registered as a dataset instead.
+        """
+        self.source = source
+        self.filters = {}
+        self._indexes = {}
+        self._indexes_version = None
+        self._predicates = LRUCache(maxsize=256)
+        self._lock = threading.Lock()
+
+    def equals(self, input_name, column):
+        """
+        Keep the rows whose column equals the value of an input, e.g. for a
+        dropdown or radio input.
+
+        Args:
+            input_name (str): Name of the input component.
+            column (str): The column to compare.
+
+        Returns:
+            FilterEngine: The engine, so filters can be chained.
+        """
+        self.filters[input_name] = ('equals', column, None)
+        return self
+
+    def ranges(self, input_name, column, ranges):
+        """
+        Keep the rows whose column falls in the range an input's value is
+        mapped to, e.g. for a categorical slider of value buckets.
+
+        Args:
+            input_name (str): Name of the input component.
+            column (str): The numeric column to compare.
+            ranges (dict): Maps input values to `(low, high)` tuples, which
+                include `low` and exclude `high`, or to `pandas.Interval`s.
+                None stands for an unbounded side.
+
+        Returns:
+            FilterEngine: The engine, so filters can be chained.
+
+        Example:
+        >>>     engine.ranges('bed_selection', 'Number of Beds', {
+                    'hospitals < 100 beds': (None, 100),
+                    'hospitals >= 100 beds': (100, None),
+                })
+        """
+        intervals = {value: _interval(bounds) for value, bounds in ranges.items()}
+        self.filters[input_name] = ('ranges', column, intervals)
+        return self
+
+    def where(self, input_name, predicate):
+        """
+        Keep the rows matched by a predicate of an input's value. For a
+        registered dataset, the matching rows are computed once per dataset
+        version and value.
+
+        Args:
+            input_name (str): Name of the input component.
+            predicate (callable): Called with the frame and the input value,
+                returns a boolean mask of the rows to keep.
+
+        Returns:
+            FilterEngine: The engine, so filters can be chained.
+        """
+        self.filters[input_name] = ('where', None, predicate)
+        return self
+
+    def _frame(self):
+        if isinstance(self.source, str):
+            frame = get_dataset(self.source)
+            return frame, dataset_version(frame)
+        return self.source, None
+
+    def _index(self, version, kind, column, frame):
+        with self._lock:
+            if version != self._indexes_version:
+                self._indexes = {}
+                self._indexes_version = version
+            index = self._indexes.get((kind, column))
+        if index is None:
+            index_class = _ValueIndex if kind == 'equals' else _RangeIndex
+            index = index_class(frame[column])
+            with self._lock:
+                if version == self._indexes_version:
+                    self._indexes[(kind, column)] = index
+        return index
+
+    def _positions(self, frame, version, input_name, value):
+        kind, column, argument = self.filters[input_name]
+        if kind == 'where':
+            key = (version, input_name, value)
+            positions = self._predicates.get(key) if version is not None else None
+            if positions is None:
+                mask = np.asarray(argument(frame, value), dtype=bool)
+                positions = np.flatnonzero(mask)
+                if version is not None:
+                    self._predicates.set(key, positions)
+            return positions
+
+        index = self._index(version, kind, column, frame)
+        if kind == 'equals':
+            return index.positions(value)
+        try:
+            interval = argument[value]
+        except KeyError:
+            raise ValueError(f"No range is defined for the value {value!r} of "
+                             f"the input {input_name!r}.") from None
+        return index.positions(interval)
+
+    def _select(self, frame, version, values):
+        selected = None
+        for input_name in self.filters:
+            value = values.get(input_name)
+            if value is None or value == '' or value == SELECT_ALL:
+                continue
+            positions = self._positions(frame, version, input_name, value)
+            if selected is None:
+                selected = positions
+            else:
+                selected = np.intersect1d(selected, positions, assume_unique=True)
+        return selected
+
+    def positions(self, values):
+        """
+        Row positions of the rows kept by the filters.
+
+        Args:
+            values (dict): Input values by input name, e.g. the manager's
+                `captured_values`.
+
+        Returns:
+            numpy.ndarray or None: Ascending row positions, or None if no filter
+            applies and every row is kept.
+        """
+        return self._select(*self._frame(), values)
+
+    def apply(self, values):
+        """
+        Filter the data by input values.
+
+        Args:
+            values (dict): Input values by input name, e.g. the manager's
+                `captured_values`.
+
+        Returns:
+            pandas.DataFrame: The kept rows, or the unfiltered frame itself if
+            no filter applies.
+        """
+        frame, version = self._frame()
+        positions = self._select(frame, version, values)
+        if positions is None:
+            return frame
+        return frame.take(positions)
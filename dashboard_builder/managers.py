@@ -1,9 +1,5 @@
 # components/managers.py
 
-# Third-party imports
-from flask import render_template_string
-from markdown import markdown
-
 # Local imports for inputs 
 from .components.inputs import (
     InputDropdown,
@@ -22,6 +18,14 @@ from .components.outputs import (
     OutputImage,
     OutputMarkdown,
     OutputChart_Plotly,
+    DeferredOutput,
+    DependentOutput,
+    CHANGED_FIELD,
+    FRAGMENT_FIELD,
+    PARTIAL_FIELD,
+    TABLE_FIELD,
+    enable_render_cache,
+    disable_render_cache,
 )
 
 # local imports of layouts
@@ -30,7 +34,19 @@ from .components.layouts import (
     ExpanderLayout
 )
 
-from .utils import get_jinja_subtemplate
+from .cache import LRUCache, memoize, set_default_cache
+from .data import get_dataset, register_dataset
+from .filters import FilterEngine
+from .outputs import TemplateManager
+from .plotly_encoding import WEBGL_THRESHOLD
+from .reactive import Producer, session_changes
+from .serialization import set_json_serializer
+from .rendering import (
+    configure_rendering,
+    iter_leaf_components,
+    render_components,
+)
+from .utils import render_markdown, render_subtemplate, set_template_auto_reload
 from .theme_utils import set_global_theme, get_global_theme
 from .themes import THEME_COLORS
 
@@ -44,7 +60,7 @@ class OutputGroup:
         self.outputs.append(output)
 
     def render(self):
-        return [output.render() for output in self.outputs]
+        return render_components(self.outputs)
 
 
 class FormGroup:
@@ -103,6 +119,276 @@ class ComponentManager:
     def set_theme(cls, theme_name):
         cls.CURRENT_THEME = theme_name
 
+    @classmethod
+    def set_template_auto_reload(cls, enabled=True):
+        """
+        Reload the component templates whenever they change on disk. By default
+        templates are compiled once at import; enable this only during development.
+        """
+        set_template_auto_reload(enabled)
+
+    @classmethod
+    def enable_render_cache(cls, maxsize=256, ttl=None):
+        """
+        Serve output components whose content has not changed from an in-memory
+        cache of their rendered HTML.
+
+        Args:
+            maxsize (int, optional): Maximum number of rendered outputs to keep.
+                Defaults to 256.
+            ttl (float, optional): Seconds after which a cached output expires.
+                Defaults to None (no expiry).
+        """
+        enable_render_cache(maxsize=maxsize, ttl=ttl)
+
+    @classmethod
+    def disable_render_cache(cls):
+        """Turn the output render cache off again."""
+        disable_render_cache()
+
+    @classmethod
+    def configure_cache(cls, backend=None, render_cache=True,
+                        template_cache_size=None, template_auto_reload=None):
+        """
+        Configure every cache used by the dashboard builder with a single call.
+
+        The backend is shared by the output render cache and by functions
+        decorated with `memoize` or `memoize_dashboard` that were not given a
+        backend of their own. Use a SQLiteCache, ShelveCache or RedisCache from
+        `dashboard_builder.cache` to share cached results between gunicorn workers.
+        Compiled templates hold Python code objects that cannot be shared between
+        processes, so they always stay in an in-process cache; its size and
+        auto-reload mode are set here as well.
+
+        Args:
+            backend (BaseCache, optional): Cache backend. Defaults to an
+                in-process LRUCache(maxsize=256).
+            render_cache (bool, optional): Whether output components are served
+                from the cache. Defaults to True.
+            template_cache_size (int, optional): Number of compiled page
+                templates to keep. Defaults to None (unchanged).
+            template_auto_reload (bool, optional): Reload templates when they
+                change on disk. Defaults to None (unchanged).
+
+        Example:
+        >>>     ComponentManager.configure_cache(
+                    backend=SQLiteCache('/tmp/dashboard_cache.db', ttl=600))
+        """
+        if backend is None:
+            backend = LRUCache(maxsize=256)
+        set_default_cache(backend)
+
+        if render_cache:
+            enable_render_cache(backend=backend)
+        else:
+            disable_render_cache()
+
+        if template_cache_size is not None:
+            TemplateManager.compiled_templates = LRUCache(maxsize=template_cache_size)
+        if template_auto_reload is not None:
+            set_template_auto_reload(template_auto_reload)
+
+    @classmethod
+    def configure_rendering(cls, executor=None, max_workers=None, timeout=None):
+        """
+        Render independent output components concurrently.
+
+        With an executor, the outputs of a page, including the components inside
+        column and expander layouts, are rendered in parallel and reassembled in
+        order. A component that raises or exceeds `timeout` is replaced by an
+        error placeholder, so one failing chart does not break the page.
+
+        Args:
+            executor (str, optional): None (sequential, the default), "thread"
+                for a thread pool, or "process" to also rasterize matplotlib
+                figures in a process pool.
+            max_workers (int, optional): Size of the pools. Defaults to None.
+            timeout (float, optional): Seconds a single component may take.
+                Defaults to None (no limit).
+
+        Example:
+        >>>     ComponentManager.configure_rendering(executor='process', timeout=10)
+        """
+        configure_rendering(executor=executor, max_workers=max_workers,
+                            timeout=timeout)
+
+    @classmethod
+    def configure_json_serializer(cls, serializer='auto'):
+        """
+        Choose how chart outputs serialize their specs and data to JSON.
+
+        By default orjson is used when it is installed, which serializes NumPy
+        arrays directly and is considerably faster than the standard library on
+        large charts.
+
+        Args:
+            serializer (str or callable, optional): "auto", "orjson", "json" for
+                the standard library, or a function serializing an object to a
+                JSON string. Defaults to "auto".
+
+        Example:
+        >>>     ComponentManager.configure_json_serializer('json')
+        """
+        set_json_serializer(serializer)
+
+    @staticmethod
+    def memoize(maxsize=128, ttl=None, backend=None, key=None):
+        """
+        Decorator caching the result of a data processing function, so repeated
+        selections of the same input values skip the pandas filtering.
+
+        Cached results are shared by every request, so memoize data such as
+        filtered DataFrames rather than mutable objects such as matplotlib
+        figures, which concurrent requests would draw at the same time. To
+        cache a chart, give its output a `cache_key` and enable the render
+        cache instead.
+
+        Args:
+            maxsize (int, optional): Maximum number of results kept in memory.
+                Defaults to 128.
+            ttl (float, optional): Seconds after which a result expires. Defaults
+                to None (no expiry).
+            backend (optional): A cache from `dashboard_builder.cache`, e.g.
+                `SQLiteCache('dashboard_cache.db')` to share results between
+                gunicorn workers. Defaults to the backend set with
+                `configure_cache`, or an in-process LRU cache.
+            key (callable, optional): Called with the function's arguments,
+                returns the values identifying the call. Required when the
+                function receives objects such as DataFrames.
+
+        Example:
+        >>>     @ComponentManager.memoize(ttl=600, key=lambda df, values: values)
+                def process_data(df, values):
+                    ...
+        """
+        return memoize(maxsize=maxsize, ttl=ttl, backend=backend, key=key)
+
+    @staticmethod
+    def memoize_dashboard(maxsize=128, ttl=None, backend=None):
+        """
+        Decorator caching a fully rendered dashboard. The decorated function
+        receives the component manager, after its input groups have been created,
+        and returns the rendered page. Pages are keyed on the route and the
+        values captured by the registered inputs.
+
+        Example:
+        >>>     @ComponentManager.memoize_dashboard(ttl=600)
+                def render_dashboard(manager):
+                    ComponentManager.create_output_group(manager, outputs=[...])
+                    return DashboardOutput(manager=manager).render()
+        """
+        def dashboard_key(manager, *args, **kwargs):
+            changed_inputs = manager.changed_inputs
+            if changed_inputs is not None:
+                changed_inputs = sorted(changed_inputs)
+            return (manager.default_route, manager.captured_values,
+                    manager.fragment_id, changed_inputs, args, kwargs)
+        return memoize(maxsize=maxsize, ttl=ttl, backend=backend, key=dashboard_key)
+
+    @classmethod
+    def register_dataset(cls, name, source, memory_map=True, categorical=False,
+                         **read_kwargs):
+        """
+        Register a dataset the dashboard reads from, typically once at startup.
+
+        The data is stored once on disk and memory-mapped, so every worker
+        process of the application shares the same pages instead of loading
+        its own copy; use `get_dataset` to read it. Values derived from a
+        registered dataset, such as the options of a dropdown built from one of
+        its columns, are computed once per dataset version instead of on every
+        request. Registering new data under the same name (e.g. after reloading
+        it) invalidates them.
+
+        Args:
+            name (str): Name of the dataset.
+            source (pandas.DataFrame or str): The data, or the path of a CSV,
+                Parquet or Arrow/Feather file.
+            memory_map (bool, optional): Share the data between processes
+                through memory-mapped files. Defaults to True.
+            categorical (bool, optional): Also share the text columns, which
+                then have a categorical dtype. Defaults to False.
+            **read_kwargs: Passed to the pandas reader of a file source.
+
+        Returns:
+            str: The version of the dataset, a digest of the data shared by
+            every process registering it.
+
+        Example:
+        >>>     ComponentManager.register_dataset('hospitals', 'hospitals.csv')
+                ComponentManager.Inputs.dropdown(
+                    'county', 'Select a county:', ('hospitals', 'county'))
+        """
+        return register_dataset(name, source, memory_map=memory_map,
+                                categorical=categorical, **read_kwargs)
+
+    @staticmethod
+    def get_dataset(name):
+        """
+        Retrieve a dataset registered with `register_dataset`.
+
+        Args:
+            name (str): Name of the dataset.
+
+        Returns:
+            pandas.DataFrame: The data, with read-only memory-mapped columns
+            unless it was registered with `memory_map=False`.
+        """
+        return get_dataset(name)
+
+    @staticmethod
+    def producer(inputs, maxsize=128, ttl=None, backend=None):
+        """
+        Decorator declaring a function that produces an output component from
+        the values of some input components.
+
+        Register producers with `register_producers`. Each output is cached under
+        the values of the inputs it declares, so when an input changes only the
+        outputs reading it are recomputed and rendered again; the others are
+        served from the cache. Produced outputs also take part in partial page
+        updates, see `ComponentManager.Outputs.dependent`.
+
+        Args:
+            inputs (list): Names of the input components the function reads. The
+                function is called with their values as keyword arguments.
+            maxsize (int, optional): Maximum number of rendered outputs kept in
+                memory. Defaults to 128.
+            ttl (float, optional): Seconds after which an output expires.
+                Defaults to None (no expiry).
+            backend (optional): A cache from `dashboard_builder.cache`. Defaults
+                to the backend set with `configure_cache`, or an in-process LRU.
+
+        Example:
+        >>>     @ComponentManager.producer(inputs=['condition_selection'])
+                def condition_chart(condition_selection):
+                    fig = build_chart(df, condition_selection)
+                    return ComponentManager.Outputs.matplotlib(fig)
+        """
+        def decorator(func):
+            return Producer(func, inputs, maxsize=maxsize, ttl=ttl, backend=backend)
+        return decorator
+
+    @staticmethod
+    def filter_engine(source):
+        """
+        Create a FilterEngine filtering a dataset by the values of input
+        components, using column indexes built once per dataset version instead
+        of scanning the columns on every request.
+
+        Args:
+            source (pandas.DataFrame or str): The frame, or the name of a
+                registered dataset.
+
+        Returns:
+            FilterEngine: The engine. Map inputs to columns with its `equals`,
+            `ranges` and `where` methods.
+
+        Example:
+        >>>     hospitals = ComponentManager.filter_engine('hospitals')
+                hospitals.equals('hospital_selection', 'Hospital Name')
+                output_df = hospitals.apply(manager.captured_values)
+        """
+        return FilterEngine(source)
+
     class Inputs:
         @staticmethod
         def dropdown(name, label, values, action_url="/", selected_value="Select All"): # noqa
@@ -113,8 +399,9 @@ class ComponentManager:
                 name (str): Name of the dropdown component. This should be a unique
                         string name for this component within the form group. 
                 label (str): Display label for the dropdown. 
-                values (tuple or list): Either a list of dropdown values or a 
-                                        tuple containing a DataFrame and column name.
+                values (tuple or list): Either a list of dropdown values or a
+                                        tuple containing a DataFrame (or the name
+                                        of a registered dataset) and column name.
                 action_url (str, optional): URL to which the form submits. 
                                             Defaults to "/".
                 selected_value (str, optional): Initially selected value in the 
@@ -217,28 +504,88 @@ class ComponentManager:
             return OutputText(content)
         
         @staticmethod
-        def matplotlib(content):
+        def matplotlib(content, mode="inline", format="png", dpi=None,
+                       cache_key=None, profile="default", max_points=None,
+                       downsample="lttb"):
             """
-            For displaying a matplotlib object. 
+            For displaying a matplotlib object.
+
+            Args:
+                content: A matplotlib figure.
+                mode (str, optional): "inline" embeds the image as a base64 data
+                    URL; "url" serves it from a cacheable route registered with
+                    `dashboard_builder.init_app(app)`. Defaults to "inline".
+                format (str, optional): "png", "svg" or "webp". Defaults to "png".
+                dpi (float, optional): Resolution of raster images. Defaults to
+                    None (matplotlib's savefig.dpi setting).
+                cache_key (str, optional): Key identifying what the figure shows,
+                    used by the render cache. Defaults to None.
+                profile (str or MatplotlibProfile, optional): "default" crops the
+                    image with bbox_inches='tight' (two draws); "fast" lays out
+                    the figure with its tight layout engine and saves it in a
+                    single draw with lighter PNG compression. Defaults to
+                    "default".
+                max_points (int, optional): Downsample lines with more points
+                    than this before drawing them. Defaults to None.
+                downsample (str, optional): "lttb" or "minmax". Defaults to
+                    "lttb".
             """
-            return OutputChart_Matplotlib(content)
+            return OutputChart_Matplotlib(content, cache_key=cache_key, mode=mode,
+                                          format=format, dpi=dpi, profile=profile,
+                                          max_points=max_points,
+                                          downsample=downsample)
         
         @staticmethod
-        def table_html(content):
+        def table_html(content, page_size=None):
             """
-            For displaying a pandas dataframe in a html table. 
+            For displaying a pandas dataframe in a html table.
+
+            Args:
+                content (pandas.DataFrame): The table to display.
+                page_size (int, optional): Paginate large tables with this many
+                    rows per page, rendering only the current page and loading
+                    the others (sorted or filtered) from the server. Requires
+                    `dashboard_builder.init_app(app)`. The table is kept by the
+                    process that rendered it; other processes build it again by
+                    running the view with the page's input values, so the view
+                    must accept POST requests. Defaults to None (render every
+                    row).
             """
-            return OutputTable_HTML(content)
+            return OutputTable_HTML(content, page_size)
         
         @staticmethod
-        def plotly(content):
+        def plotly(content, max_points=None, downsample="lttb",
+                   webgl_threshold=WEBGL_THRESHOLD, typed_arrays=None,
+                   cache_key=None):
             """
-            For displaying a plotly object. 
+            For displaying a plotly object.
+
+            Args:
+                content: A plotly figure.
+                max_points (int, optional): Downsample scatter and line traces
+                    with more points than this, so large series are serialized
+                    and drawn in constant size. Defaults to None.
+                downsample (str, optional): "lttb" (keeps the shape of the
+                    series) or "minmax" (keeps every peak). Defaults to "lttb".
+                webgl_threshold (int, optional): Draw scatter traces with more
+                    points than this with WebGL. Defaults to 50,000; None
+                    disables the switch.
+                typed_arrays (bool, optional): Send numeric arrays as base64
+                    typed arrays. Defaults to None (when the bundled plotly.js
+                    supports them).
+                cache_key (str, optional): Key identifying what the figure
+                    shows, used by the render cache instead of hashing the
+                    figure. Defaults to None.
             """
-            return OutputChart_Plotly(content)
+            return OutputChart_Plotly(content, max_points=max_points,
+                                      downsample=downsample,
+                                      webgl_threshold=webgl_threshold,
+                                      typed_arrays=typed_arrays,
+                                      cache_key=cache_key)
         
         @staticmethod
-        def altair(content, chart_title, chart_id):
+        def altair(content, chart_title, chart_id, data_url=False,
+                   max_points=None, downsample="lttb", cache_key=None):
             """
             Adds a new instance of the OutputChart_Altair class to the group.
 
@@ -246,8 +593,21 @@ class ComponentManager:
                 content: An Altair chart object.
                 chart_title (str): The title for the Altair chart.
                 chart_id (str): A unique identifier for the chart.
+                data_url (bool, optional): Load the chart's data by URL from a
+                    cached, compressed endpoint instead of inlining it in the
+                    page. Requires `dashboard_builder.init_app(app)`. Defaults
+                    to False.
+                max_points (int, optional): Downsample the chart's data to at
+                    most this many rows. Defaults to None.
+                downsample (str, optional): "lttb" or "minmax". Defaults to
+                    "lttb".
+                cache_key (str, optional): Key identifying what the chart
+                    shows, used by the render cache instead of hashing the
+                    chart's data. Defaults to None.
             """
-            return OutputChart_Altair(content, chart_title, chart_id)
+            return OutputChart_Altair(content, chart_title, chart_id,
+                                      data_url=data_url, max_points=max_points,
+                                      downsample=downsample, cache_key=cache_key)
         
         @staticmethod
         def markdown(content):
@@ -255,6 +615,57 @@ class ComponentManager:
             For displaying markdown. 
             """
             return OutputMarkdown(content)
+
+        @staticmethod
+        def deferred(content):
+            """
+            Load an expensive output component after the rest of the page.
+
+            The page renders a lightweight placeholder instead of the component.
+            Once the page is displayed, the placeholder posts the captured input
+            values back to the same view, which renders just this component, so
+            several deferred outputs load in parallel requests. The view must
+            accept POST requests.
+
+            Args:
+                content: The output component to defer, e.g. the result of
+                    `ComponentManager.Outputs.matplotlib(fig)`.
+
+            Returns:
+                DeferredOutput: An instance of the DeferredOutput component.
+
+            Example:
+            >>>     ComponentManager.Outputs.deferred(
+                        ComponentManager.Outputs.matplotlib(fig))
+            """
+            return DeferredOutput(content)
+
+        @staticmethod
+        def dependent(content, inputs):
+            """
+            Declare the inputs an output component depends on, enabling partial
+            page updates.
+
+            On pages with dependent outputs, submitting a form no longer reloads
+            the page. The form is posted with the names of the inputs that
+            changed, and the server responds with only the dependent outputs
+            affected by them, as JSON. Outputs without a declaration are not
+            updated by partial updates.
+
+            Args:
+                content: The output component.
+                inputs (list): Names of the input components it depends on.
+
+            Returns:
+                DependentOutput: An instance of the DependentOutput component.
+
+            Example:
+            >>>     ComponentManager.Outputs.dependent(
+                        ComponentManager.Outputs.matplotlib(fig),
+                        inputs=['condition_selection'])
+            """
+            return DependentOutput(content, inputs)
+
     class Layouts:
         @staticmethod
         def expander(label, id, components):
@@ -382,6 +793,7 @@ class ComponentManager:
         self.form_groups = []   # list to store registered form groups
         self.outputs = []
         self.layouts = []
+        self._dirty_inputs = None
         self._template_defaults = {
             "page_title": "Dashboard Builder",
             "footer_text": "Powered by Dashboard Builder",
@@ -404,6 +816,131 @@ class ComponentManager:
             self.inputs.append(input_component)
         return self.inputs
     
+    @property
+    def captured_values(self):
+        """
+        Values captured from the request by the registered input components.
+
+        Returns:
+        - dict: Input names mapped to their captured values, in registration order.
+        """
+        return {input_component.name: input_component.value
+                for input_component in self.inputs}
+
+    @property
+    def fragment_id(self):
+        """
+        Id of the deferred output requested by a placeholder, or None when the
+        request is for the whole page.
+        """
+        return self.request.form.get(FRAGMENT_FIELD)
+
+    @property
+    def table_id(self):
+        """
+        Id of the paginated table a page request asks for, or None when the
+        request is for the whole page.
+        """
+        return self.request.form.get(TABLE_FIELD)
+
+    def deferred_outputs(self):
+        """
+        Give every deferred output among the registered outputs (including
+        those inside layouts) a fragment id. Ids follow the order the outputs
+        are registered in, so they are stable across requests to the same view.
+
+        Returns:
+        - dict: Fragment ids mapped to their deferred output components.
+        """
+        fragments = {}
+        for component in iter_leaf_components(self.outputs):
+            if isinstance(component, DeferredOutput):
+                fragment_id = f"dashboard-fragment-{len(fragments)}"
+                component.fragment_id = fragment_id
+                component.url = self.request.url
+                component.values = self.captured_values
+                fragments[fragment_id] = component
+        return fragments
+
+    @property
+    def dirty_inputs(self):
+        """
+        Names of the inputs whose value changed since the previous request of
+        the session to this route. The digests of the values are kept in the
+        Flask session, which requires a secret key on the Flask app.
+
+        Returns:
+        - set or None: The changed inputs, or None without a secret key.
+        """
+        return self._session_diff()
+
+    def _session_diff(self):
+        # Compared and remembered once per request
+        if self._dirty_inputs is None:
+            self._dirty_inputs = (session_changes(
+                self.default_route, self.captured_values),)
+        return self._dirty_inputs[0]
+
+    @property
+    def changed_inputs(self):
+        """
+        Names of the inputs that changed, for partial update requests: those
+        the browser reports as changed since its previous submission, plus
+        those that differ from the previous request of the session (e.g. one
+        made from another tab), see `dirty_inputs`.
+
+        Returns:
+        - set or None: The changed inputs, or None when the request is not a
+            partial update.
+        """
+        if self.request.form.get(PARTIAL_FIELD) is None:
+            return None
+        return set(self.request.form.getlist(CHANGED_FIELD)) | \
+            (self.dirty_inputs or set())
+
+    def dependent_outputs(self):
+        """
+        Give every dependent output among the registered outputs (including
+        those inside layouts) an id, in registration order.
+
+        Returns:
+        - dict: Output ids mapped to their dependent output components.
+        """
+        dependents = {}
+        for component in iter_leaf_components(self.outputs):
+            if isinstance(component, DependentOutput):
+                output_id = f"dashboard-output-{len(dependents)}"
+                component.output_id = output_id
+                component.include_script = not dependents
+                dependents[output_id] = component
+        if dependents:
+            # Remember the captured values, so the session's next partial
+            # update is compared with this request
+            self._session_diff()
+        return dependents
+
+    def register_producers(self, *producers):
+        """
+        Register the outputs of producer functions, see `producer`.
+
+        Each output is cached under the values of the inputs its producer
+        declares, so outputs whose inputs have values they were already
+        rendered for are served from the cache without calling their producer.
+
+        Args:
+        - *producers (Producer): Functions decorated with `producer`.
+
+        Returns:
+        - list: The registered output components, in the given order.
+        """
+        captured_values = self.captured_values
+        outputs = []
+        for producer in producers:
+            output = producer.output(captured_values)
+            outputs.append(DependentOutput(output, producer.inputs))
+        self.register_outputs(*outputs)
+        return outputs
+
     def register_form_groups(self, *form_groups):
         """
         Register multiple form groups and append them to the form_groups list.
@@ -485,12 +1022,12 @@ class ComponentManager:
 
         for form_group in self.form_groups:
             inputs = [input_component.render() for input_component in form_group.inputs]
-            rendered_form_group = render_template_string(
-                get_jinja_subtemplate("formgroups/formgroup.j2"), 
+            rendered_form_group = render_subtemplate(
+                "formgroups/formgroup.j2", 
                 action_url=form_group.action_url, 
                 inputs=inputs,
-                markdown_top=markdown(form_group.markdown_top),
-                markdown_bottom=markdown(form_group.markdown_bottom),
+                markdown_top=render_markdown(form_group.markdown_top),
+                markdown_bottom=render_markdown(form_group.markdown_bottom),
                 theme_colors=theme_colors
             )
             rendered_form_groups.append(rendered_form_group)
@@ -498,12 +1035,13 @@ class ComponentManager:
     
     def render_outputs(self):
         """
-        Render all the registered output components.
-        
+        Render all the registered output components, concurrently when an
+        executor is configured with `configure_rendering`.
+
         Returns:
         - list: List of rendered output components.
         """
-        return [output_component.render() for output_component in self.outputs]
+        return render_components(self.outputs)
     
     def render_layouts(self):
         """Render all registered layouts."""
@@ -519,6 +1057,9 @@ class ComponentManager:
             page_title (str, optional): Defaults to "Dashboard Builder"
             footer_text (str, optional): Defaults to "Powered by Dashboard Builder"
             theme (str, optional): Defaults to "light"
+            plotly_js (str, optional): Where pages with Plotly charts load
+                plotly.js from: "cdn", "local" (served by the dashboard builder
+                routes, see `init_app`) or a URL. Defaults to "cdn"
 
         """
         
@@ -550,6 +1091,8 @@ ComponentManager.register_component('chart_altair', OutputChart_Altair)
 ComponentManager.register_component('table_html', OutputTable_HTML)
 ComponentManager.register_component('image', OutputImage)
 ComponentManager.register_component('markdown', OutputMarkdown)
+ComponentManager.register_component('deferred', DeferredOutput)
+ComponentManager.register_component('dependent', DependentOutput)
 
 
 
@@ -0,0 +1,79 @@
+# dashboard_builder/options.py
+
+import threading
+import weakref
+
+import pandas as pd
+
+from .cache import LRUCache
+from .data import dataset_version, get_dataset
+
+# Distinct values of DataFrame columns, keyed by dataset version or frame
+# identity and column name
+_options = LRUCache(maxsize=256)
+# Columns with cached options per id() of unregistered frames; their entries
+# are dropped when the frame is garbage collected, before the id can be reused
+_tracked_frames = {}
+_lock = threading.Lock()
+
+
+def _forget_frame(frame_id):
+    with _lock:
+        columns = _tracked_frames.pop(frame_id, ())
+    for column in columns:
+        _options.delete(('frame', frame_id, column))
+
+
+def _distinct_values(column):
+    """
+    Distinct values of a column in order of appearance, as returned by
+    `Series.unique().tolist()`.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Find the distinct codes, which are small integers, instead of hashing
+        # the values themselves
+        codes = pd.unique(column.cat.codes.to_numpy())
+        values = column.cat.categories.take(codes[codes >= 0]).tolist()
+        if (codes < 0).any():
+            values.insert(int((codes < 0).argmax()), float('nan'))
+        return values
+    return column.unique().tolist()
+
+
+def column_options(frame, column):
+    """
+    Distinct values of a DataFrame column, computed once and cached.
+
+    Options of a dataset registered with `register_dataset` are cached per
+    dataset version, so registering a replacement invalidates them. Options of
+    other frames are cached for as long as the frame object is alive, so
+    frames modified in place should be registered as a dataset instead.
+
+    Args:
+        frame (pandas.DataFrame or str): The frame, or the name of a registered
+            dataset.
+        column (str): The column.
+
+    Returns:
+        list: The distinct values, in order of appearance.
+    """
+    if isinstance(frame, str):
+        frame = get_dataset(frame)
+
+    version = dataset_version(frame)
+    if version is not None:
+        key = ('dataset', *version, column)
+    else:
+        key = ('frame', id(frame), column)
+
+    values = _options.get(key)
+    if values is None:
+        values = _distinct_values(frame[column])
+        _options.set(key, values)
+        if version is None:
+            with _lock:
+                track = id(frame) not in _tracked_frames
+                _tracked_frames.setdefault(id(frame), set()).add(column)
+            if track:
+                weakref.finalize(frame, _forget_frame, id(frame))
+    return list(values)
@@ -1,22 +1,67 @@
+import functools
 import os
-from flask import render_template_string
+import re
+import uuid
+from urllib.parse import parse_qsl
 
+from flask import (
+    Response,
+    abort,
+    current_app,
+    render_template,
+    stream_template,
+    stream_with_context,
+)
+from markupsafe import Markup, escape
+from werkzeug.datastructures import MultiDict
+
+from .assets import plotly_js_url
+from .cache import LRUCache
+from .components.outputs import (
+    TABLE_QUERY_FIELD,
+    DeferredOutput,
+    DependentOutput,
+    OutputChart_Plotly,
+)
+from .reactive import ProducedOutput
+from .rendering import (
+    iter_leaf_components,
+    iter_rendered_components,
+    render_components,
+)
+from .serialization import json_response
+from .tables import get_table, request_page
 from .theme_utils import get_global_theme
 from .themes import THEME_COLORS
+from .utils import PACKAGE_ROOT, subtemplates
 
 class TemplateManager:
-    templates = os.listdir(os.path.join(os.path.dirname(__file__), 'dashboard_templates')) # noqa
+    template_dir = os.path.join(PACKAGE_ROOT, 'dashboard_templates')
+    templates = os.listdir(template_dir)
     templates_dict = {os.path.splitext(template)[0]: template for template in templates}
+
+    # Compiled page templates keyed by (Jinja environment id, path, mtime). A
+    # template references its environment, so the id is not reused while the
+    # entry is cached.
+    compiled_templates = LRUCache(maxsize=32)
+    _builtin_mtimes = {}
     
+    @staticmethod
+    def dashboard_template_path(template_name: str) -> str:
+        """
+        Resolves the path of a dashboard template from the dashboard builder 
+        templates directory.
+        """
+        file_name = TemplateManager.templates_dict.get(template_name, template_name)
+        return os.path.join(TemplateManager.template_dir, file_name)
+
     @staticmethod
     def dashboard_template(template_name: str) -> str:
         """
         Retrieves a dashboard template from the dashboard builder templates directory.
         ... (rest of the docstring) ...
         """
-        current_dir = os.path.dirname(__file__) 
-        file_name = TemplateManager.templates_dict.get(template_name, template_name)
-        template_path = os.path.join(current_dir, 'dashboard_templates', file_name)
+        template_path = TemplateManager.dashboard_template_path(template_name)
         
         with open(template_path, 'r') as file:
             return file.read()
@@ -35,6 +80,65 @@ class TemplateManager:
         with open(template_path, 'r') as file:
             return file.read()
 
+    @staticmethod
+    def compiled_template(template_path: str, mtime: float):
+        """
+        Retrieves the compiled page template for a path and modification time,
+        compiling it with the Flask application's Jinja environment on a cache miss.
+        Each application gets its own compiled template, bound to its own
+        filters, globals and loader.
+
+        Args:
+            template_path (str): Full path of the page template.
+            mtime (float): Modification time of the file, used to invalidate 
+                entries when the file changes.
+
+        Returns:
+            jinja2.Template: The compiled page template.
+        """
+        jinja_env = current_app.jinja_env
+        key = (id(jinja_env), template_path, mtime)
+        template = TemplateManager.compiled_templates.get(key)
+        if template is None:
+            with open(template_path, 'r') as file:
+                source = file.read()
+            template = jinja_env.from_string(source)
+            # Pages whose template does not load plotly.js get a script tag
+            # in front of their outputs instead, see DashboardOutput.render()
+            template.loads_plotly_js = 'plotly_js' in source
+            TemplateManager.compiled_templates.set(key, template)
+        return template
+
+    @staticmethod
+    def dashboard_template_compiled(template_name: str):
+        """
+        Retrieves a compiled dashboard template from the dashboard builder
+        templates directory. Package templates are only stat'ed the first time
+        they are used, unless template auto-reload is enabled.
+        """
+        template_path = TemplateManager.dashboard_template_path(template_name)
+        mtime = TemplateManager._builtin_mtimes.get(template_path)
+        if mtime is None or subtemplates.auto_reload:
+            mtime = os.stat(template_path).st_mtime
+            TemplateManager._builtin_mtimes[template_path] = mtime
+        return TemplateManager.compiled_template(template_path, mtime)
+
+    @staticmethod
+    def dashboard_template_custom_compiled(template_name_with_extension: str, template_path: str): # noqa
+        """
+        Retrieves a compiled custom dashboard template from a user-defined templates 
+        directory. The file is stat'ed on every call so edits are picked up without 
+        restarting the application.
+        """
+        template_path = os.path.join(template_path, template_name_with_extension)
+
+        try:
+            mtime = os.stat(template_path).st_mtime
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template '{template_name_with_extension}' not found in the directory '{template_path}'") from None # noqa
+
+        return TemplateManager.compiled_template(template_path, mtime)
+
 
 class DashboardOutput:
     def __init__(self, manager=None, template_name=None, template_path=None, **kwargs):  # noqa
@@ -64,30 +168,293 @@ class DashboardOutput:
             self.template_path = None
         
         self.template_defaults = manager.template_defaults_values
-        self.inputs = manager.render_form_groups()
-        self.outputs = manager.render_outputs()
+        self.manager = manager
+        self.plotly_js = self.plotly_js_url(manager)
         self.custom_params = kwargs
+
+    @functools.cached_property
+    def outputs(self):
+        """
+        Rendered HTML of the manager's output components. They are rendered
+        the first time this is read rather than when the DashboardOutput is
+        created, so fragment, table and partial update requests skip them.
+
+        Returns:
+            list: The rendered output components.
+        """
+        return self.manager.render_outputs()
+
+    def plotly_js_url(self, manager):
+        """
+        Resolve the URL pages load plotly.js from, when the manager has any
+        Plotly outputs. Charts are rendered without the bundle so it is only
+        included once per page.
+
+        Returns:
+            str or None: URL of plotly.js, or None if the page has no Plotly charts.
+        """
+        def unwrap(component):
+            while isinstance(component, (DeferredOutput, DependentOutput)):
+                component = component.content
+            return component
+
+        def is_plotly(component):
+            if isinstance(component, ProducedOutput):
+                # Produced outputs are only known once their producer runs
+                return component.may_produce(OutputChart_Plotly)
+            return isinstance(component, OutputChart_Plotly)
+
+        components = map(unwrap, iter_leaf_components(manager.outputs))
+        if not any(is_plotly(component) for component in components):
+            return None
+        return plotly_js_url(self.template_defaults.get('plotly_js', 'cdn'))
         
-    def render(self):
+    def get_template(self):
+        """
+        Retrieve the compiled page template.
+        """
         # Decide on which template fetching method to use based on the use_custom_template flag # noqa
         if self.use_custom_template:
-            dashboard_template = TemplateManager.dashboard_template_custom(self.template_name, self.template_path) # noqa
-        else:
-            dashboard_template = TemplateManager.dashboard_template(self.template_name)
+            return TemplateManager.dashboard_template_custom_compiled(self.template_name, self.template_path) # noqa
+        return TemplateManager.dashboard_template_compiled(self.template_name)
+
+    def plotly_script(self, dashboard_template):
+        """
+        Script tag loading plotly.js, for pages with Plotly charts whose
+        template does not load it itself. It is placed in front of the first
+        output component.
+
+        Returns:
+            str: The script tag, or an empty string.
+        """
+        if self.plotly_js and not getattr(dashboard_template, 'loads_plotly_js', True): # noqa
+            return f'<script src="{escape(self.plotly_js)}" charset="utf-8"></script>' # noqa
+        return ''
 
+    def context(self, dashboard_template, outputs):
+        """
+        Build the context the page template is rendered with.
+
+        Args:
+            dashboard_template (jinja2.Template): The compiled page template.
+            outputs (list): Rendered HTML of the output components.
+
+        Returns:
+            dict: The template context.
+        """
         theme_colors = THEME_COLORS[get_global_theme()]
 
         # Default context
         dashboard_context = {
             'defaults': self.template_defaults,
-            'form_groups': self.inputs,
-            'output_components': self.outputs,
+            'form_groups': self.manager.render_form_groups(),
+            'output_components': outputs,
+            'plotly_js': self.plotly_js,
             'theme_colors': theme_colors,
         }
         
         # Merge with custom parameters
         dashboard_context.update(self.custom_params)
-        
-        return render_template_string(dashboard_template, **dashboard_context)
+        return dashboard_context
+
+    def render_fragment(self):
+        """
+        Render the deferred output a placeholder asks for, see
+        `ComponentManager.Outputs.deferred`.
+
+        Returns:
+            str or None: The rendered output, or None when the request is for
+            the whole page.
+        """
+        fragments = self.manager.deferred_outputs()
+        fragment_id = self.manager.fragment_id
+        if fragment_id is None:
+            return None
+        if fragment_id not in fragments:
+            abort(404)
+        return fragments[fragment_id].render_fragment()
+
+    def render_table(self):
+        """
+        Serve a page of a paginated table the table route could not, because
+        the process serving it did not hold the table (another worker, or after
+        eviction). The view built the table again before this is called, which
+        registered it in this process.
+
+        Returns:
+            dict or None: The page, see `tables.table_page`, or None when the
+            request is for the whole page.
+        """
+        table_id = self.manager.table_id
+        if table_id is None:
+            return None
+
+        if get_table(table_id) is None:
+            # Produced outputs build their components when they are rendered
+            for component in iter_leaf_components(self.manager.outputs):
+                content = getattr(component, 'content', component)
+                if isinstance(content, ProducedOutput):
+                    content.render()
+                    if get_table(table_id) is not None:
+                        break
+
+        params = MultiDict(parse_qsl(
+            self.manager.request.form.get(TABLE_QUERY_FIELD, '')))
+        try:
+            page = request_page(table_id, params)
+        except KeyError:
+            abort(400)
+        if page is None:
+            abort(404)
+        return page
+
+    def render_partial(self):
+        """
+        Render the dependent outputs affected by the inputs that changed, for
+        a partial update request, see `ComponentManager.Outputs.dependent`.
+
+        Returns:
+            dict or None: {"fragments": {output id: HTML}}, or None when the
+            request is not a partial update.
+        """
+        dependents = self.manager.dependent_outputs()
+        changed_inputs = self.manager.changed_inputs
+        if changed_inputs is None:
+            return None
+
+        affected = {output_id: dependent for output_id, dependent in dependents.items()
+                    if dependent.depends_on(changed_inputs)}
+        rendered = render_components(
+            [dependent.content for dependent in affected.values()])
+        return {'fragments': dict(zip(affected, rendered))}
+
+    def render(self):
+        fragment = self.render_fragment()
+        if fragment is not None:
+            return fragment
+        table = self.render_table()
+        if table is not None:
+            return json_response(table)
+        partial = self.render_partial()
+        if partial is not None:
+            return partial
+
+        dashboard_template = self.get_template()
+        outputs = self.outputs
+        script = self.plotly_script(dashboard_template)
+        if script:
+            outputs = [script + outputs[0], *outputs[1:]]
+        return render_template(
+            dashboard_template, **self.context(dashboard_template, outputs))
+
+    def stream(self, chunk_size=10000):
+        """
+        Stream the page to the browser instead of rendering it as one string.
+
+        The page template is rendered with Jinja's `Template.generate()`, so the
+        `<head>` and the input sidebar are sent right away and the browser starts
+        fetching CSS and JavaScript while the outputs are still being computed.
+        Each output component is rendered when the template reaches it and sent
+        as soon as it is done; with an executor configured through
+        `ComponentManager.configure_rendering`, all outputs are submitted before
+        the first byte is sent. Components that support streaming, such as
+        `OutputTable_HTML`, are sent in chunks of rows, so tables with millions
+        of rows are never held in memory as a whole.
+
+        Args:
+            chunk_size (int, optional): Rows per chunk of streamed tables.
+                Defaults to 10000.
+
+        Returns:
+            flask.Response: A streamed response, to be returned from the view.
+
+        Example:
+        >>>     @app.route('/', methods=['GET', 'POST'])
+                def index():
+                    ...
+                    return DashboardOutput(manager=manager).stream()
+        """
+        fragment = self.render_fragment()
+        if fragment is not None:
+            return Response(fragment, mimetype='text/html')
+        table = self.render_table()
+        if table is not None:
+            return json_response(table)
+        partial = self.render_partial()
+        if partial is not None:
+            return json_response(partial)
+
+        dashboard_template = self.get_template()
+        components = self.manager.outputs
+
+        # Components that stream themselves are spliced into the page at a
+        # marker; the others are rendered through the rendering executor
+        token = uuid.uuid4().hex
+        marker = re.compile(f"<!--dashboard-builder-{token}-([0-9]+)-->")
+        streamed = {str(index): component
+                    for index, component in enumerate(components)
+                    if hasattr(component, 'stream')}
+        rendered = iter_rendered_components(
+            component for component in components if not hasattr(component, 'stream')) # noqa
+
+        def outputs():
+            for index, component in enumerate(components):
+                if str(index) in streamed:
+                    yield Markup(f"<!--dashboard-builder-{token}-{index}-->")
+                else:
+                    yield next(rendered)
+
+        context = self.context(dashboard_template, LazyOutputs(
+            outputs(), len(components), self.plotly_script(dashboard_template)))
+
+        def generate():
+            for chunk in stream_template(dashboard_template, **context):
+                parts = marker.split(chunk)
+                yield parts[0]
+                for index, text in zip(parts[1::2], parts[2::2]):
+                    yield from streamed[index].stream(chunk_size)
+                    yield text
+
+        return Response(stream_with_context(generate()), mimetype='text/html')
+
+
+class LazyOutputs:
+    """
+    Sequence of rendered output components for `DashboardOutput.stream()`,
+    which takes each component from an iterator only when the page template
+    reaches it.
+    """
+    def __init__(self, rendered, length, prefix=''):
+        """
+        Initialize a new instance of LazyOutputs.
+
+        Args:
+            rendered (iterator): Yields the rendered HTML of each component.
+            length (int): Number of components.
+            prefix (str, optional): HTML placed in front of the first component.
+                Defaults to ''.
+        """
+        self._rendered = rendered
+        self._length = length
+        self._prefix = prefix
+        self._items = []
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
 
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(self._length)[index]]
+        index = range(self._length)[index]
 
+        while len(self._items) <= index:
+            item = next(self._rendered)
+            if not self._items and self._prefix:
+                prefix = self._prefix
+                item = Markup(prefix) + item if isinstance(item, Markup) else prefix + item # noqa
+            self._items.append(item)
+        return self._items[index]
@@ -0,0 +1,229 @@
+# dashboard_builder/reactive.py
+
+import functools
+import hashlib
+
+from flask import current_app, has_request_context, session
+
+from .cache import memoize
+from .components.outputs import DeferredOutput, DependentOutput, OutputTable_HTML
+from .rendering import iter_leaf_components
+from .theme_utils import get_global_theme
+
+# Session key prefix of the digests of the input values last captured for a
+# route
+SESSION_PREFIX = 'dashboard_builder:values:'
+
+
+def _registers_state(component):
+    """
+    Whether rendering a component relies on state registered when it was
+    built, so its HTML cannot be served without building it again, e.g. a
+    paginated table whose pages are served from its registered DataFrame.
+
+    Raises:
+        TypeError: If the component is a deferred or dependent output, which
+            only work when registered with a ComponentManager.
+    """
+    registers = False
+    for leaf in iter_leaf_components([component]):
+        if isinstance(leaf, (DeferredOutput, DependentOutput)):
+            raise TypeError(
+                f"Producers cannot return a {type(leaf).__name__}; wrap the "
+                "produced output instead, e.g. "
+                "ComponentManager.Outputs.deferred(producer.output(values)).")
+        if isinstance(leaf, OutputTable_HTML) and leaf.page_size is not None:
+            registers = True
+    return registers
+
+
+class _Uncached(Exception):
+    """
+    Raised through the cache with the HTML of an output that must not be
+    cached, see `_registers_state`.
+    """
+    def __init__(self, html):
+        super().__init__(html)
+        self.html = html
+
+
+class Producer:
+    """
+    A function producing an output component from the values of the input
+    components it declares.
+
+    The rendered output is cached under the producer and the values of its
+    inputs, so an output whose inputs did not change is served from the cache
+    without calling the function or rendering the component again. Outputs
+    containing paginated tables are built and rendered on every request
+    instead, so their DataFrames are registered for the table route.
+    """
+    def __init__(self, func, inputs, maxsize=128, ttl=None, backend=None):
+        """
+        Initialize a new instance of the Producer class.
+
+        Args:
+            func (callable): Called with the declared input values as keyword
+                arguments, returns an output component.
+            inputs (list): Names of the input components the function reads.
+            maxsize (int, optional): Maximum number of rendered outputs kept by
+                the default in-memory cache. Defaults to 128.
+            ttl (float, optional): Seconds after which a rendered output expires.
+                Defaults to None (no expiry).
+            backend (optional): Cache from `dashboard_builder.cache`. Defaults
+                to the backend set with `configure_cache`, or an in-process LRU.
+        """
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.computations = 0
+        # Types of the components the function returned so far
+        self.output_types = set()
+        # Whether the function returned components that are not cached
+        self.uncached = False
+        self._render = memoize(
+            maxsize=maxsize, ttl=ttl, backend=backend, key=self._key)(
+            self._render_values)
+
+    def __call__(self, **values):
+        return self.func(**values)
+
+    def _key(self, values):
+        return (self.name, get_global_theme(), values)
+
+    def _build(self, values):
+        self.computations += 1
+        component = self.func(**values)
+        self.output_types.add(type(component))
+        return component, _registers_state(component)
+
+    def _render_values(self, values):
+        component, registers = self._build(values)
+        html = component.render()
+        if registers:
+            self.uncached = True
+            raise _Uncached(html)
+        return html
+
+    def render(self, values):
+        """
+        Render the output for a set of input values, from the cache unless it
+        has not been rendered for them yet.
+
+        Args:
+            values (dict): Values of the producer's inputs.
+
+        Returns:
+            str: HTML representation of the output.
+        """
+        if self.uncached:
+            return self._build(values)[0].render()
+        try:
+            return self._render(values)
+        except _Uncached as uncached:
+            return uncached.html
+
+    def values(self, captured_values):
+        """
+        Select the values of the producer's inputs.
+
+        Args:
+            captured_values (dict): Values captured by the input components.
+
+        Returns:
+            dict: The values of the declared inputs.
+
+        Raises:
+            KeyError: If a declared input has not been registered.
+        """
+        try:
+            return {name: captured_values[name] for name in self.inputs}
+        except KeyError as error:
+            raise KeyError(
+                f"{self.name} depends on the input {error.args[0]!r}, which is "
+                "not registered with the component manager.") from None
+
+    def output(self, captured_values):
+        """
+        Create the output component for a set of captured values.
+
+        Returns:
+            ProducedOutput: The output, rendered on demand.
+        """
+        return ProducedOutput(self, self.values(captured_values))
+
+
+class ProducedOutput:
+    """
+    Output component of a Producer for one set of input values.
+    """
+    def __init__(self, producer, values):
+        """
+        Initialize a new instance of the ProducedOutput class.
+
+        Args:
+            producer (Producer): The producer of the output.
+            values (dict): Values of the producer's inputs.
+        """
+        self.producer = producer
+        self.values = values
+
+    def may_produce(self, component_type):
+        """
+        Whether the output may be a component of a given type, e.g. to decide
+        if the page needs plotly.js before the output is rendered.
+
+        Returns:
+            bool: True if the producer returned such a component before, or has
+            not been called in this process yet.
+        """
+        output_types = self.producer.output_types
+        return not output_types or any(
+            issubclass(output_type, component_type) for output_type in output_types)
+
+    def render(self):
+        """
+        Render the output, from the cache unless its inputs have values it has
+        not been rendered for yet.
+
+        Returns:
+            str: HTML representation of the output.
+        """
+        return self.producer.render(self.values)
+
+
+def _value_digest(value):
+    # Digests keep the session cookie small whatever the values are
+    return hashlib.sha256(repr(value).encode('utf8')).hexdigest()[:16]
+
+
+def session_changes(route, captured_values):
+    """
+    Compare captured input values with the values captured by the previous
+    request of the session to the same route, and remember the new values.
+
+    The Flask session is only used when the application has a secret key;
+    otherwise there is no previous state to compare with.
+
+    Args:
+        route (str): The route of the dashboard.
+        captured_values (dict): Values captured by the input components.
+
+    Returns:
+        set or None: Names of the inputs whose value changed, every input on
+        the first request of a session, or None without a secret key.
+    """
+    if not has_request_context() or not current_app.secret_key:
+        return None
+
+    key = SESSION_PREFIX + route
+    previous = session.get(key)
+    digests = {name: _value_digest(value)
+               for name, value in captured_values.items()}
+    if previous != digests:
+        session[key] = digests
+    if previous is None:
+        return set(captured_values)
+    return {name for name, digest in digests.items()
+            if previous.get(name) != digest}
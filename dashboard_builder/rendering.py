@@ -0,0 +1,232 @@
+import atexit
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError,
+)
+
+from .utils import render_subtemplate
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = (None, 'thread', 'process')
+
+# Opt-in concurrent rendering, see configure_rendering()
+_thread_pool = None
+_process_pool = None
+_timeout = None
+
+# Futures of the leaf components submitted by the outermost render_components()
+# call, keyed by id(component), so nested layouts never wait on the pool from
+# inside one of its own workers. Only set in the context layouts render in.
+_prefetched = contextvars.ContextVar('dashboard_builder_prefetched', default=None)
+
+
+def configure_rendering(executor=None, max_workers=None, timeout=None):
+    """
+    Configure how output components are rendered.
+
+    By default components are rendered one after the other in the request
+    thread. With an executor, the outputs of a page (including the components
+    inside layouts) are rendered concurrently and reassembled in their original
+    order. A component that raises, or does not finish within `timeout`
+    seconds, is replaced by an error placeholder instead of failing the page.
+
+    Args:
+        executor (str, optional): None renders sequentially. "thread" renders
+            components in a thread pool, which helps when rendering waits on
+            I/O or on libraries that release the GIL. "process" additionally
+            rasterizes matplotlib figures in a process pool. Defaults to None.
+        max_workers (int, optional): Size of the pools. Defaults to None (the
+            concurrent.futures default).
+        timeout (float, optional): Seconds a single component may take before
+            it is replaced by a placeholder, counted from when it starts
+            rendering, not from when it was queued. A page never waits longer
+            than `timeout` times its number of components, so components that
+            never get a worker (e.g. queued behind one that hangs) are
+            replaced by the placeholder as well. Defaults to None (no limit).
+
+    Raises:
+        ValueError: If the executor is not supported.
+    """
+    global _thread_pool, _process_pool, _timeout
+    if executor not in EXECUTORS:
+        raise ValueError(f"Invalid executor '{executor}', expected None, "
+                         "'thread' or 'process'.")
+
+    shutdown_rendering()
+    if executor is not None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='dashboard_builder')
+    if executor == 'process':
+        _process_pool = ProcessPoolExecutor(max_workers=max_workers)
+    _timeout = timeout
+
+
+def shutdown_rendering():
+    """Shut the rendering pools down and go back to sequential rendering."""
+    global _thread_pool, _process_pool, _timeout
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=False, cancel_futures=True)
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+    _thread_pool = None
+    _process_pool = None
+    _timeout = None
+
+
+atexit.register(shutdown_rendering)
+
+
+def run_in_process(func, *args):
+    """
+    Run a CPU bound, picklable function in the process pool when the "process"
+    executor is configured, or directly otherwise.
+
+    Returns:
+        The return value of `func(*args)`.
+    """
+    if _process_pool is None:
+        return func(*args)
+    return _process_pool.submit(func, *args).result()
+
+
+def _is_layout(component):
+    return hasattr(component, 'iter_components')
+
+
+def iter_leaf_components(components):
+    """
+    Iterate over the output components in a list of components, descending
+    into layouts.
+    """
+    for component in components:
+        if _is_layout(component):
+            yield from iter_leaf_components(component.iter_components())
+        else:
+            yield component
+
+
+def _render_error(component, reason):
+    return render_subtemplate(
+        "outputs/outputerror.j2",
+        component=type(component).__name__,
+        reason=reason)
+
+
+class _RenderTask:
+    """
+    Renders a component in the pool, recording when it started so its timeout
+    does not include the time it spent waiting for a worker.
+    """
+    def __init__(self, component, timeout, deadline):
+        self.component = component
+        self.timeout = timeout
+        # time.monotonic() after which the page stops waiting for the task
+        self.deadline = deadline
+        self.started_at = None
+        # Set when the task starts, or when its future is done without having
+        # run (e.g. cancelled by a pool shutdown)
+        self.started = threading.Event()
+
+    def __call__(self):
+        self.started_at = time.monotonic()
+        self.started.set()
+        return self.component.render()
+
+
+def _result(component, future, task):
+    remaining = None
+    try:
+        if task.timeout is not None:
+            if not task.started.wait(max(0, task.deadline - time.monotonic())):
+                raise TimeoutError
+            if task.started_at is not None:
+                end = min(task.started_at + task.timeout, task.deadline)
+                remaining = max(0, end - time.monotonic())
+        return future.result(timeout=remaining)
+    except TimeoutError:
+        future.cancel()
+        logger.warning("Rendering %s timed out after %s seconds",
+                       type(component).__name__, task.timeout)
+        return _render_error(component, "timed out")
+    except Exception as error:
+        logger.exception("Rendering %s failed", type(component).__name__)
+        return _render_error(component, type(error).__name__)
+
+
+def _render_layout(layout, prefetched):
+    _prefetched.set(prefetched)
+    return layout.render()
+
+
+def _render(component, prefetched):
+    if _is_layout(component):
+        # Render layouts in a copy of the context that sees the prefetched
+        # futures, so their children are taken from the pool as well
+        return contextvars.copy_context().run(_render_layout, component, prefetched)
+    if id(component) in prefetched:
+        return _result(component, *prefetched[id(component)])
+    return component.render()
+
+
+def iter_rendered_components(components):
+    """
+    Start rendering a list of components and iterate over the results in order.
+
+    When an executor is configured with `configure_rendering`, every component
+    is submitted to the pool before this function returns, so they render in
+    the background while the caller consumes earlier results (e.g. while a
+    streamed page sends its head and input sidebar). Otherwise each component
+    is rendered as it is reached.
+
+    Args:
+        components (list): Output components and layouts.
+
+    Returns:
+        iterator: The rendered HTML of each component, in the original order.
+    """
+    components = list(components)
+    pool = _thread_pool
+    prefetched = _prefetched.get()
+
+    if pool is None and prefetched is None:
+        return (component.render() for component in components)
+
+    if prefetched is None:
+        prefetched = {}
+        leaves = list(iter_leaf_components(components))
+        deadline = None
+        if _timeout is not None:
+            # As long as rendering every component one after the other, each
+            # taking its whole timeout
+            deadline = time.monotonic() + _timeout * len(leaves)
+        for component in leaves:
+            if id(component) not in prefetched:
+                # Each task runs in its own copy of the context, so the Flask
+                # application and request contexts are available to it.
+                context = contextvars.copy_context()
+                task = _RenderTask(component, _timeout, deadline)
+                future = pool.submit(context.run, task)
+                future.add_done_callback(lambda _, task=task: task.started.set())
+                prefetched[id(component)] = (future, task)
+
+    return (_render(component, prefetched) for component in components)
+
+
+def render_components(components):
+    """
+    Render a list of components, concurrently when an executor is configured
+    with `configure_rendering`.
+
+    Args:
+        components (list): Output components and layouts.
+
+    Returns:
+        list: The rendered HTML of each component, in the original order.
+    """
+    return list(iter_rendered_components(components))
@@ -0,0 +1,109 @@
+# dashboard_builder/routes.py
+
+import gzip
+
+from flask import Blueprint, abort, make_response, request
+
+from .assets import PLOTLY_JS_VERSION, get_asset, get_chart_data, plotly_js_bundle
+from .serialization import json_response
+from .tables import request_page
+
+blueprint = Blueprint('dashboard_builder', __name__, url_prefix='/_dashboard_builder')
+
+# Assets are content-addressed, so a given URL never changes content
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def init_app(app):
+    """
+    Register the routes used by the dashboard builder (e.g. for serving chart
+    images by URL, or a local copy of plotly.js) on a Flask application.
+
+    Args:
+        app (flask.Flask): The Flask application.
+
+    Example:
+        >>> app = Flask(__name__)
+        >>> init_app(app)
+    """
+    if blueprint.name not in app.blueprints:
+        app.register_blueprint(blueprint)
+
+
+@blueprint.route('/assets/<filename>')
+def asset(filename):
+    """
+    Serve a stored asset with long-lived cache headers.
+    """
+    digest = filename.split('.', 1)[0]
+    stored = get_asset(digest)
+    if stored is None:
+        abort(404)
+
+    mimetype, data = stored
+    return _immutable_response(data, mimetype, digest)
+
+
+@blueprint.route('/data/<filename>')
+def chart_data(filename):
+    """
+    Serve stored chart data as JSON, gzip-compressed for clients accepting it.
+    """
+    digest = filename.split('.', 1)[0]
+    compressed = get_chart_data(digest)
+    if compressed is None:
+        abort(404)
+
+    if 'gzip' in request.accept_encodings:
+        response = _immutable_response(
+            compressed, 'application/json', digest + '-gzip')
+        response.content_encoding = 'gzip'
+    else:
+        response = _immutable_response(
+            gzip.decompress(compressed), 'application/json', digest)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+@blueprint.route('/plotly-<version>.min.js')
+def plotly_js(version):
+    """
+    Serve the plotly.js bundle of the installed plotly package.
+    """
+    if version != PLOTLY_JS_VERSION:
+        abort(404)
+    return _immutable_response(
+        plotly_js_bundle(), 'application/javascript', PLOTLY_JS_VERSION)
+
+
+@blueprint.route('/tables/<table_id>')
+def table(table_id):
+    """
+    Serve one page of a paginated table as JSON.
+
+    Query parameters:
+        page: 1-based page number.
+        sort: Column to sort on.
+        order: "asc" or "desc".
+        q: Keep rows where any cell contains this text.
+
+    Answers 404 when this process does not hold the table; the table then
+    asks the dashboard view for the page instead.
+    """
+    try:
+        page = request_page(table_id, request.args)
+    except KeyError:
+        abort(400)
+    if page is None:
+        abort(404)
+    return json_response(page)
+
+
+def _immutable_response(data, mimetype, etag):
+    response = make_response(data)
+    response.mimetype = mimetype
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = ASSET_MAX_AGE
+    response.cache_control.immutable = True
+    return response.make_conditional(request)
@@ -0,0 +1,102 @@
+# dashboard_builder/serialization.py
+
+import datetime
+import json
+
+import numpy as np
+import plotly.io as pio
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # optional, the standard library is used instead
+    orjson = None
+
+
+def _default(obj):
+    """
+    Convert values the JSON encoders do not support natively.
+    """
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_json(obj):
+    return json.dumps(obj, default=_default)
+
+
+def _dumps_orjson(obj):
+    # NumPy arrays are serialized from their buffers instead of being converted
+    # to lists of Python objects first
+    return orjson.dumps(
+        obj, default=_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf8')
+
+
+SERIALIZERS = {
+    'json': _dumps_json,
+    'orjson': _dumps_orjson,
+}
+
+_dumps = _dumps_orjson if orjson is not None else _dumps_json
+
+
+def set_json_serializer(serializer='auto'):
+    """
+    Set how chart outputs and the dashboard builder's JSON endpoints serialize
+    JSON.
+
+    Args:
+        serializer (str or callable, optional): "orjson", "json" for the
+            standard library, "auto" for orjson when it is installed and the
+            standard library otherwise, or a function serializing an object to
+            a JSON string. Named serializers are also set as plotly's JSON
+            engine. Defaults to "auto".
+
+    Raises:
+        ImportError: If "orjson" is requested but not installed.
+        ValueError: If the serializer is unknown.
+    """
+    global _dumps
+    if callable(serializer):
+        _dumps = serializer
+        return
+
+    engine = serializer
+    if serializer == 'auto':
+        serializer = 'orjson' if orjson is not None else 'json'
+    elif serializer == 'orjson' and orjson is None:
+        raise ImportError("The orjson serializer requires the orjson package.")
+    elif serializer not in SERIALIZERS:
+        raise ValueError(f"Unknown JSON serializer {serializer!r}, expected one of "
+                         f"'auto', {', '.join(map(repr, SERIALIZERS))} or a function.")
+    _dumps = SERIALIZERS[serializer]
+    pio.json.config.default_engine = engine
+
+
+def dumps_json(obj):
+    """
+    Serialize an object to a JSON string with the configured serializer.
+
+    NumPy arrays and scalars, dates and times are supported by every named
+    serializer.
+
+    Returns:
+        str: The JSON document.
+    """
+    return _dumps(obj)
+
+
+def json_response(obj):
+    """
+    Create a JSON response serialized with the configured serializer.
+
+    Returns:
+        flask.Response: The response.
+    """
+    return Response(dumps_json(obj), mimetype='application/json')
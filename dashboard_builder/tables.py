@@ -0,0 +1,287 @@
+# dashboard_builder/tables.py
+
+import math
+
+import numpy as np
+import pandas as pd
+from markupsafe import escape
+
+from .cache import LRUCache
+from .utils import render_subtemplate
+
+# DataFrames of paginated tables, keyed by table id. The frames are referenced,
+# not copied, and live in this process only: objects such as DataFrames are not
+# shared through the configurable cache backends. A process that does not hold
+# a table builds it again by running the dashboard view, see
+# DashboardOutput.render_table().
+_tables = LRUCache(maxsize=64)
+
+# Row positions of filtered and/or sorted views, so paging through a view does
+# not filter and sort the frame again for every page.
+_views = LRUCache(maxsize=32)
+
+
+def register_table(table_id, frame, page_size):
+    """
+    Keep a reference to the DataFrame behind a paginated table.
+
+    Args:
+        table_id (str): Identifier of the table.
+        frame (pandas.DataFrame): The full table.
+        page_size (int): Rows per page.
+    """
+    _tables.set(table_id, (frame, page_size))
+
+
+def get_table(table_id):
+    """
+    Look up the DataFrame behind a paginated table.
+
+    Returns:
+        tuple or None: (frame, page_size), or None if the table is unknown or
+        has been evicted.
+    """
+    return _tables.get(table_id)
+
+
+def _view_positions(table_id, frame, sort=None, ascending=True, search=None):
+    """
+    Row positions of the frame after filtering on `search` and sorting on the
+    `sort` column, or None for the frame as is.
+    """
+    if not sort and not search:
+        return None
+
+    key = (table_id, sort, ascending, search)
+    positions = _views.get(key)
+    if positions is not None:
+        return positions
+
+    positions = np.arange(len(frame))
+    if search:
+        mask = np.zeros(len(frame), dtype=bool)
+        for column in frame.columns:
+            mask |= frame[column].astype(str).str.contains(
+                search, case=False, regex=False).to_numpy()
+        positions = positions[mask]
+
+    if sort:
+        column = pd.Series(frame[sort].to_numpy()[positions])
+        order = column.sort_values(
+            ascending=ascending, kind='stable', na_position='last').index
+        positions = positions[order.to_numpy()]
+
+    _views.set(key, positions)
+    return positions
+
+
+def table_page(table_id, frame, page=1, page_size=50, sort=None, ascending=True,
+               search=None):
+    """
+    Slice one page out of a table, optionally filtered and sorted.
+
+    Only the rows of the requested page are converted to Python objects.
+
+    Args:
+        table_id (str): Identifier of the table, used to cache views of it.
+        frame (pandas.DataFrame): The full table.
+        page (int, optional): 1-based page number. Defaults to 1.
+        page_size (int, optional): Rows per page. Defaults to 50.
+        sort (str, optional): Column to sort on. Defaults to None.
+        ascending (bool, optional): Sort order. Defaults to True.
+        search (str, optional): Keep rows where any cell contains this text,
+            ignoring case. Defaults to None.
+
+    Returns:
+        dict: The page, with keys "columns", "rows" (cells as strings), "page",
+        "pages" and "total".
+
+    Raises:
+        KeyError: If `sort` is not a column of the frame.
+    """
+    if sort and sort not in frame.columns:
+        raise KeyError(sort)
+
+    positions = _view_positions(table_id, frame, sort, ascending, search)
+    total = len(frame) if positions is None else len(positions)
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, page), pages)
+
+    start = (page - 1) * page_size
+    if positions is None:
+        rows = frame.iloc[start:start + page_size]
+    else:
+        rows = frame.iloc[positions[start:start + page_size]]
+
+    return {
+        'columns': [str(column) for column in frame.columns],
+        'rows': [[str(value) for value in row]
+                 for row in rows.itertuples(index=False, name=None)],
+        'page': page,
+        'pages': pages,
+        'total': total,
+    }
+
+
+def request_page(table_id, params):
+    """
+    Slice the page of a registered table that request parameters ask for.
+
+    Args:
+        table_id (str): Identifier of the table.
+        params (werkzeug.datastructures.MultiDict): The parameters, "page"
+            (1-based), "sort" (a column), "order" ("asc" or "desc") and "q"
+            (keep rows where any cell contains this text).
+
+    Returns:
+        dict or None: The page, see `table_page`, or None if the table is
+        unknown or has been evicted.
+
+    Raises:
+        KeyError: If `sort` is not a column of the table.
+    """
+    stored = get_table(table_id)
+    if stored is None:
+        return None
+
+    frame, page_size = stored
+    return table_page(
+        table_id, frame,
+        page=params.get('page', 1, type=int),
+        page_size=page_size,
+        sort=params.get('sort') or None,
+        ascending=params.get('order', 'asc') != 'desc',
+        search=params.get('q') or None)
+
+
+# Markup of outputs/outputtable_html.j2, split around its loops so
+# render_table_html() produces exactly what the template renders.
+_TABLE_START = (
+    '<div class="mt-8 flow-root bg-white">\n'
+    '    <div class="-mx-4 -my-2 overflow-x-auto sm:-mx-6 lg:-mx-8">\n'
+    '        <div class="inline-block min-w-full py-2 align-middle sm:px-6 lg:px-8">\n' # noqa
+    '            <div class="overflow-hidden shadow ring-1 ring-black ring-opacity-5 sm:rounded-lg">\n' # noqa
+    '                <table class="min-w-full divide-y divide-gray-200 border-collapse">\n' # noqa
+    '                    <thead>\n'
+    '                        <tr>\n'
+    '                            '
+)
+_HEADER = (
+    '\n                                <th class="px-6 py-3 bg-gray-50 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">\n' # noqa
+    '                                    {}\n'
+    '                                </th>\n'
+    '                            '
+)
+_BODY_START = (
+    '\n                        </tr>\n'
+    '                    </thead>\n'
+    '                    <tbody class="bg-white divide-y divide-gray-200">\n'
+    '                        '
+)
+_CELL_START = (
+    '\n                                    <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">\n' # noqa
+    '                                        '
+)
+_CELL_END = (
+    '\n                                    </td>\n'
+    '                                '
+)
+_CELL_SEPARATOR = _CELL_END + _CELL_START
+_ROW_START_ODD = ('\n                            <tr class=" bg-gray-50 hover:bg-gray-100">\n' # noqa
+                  '                                ' + _CELL_START)
+_ROW_START_EVEN = ('\n                            <tr class=" hover:bg-gray-100">\n'
+                   '                                ' + _CELL_START)
+_ROW_END = _CELL_END + '\n                            </tr>\n                        '
+_TABLE_END = (
+    '\n                    </tbody>\n'
+    '                </table>\n'
+    '            </div>\n'
+    '        </div>\n'
+    '    </div>\n'
+    '</div>'
+)
+
+
+def _column_strings(column):
+    """
+    Convert a column to the HTML-escaped text of its cells.
+    """
+    values = column.tolist()
+    if isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+        # Missing values show as None, as in DataFrame.to_dict()
+        values = [None if value is pd.NA else value for value in values]
+    elif column.dtype.kind in 'biuf':
+        # The text of numbers and booleans never needs escaping
+        return list(map(str, values))
+    return [str(escape(value)) for value in values]
+
+
+def _table_rows(frame, offset=0):
+    """
+    Markup of the rows of a frame, which starts at row `offset` of its table.
+    """
+    columns = [_column_strings(frame.iloc[:, i]) for i in range(frame.shape[1])]
+    return [
+        (_ROW_START_ODD if i % 2 == 0 else _ROW_START_EVEN)
+        + _CELL_SEPARATOR.join(cells) + _ROW_END
+        for i, cells in enumerate(zip(*columns), start=offset)
+    ]
+
+
+def _uses_template(frame):
+    # Keep the template's behaviour for these edge cases
+    return frame.empty or not frame.columns.is_unique
+
+
+def _table_head(frame):
+    headers = ''.join(_HEADER.format(escape(column)) for column in frame.columns)
+    return _TABLE_START + headers + _BODY_START
+
+
+def render_table_html(frame):
+    """
+    Render a DataFrame as the HTML table of outputs/outputtable_html.j2.
+
+    The markup is identical to the template's, but it is built column-wise
+    from the frame's arrays and joined once, instead of creating a dict per
+    row and running the template loop over every cell.
+
+    Args:
+        frame (pandas.DataFrame): The table to render.
+
+    Returns:
+        str: HTML representation of the table.
+    """
+    if _uses_template(frame):
+        return render_subtemplate(
+            "outputs/outputtable_html.j2",
+            data=frame.to_dict(orient='records'))
+
+    return ''.join((_table_head(frame), *_table_rows(frame), _TABLE_END))
+
+
+def iter_table_html(frame, chunk_size=10000):
+    """
+    Render a DataFrame as the HTML table of outputs/outputtable_html.j2, one
+    batch of rows at a time.
+
+    Only one batch of rows is converted to text at any time, so the markup of
+    very large tables never has to be held in memory as a whole.
+
+    Args:
+        frame (pandas.DataFrame): The table to render.
+        chunk_size (int, optional): Rows per chunk. Defaults to 10000.
+
+    Yields:
+        str: The table start and header, then the rows of each batch, then the
+        end of the table.
+    """
+    if _uses_template(frame):
+        yield render_table_html(frame)
+        return
+
+    yield _table_head(frame)
+    for start in range(0, len(frame), chunk_size):
+        batch = frame.iloc[start:start + chunk_size]
+        yield ''.join(_table_rows(batch, offset=start))
+    yield _TABLE_END
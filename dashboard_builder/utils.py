@@ -1,14 +1,185 @@
 import os
-import sys
+import threading
+from importlib.resources import files
+
+import markdown
+from jinja2 import Environment, FileSystemLoader
+
+from .cache import LRUCache
+
+# Resolved a single time at import; nothing below touches sys.path.
+PACKAGE_ROOT = os.fspath(files(__package__))
+TEMPLATE_DIR = os.path.join(PACKAGE_ROOT, 'components', 'templates')
+
+
+class TemplateRegistry:
+    """
+    Loads and compiles the component subtemplates a single time.
+
+    Every template found under the template directory is compiled into a
+    `jinja2.Template` inside a dedicated `Environment` when the registry is
+    created, so rendering a component only costs a dictionary lookup plus the
+    render itself. With `auto_reload` enabled, templates are instead checked
+    against the file on disk on every lookup, which is useful while developing
+    templates.
+    """
+    def __init__(self, template_dir, auto_reload=False):
+        """
+        Initialize a new instance of the TemplateRegistry.
+
+        Args:
+            template_dir (str): Directory that holds the .j2 subtemplates.
+            auto_reload (bool, optional): Recompile templates when their file
+                changes on disk. Defaults to False.
+        """
+        self.template_dir = template_dir
+        self.environment = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=True,
+            auto_reload=auto_reload,
+        )
+        self._templates = {}
+        self.auto_reload = auto_reload
+        self.load_all()
+
+    def load_all(self):
+        """
+        Compile every .j2 template found in the template directory.
+        """
+        for template_name in self.environment.list_templates(extensions=['j2']):
+            self._templates[template_name] = self.environment.get_template(
+                template_name)
+
+    def set_auto_reload(self, enabled):
+        """
+        Turn the development auto-reload mode on or off.
+
+        Args:
+            enabled (bool): Whether templates should be reloaded when they change.
+        """
+        self.auto_reload = enabled
+        self.environment.auto_reload = enabled
+        if not enabled:
+            self.load_all()
+
+    def get_template(self, template_name):
+        """
+        Retrieve the compiled template for a given subtemplate name.
+
+        Args:
+            template_name (str): Name of the subtemplate relative to the template
+                directory, e.g. "inputs/inputdropdown.j2".
+
+        Returns:
+            jinja2.Template: The compiled template.
+        """
+        if self.auto_reload:
+            return self.environment.get_template(template_name)
+
+        template = self._templates.get(template_name)
+        if template is None:
+            template = self.environment.get_template(template_name)
+            self._templates[template_name] = template
+        return template
+
+    def render(self, template_name, **context):
+        """
+        Render a compiled subtemplate with the given context.
+
+        Returns:
+            str: The rendered HTML.
+        """
+        return self.get_template(template_name).render(**context)
+
+
+subtemplates = TemplateRegistry(TEMPLATE_DIR)
+
+
+def render_subtemplate(template_name, **context):
+    """
+    Render one of the package subtemplates from the compiled template registry.
+
+    Args:
+        template_name (str): Name of the Jinja subtemplate, relative to
+            'components/templates'.
+        **context: Variables passed to the template.
+
+    Returns:
+        str: The rendered HTML.
+
+    Example:
+        >>> render_subtemplate("outputs/outputtext.j2", content="Hello")
+    """
+    return subtemplates.render(template_name, **context)
+
+
+# Converted markdown, keyed by the source text and the extensions used
+_markdown_cache = LRUCache(maxsize=512)
+# One markdown.Markdown instance per thread and set of extensions
+_markdown_converters = threading.local()
+
+
+def _markdown_converter(extensions):
+    converters = getattr(_markdown_converters, 'by_extensions', None)
+    if converters is None:
+        converters = _markdown_converters.by_extensions = {}
+    converter = converters.get(extensions)
+    if converter is None:
+        converter = converters[extensions] = markdown.Markdown(
+            extensions=list(extensions))
+    return converter
+
+
+def render_markdown(text, extensions=()):
+    """
+    Convert markdown to HTML, caching the result.
+
+    Dashboards mostly convert the same static strings (headings of form groups,
+    text outputs) on every request, so conversions are kept in a bounded LRU
+    cache. Conversions that miss the cache reuse a `markdown.Markdown`
+    instance of the current thread, reset between documents, instead of
+    setting up a new converter and its extensions every time.
+
+    Args:
+        text (str): The markdown source. None or an empty string converts to
+            an empty string.
+        extensions (sequence, optional): Names of markdown extensions to use,
+            e.g. ['tables']. Defaults to none.
+
+    Returns:
+        str: The HTML.
+
+    Example:
+        >>> render_markdown("## From Group 1")
+        '<h2>From Group 1</h2>'
+    """
+    if not text:
+        return ''
+
+    extensions = tuple(extensions)
+    key = (text, extensions)
+    html = _markdown_cache.get(key)
+    if html is None:
+        html = _markdown_converter(extensions).reset().convert(text)
+        _markdown_cache.set(key, html)
+    return html
+
+
+def set_template_auto_reload(enabled=True):
+    """
+    Enable or disable reloading of the package subtemplates when they change on
+    disk. Intended for development only; leave disabled in production.
+    """
+    subtemplates.set_auto_reload(enabled)
+
 
 def get_jinja_subtemplate(template_name):
     """
     Retrieves the content of a specified Jinja subtemplate.
 
-    This function assumes that the subtemplate is located under 
-    the 'components/templates' directory, which is relative to the current 
-    file's location. It also adds the parent folder to the system path 
-    (e.g., the root folder of the dashboard_builder package).
+    This function assumes that the subtemplate is located under
+    the 'components/templates' directory of the dashboard_builder package, which
+    is resolved once when the package is imported.
 
     Args:
         template_name (str): Name of the Jinja subtemplate file to be read.
@@ -20,11 +191,10 @@ def get_jinja_subtemplate(template_name):
         >>> get_jinja_subtemplate("inputs/inputdropdown.j2")
 
     Note:
-        This function modifies the system path by inserting a new path at the beginning.
+        Components render through `render_subtemplate`, which uses the
+        pre-compiled template registry instead of reading the file.
     """
-    current_dir = os.path.dirname(__file__)
-    sys.path.insert(0, os.path.abspath(os.path.join(current_dir, "../../")))
-    template_path = os.path.join(current_dir, 'components/templates', template_name)
-    
+    template_path = os.path.join(TEMPLATE_DIR, template_name)
+
     with open(template_path, 'r') as file:
         return file.read()
@@ -2,7 +2,7 @@ from flask import Flask, request
 import plotly.express as px # noqa
 import pandas as pd
 import altair as alt
-from helper_functions import process_data # noqa
+from helper_functions import filter_data, format_table, main_barchart # noqa
 
 df = pd.read_csv('/Users/hantswilliams/Documents/development/python_projects/dashboard-builder/tests/test_app_3/ny_suffolk_nassau.csv') # noqa
 
@@ -18,6 +18,14 @@ from dashboard_builder import DashboardOutput # noqa
 
 app = Flask(__name__)
 
+# Re-use the filtered table for input selections that were seen before. The
+# chart is drawn per request: a cached matplotlib figure would be shared, and
+# drawn, by concurrent requests.
+@dbcm.memoize(maxsize=64, key=lambda df, values: values)
+def filter_table(df, values):
+    output_df = filter_data(df, values)
+    return output_df, format_table(output_df)
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
 
@@ -64,7 +72,8 @@ def index():
     user_selected_3 = intput_group_three.get_input('net_income_selection').value
 
     # Take the user data and process the underlining dataframe based on the user selected values # noqa
-    table, fig = process_data(df, [user_selected_1, user_selected_2, user_selected_3]) # noqa
+    output_df, table = filter_table(df, [user_selected_1, user_selected_2, user_selected_3]) # noqa
+    fig = main_barchart(df, output_df)
 
     # Create dummy altair chart for testing altair parameters 
     altair_sample_chart = alt.Chart(df, width=500, height=500).mark_bar().encode(x='Hospital Name',y='Net Income') # noqa
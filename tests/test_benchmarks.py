@@ -0,0 +1,121 @@
+import importlib.util
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import pytest
+
+from dashboard_builder.components.outputs import OutputChart_Matplotlib
+from dashboard_builder.filters import FilterEngine
+from dashboard_builder.serialization import SERIALIZERS, _default
+from dashboard_builder.tables import render_table_html
+from dashboard_builder.utils import render_subtemplate
+
+HERE = os.path.dirname(__file__)
+LONGISLAND_DIR = os.path.join(HERE, "test_app_longisland")
+
+
+def load_longisland_helpers():
+    spec = importlib.util.spec_from_file_location(
+        "longisland_helpers", os.path.join(LONGISLAND_DIR, "helper_functions.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def best_time(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_benchmark_matplotlib_profiles():
+    helpers = load_longisland_helpers()
+    df = pd.read_csv(os.path.join(LONGISLAND_DIR, "ny_suffolk_nassau.csv"))
+
+    timings = {}
+    for profile in ("default", "fast"):
+        _, fig = helpers.process_data(df, ["Select All", "Select All", "Select All"])
+        output = OutputChart_Matplotlib(fig, profile=profile)
+        assert output.savefig_bytes().startswith(b"\x89PNG")
+        timings[profile] = best_time(output.savefig_bytes, repeat=5)
+
+    # Reported rather than asserted: the gap on a chart this size is within
+    # the noise of a shared CI machine.
+    print("\nmatplotlib profiles on the Long Island bar chart: " + ", ".join(
+        f"{profile} {seconds * 1000:.1f} ms" for profile, seconds in timings.items()))
+
+
+def test_benchmark_table_renderer():
+    def render_with_template(frame):
+        return render_subtemplate(
+            "outputs/outputtable_html.j2", data=frame.to_dict(orient="records"))
+
+    for rows in (1_000, 10_000, 100_000):
+        frame = pd.DataFrame({
+            "id": range(rows),
+            "value": [i * 0.5 for i in range(rows)],
+            "name": [f"<row {i}>" for i in range(rows)],
+            "flag": [i % 2 == 0 for i in range(rows)],
+        })
+        repeat = 3 if rows < 100_000 else 1
+        template = best_time(lambda: render_with_template(frame), repeat)
+        vectorized = best_time(lambda: render_table_html(frame), repeat)
+        if rows == 1_000:
+            assert render_table_html(frame) == render_with_template(frame)
+        print(f"\n{rows} rows: template {rows / template:,.0f} rows/s, "
+              f"column-wise {rows / vectorized:,.0f} rows/s")
+
+
+def test_benchmark_filter_engine():
+    rows = 1_000_000
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "county": pd.Series(rng.choice([f"county {i}" for i in range(50)], rows)),
+        "beds": rng.integers(0, 500, rows),
+    })
+    values = {"county": "county 7", "beds": "small"}
+    engine = (FilterEngine(frame)
+              .equals("county", "county")
+              .ranges("beds", "beds", {"small": (None, 100)}))
+    engine.apply(values)  # build the indexes
+
+    def with_masks():
+        output = frame[frame["county"] == "county 7"]
+        return output[output["beds"] < 100]
+
+    masks = best_time(with_masks)
+    indexed = best_time(lambda: engine.apply(values))
+    assert engine.apply(values).equals(with_masks())
+    print(f"\nfiltering {rows:,} rows: boolean masks {masks * 1000:.1f} ms, "
+          f"filter engine {indexed * 1000:.1f} ms")
+
+
+def test_benchmark_json_serializers():
+    pytest.importorskip("orjson")
+    points = 100_000
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=points), rng.normal(size=points)
+    # An Altair-style list of records and a Plotly-style spec of arrays
+    records = pd.DataFrame({"x": x, "y": y}).to_dict(orient="records")
+    figure = go.Figure(go.Scatter(x=x, y=y, mode="markers"))
+    arrays = {"data": [{"type": "scatter", "x": x, "y": y}]}
+
+    assert json.loads(SERIALIZERS["orjson"](arrays)) == json.loads(
+        json.dumps(arrays, default=_default))
+    timings = {}
+    for name, dumps in SERIALIZERS.items():
+        timings[f"{name} records"] = best_time(lambda: dumps(records))
+        timings[f"{name} arrays"] = best_time(lambda: dumps(arrays))
+    for engine in ("json", "orjson"):
+        timings[f"plotly {engine}"] = best_time(
+            lambda: pio.to_json(figure, validate=False, engine=engine))
+    print(f"\nserializing a {points:,}-point chart: " + ", ".join(
+        f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()))
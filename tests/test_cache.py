@@ -0,0 +1,223 @@
+import fnmatch
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+from dashboard_builder import ComponentManager
+from dashboard_builder.cache import (
+    BaseCache,
+    LRUCache,
+    RedisCache,
+    ShelveCache,
+    SQLiteCache,
+    get_default_cache,
+    memoize,
+    set_default_cache,
+)
+from dashboard_builder.components import outputs
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough of the Redis protocol for RedisCache."""
+
+    def read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            command, args = args[0].upper(), args[1:]
+            now = time.monotonic()
+            for key in [k for k, (_, exp) in store.items() if exp and exp <= now]:
+                del store[key]
+
+            if command == b"GET":
+                reply = self.bulk(store.get(args[0], (None, None))[0])
+            elif command == b"SET":
+                expires = now + int(args[3]) / 1000 if len(args) > 2 else None
+                store[args[0]] = (args[1], expires)
+                reply = b"+OK\r\n"
+            elif command == b"DEL":
+                deleted = sum(store.pop(key, None) is not None for key in args)
+                reply = b":%d\r\n" % deleted
+            elif command == b"PTTL":
+                if args[0] not in store:
+                    reply = b":-2\r\n"
+                elif store[args[0]][1] is None:
+                    reply = b":-1\r\n"
+                else:
+                    remaining = int((store[args[0]][1] - now) * 1000)
+                    reply = b":%d\r\n" % remaining
+            elif command == b"SCAN":
+                pattern = args[2].decode()
+                keys = [k for k in store if fnmatch.fnmatch(k.decode(), pattern)]
+                reply = b"*2\r\n" + self.bulk(b"0") + b"*%d\r\n" % len(keys)
+                reply += b"".join(self.bulk(key) for key in keys)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    block_on_close = False
+
+
+@pytest.fixture
+def redis_server():
+    server = FakeRedisServer(("127.0.0.1", 0), FakeRedisHandler)
+    server.store = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "shelve", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return LRUCache(ttl=60)
+    if request.param == "sqlite":
+        return SQLiteCache(str(tmp_path / "cache.db"), ttl=60)
+    if request.param == "shelve":
+        return ShelveCache(str(tmp_path / "cache"), ttl=60)
+    server = request.getfixturevalue("redis_server")
+    return RedisCache(*server.server_address, ttl=60)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get("b", "missing") == "missing"
+
+def test_lru_cache_ttl_and_stats(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("dashboard_builder.cache.time.monotonic", lambda: now[0])
+
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 0, "maxsize": 2}
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteCache(path).set("key", {"rows": [1, 2, 3]})
+    other = SQLiteCache(path)
+    assert other.get("key") == {"rows": [1, 2, 3]}
+    assert other.get("missing", "default") == "default"
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 2
+
+def test_memoize_keys_on_selected_arguments():
+    calls = []
+
+    @memoize(key=lambda df, values: values)
+    def process(df, values):
+        calls.append(values)
+        return len(calls)
+
+    assert process(object(), ["Select All", "Positive"]) == 1
+    assert process(object(), ["Select All", "Positive"]) == 1
+    assert process(object(), ["Select All", "Negative"]) == 2
+    assert len(calls) == 2
+
+def test_memoize_rejects_unkeyable_arguments():
+    @memoize()
+    def process(df):
+        return df
+
+    with pytest.raises(TypeError):
+        process(object())
+
+def test_backend_interface(backend):
+    backend.set("a", {"html": "<div></div>"})
+    backend.set("b", [1, 2], ttl=None)
+    assert backend.get("a") == {"html": "<div></div>"}
+    assert backend.get("missing", "default") == "default"
+    assert 0 < backend.ttl("a") <= 60
+
+    assert backend.delete("a") is True
+    assert backend.delete("a") is False
+    with pytest.raises(KeyError):
+        backend.ttl("a")
+
+    assert backend.stats()["size"] == 1
+    backend.clear()
+    assert backend.get("b") is None
+
+def test_backends_must_implement_the_interface():
+    class Incomplete(BaseCache):
+        def get(self, key, default=None):
+            return default
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_unreachable_redis_is_a_cache_miss(caplog):
+    # A port nothing listens on
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        address = sock.getsockname()
+    cache = RedisCache(*address, timeout=1)
+
+    @memoize(backend=cache)
+    def double(value):
+        return value * 2
+
+    assert double(2) == 4
+    assert double(2) == 4
+    assert cache.get("missing", "default") == "default"
+    assert cache.misses == 3
+    assert "unavailable" in caplog.text
+
+def test_configure_cache_wires_render_and_memoize(tmp_path):
+    backend = SQLiteCache(str(tmp_path / "cache.db"))
+    ComponentManager.configure_cache(backend=backend)
+    try:
+        @ComponentManager.memoize()
+        def process(value):
+            return value * 2
+
+        assert process(2) == 4
+        assert process.get_cache() is backend
+        outputs.OutputText("shared").render()
+        assert backend.stats()["size"] == 2
+    finally:
+        set_default_cache(None)
+        outputs.disable_render_cache()
+    assert get_default_cache() is None
@@ -0,0 +1,285 @@
+import os
+import re
+
+import pandas as pd
+import plotly.graph_objects as go
+from flask import Flask, request
+
+from dashboard_builder import ComponentManager, DashboardOutput, init_app, tables
+from dashboard_builder.assets import PLOTLY_JS_CDN, PLOTLY_JS_VERSION
+from dashboard_builder.outputs import TemplateManager
+
+app = Flask(__name__)
+init_app(app)
+
+
+def render_dashboard(**kwargs):
+    manager = ComponentManager(request)
+    ComponentManager.create_output_group(
+        manager_instance=manager,
+        outputs=[ComponentManager.Outputs.text("Hello dashboard")]
+    )
+    return DashboardOutput(manager=manager, **kwargs).render()
+
+def test_default_template_is_compiled_once():
+    with app.test_request_context('/'):
+        html = render_dashboard()
+        template = TemplateManager.dashboard_template_compiled('base')
+        assert "Hello dashboard" in html
+        assert TemplateManager.dashboard_template_compiled('base') is template
+
+def test_outputs_are_rendered_once_when_first_read():
+    calls = []
+    with app.test_request_context('/'):
+        manager = ComponentManager(request)
+        ComponentManager.create_output_group(
+            manager_instance=manager,
+            outputs=[ComponentManager.Outputs.text("Hello dashboard")]
+        )
+        render_outputs = manager.render_outputs
+        manager.render_outputs = lambda: calls.append(1) or render_outputs()
+        dashboard = DashboardOutput(manager=manager)
+        assert calls == []
+        assert "Hello dashboard" in dashboard.outputs[0]
+        assert "Hello dashboard" in dashboard.render()
+    assert calls == [1]
+
+def test_page_templates_are_compiled_per_app(tmp_path):
+    (tmp_path / "shout.j2").write_text("{{ 'page'|shout }}")
+    kwargs = dict(template_name="shout.j2", template_path=str(tmp_path))
+    rendered = []
+    for suffix in ("!", "?"):
+        other = Flask(__name__)
+        other.jinja_env.filters["shout"] = lambda value, suffix=suffix: value + suffix
+        with other.test_request_context('/'):
+            rendered.append(render_dashboard(**kwargs))
+    assert rendered == ["page!", "page?"]
+
+def test_custom_template_recompiled_when_modified(tmp_path):
+    template_file = tmp_path / "custom.j2"
+    template_file.write_text("first {{ output_components|length }}")
+
+    with app.test_request_context('/'):
+        kwargs = dict(template_name="custom.j2", template_path=str(tmp_path))
+        assert render_dashboard(**kwargs) == "first 1"
+
+        template_file.write_text("second {{ output_components|length }}")
+        mtime = os.path.getmtime(template_file) + 5
+        os.utime(template_file, (mtime, mtime))
+        assert render_dashboard(**kwargs) == "second 1"
+
+def test_memoize_dashboard_keys_on_captured_values():
+    calls = []
+
+    @ComponentManager.memoize_dashboard()
+    def render(manager):
+        calls.append(manager.captured_values)
+        return DashboardOutput(manager=manager).render()
+
+    for selection in ["A", "A", "B"]:
+        with app.test_request_context('/', method='POST', data={'pick': selection}):
+            manager = ComponentManager(request)
+            ComponentManager.create_input_group(
+                manager_instance=manager,
+                inputs=[ComponentManager.Inputs.dropdown('pick', 'Pick', ['A', 'B'])]
+            )
+            assert 'value="{}"  selected'.format(selection) in render(manager)
+
+    assert calls == [{'pick': 'A'}, {'pick': 'B'}]
+
+
+def render_plotly_dashboard(plotly_js=None, **kwargs):
+    manager = ComponentManager(request)
+    if plotly_js:
+        manager.template_defaults(plotly_js=plotly_js)
+    ComponentManager.create_output_group(
+        manager_instance=manager,
+        outputs=[ComponentManager.Outputs.plotly(go.Figure(go.Bar(y=[1, 2]))),
+                 ComponentManager.Outputs.plotly(go.Figure(go.Bar(y=[3, 4])))]
+    )
+    return DashboardOutput(manager=manager, **kwargs).render()
+
+def test_plotly_js_is_loaded_once_per_page():
+    with app.test_request_context('/'):
+        html = render_plotly_dashboard()
+        assert html.count("<script src=\"{}\"".format(PLOTLY_JS_CDN)) == 1
+        assert html.count("Plotly.newPlot") == 2
+        assert len(html) < 100_000
+
+        assert PLOTLY_JS_CDN not in render_dashboard()
+
+def test_plotly_js_served_locally():
+    with app.test_request_context('/'):
+        html = render_plotly_dashboard(plotly_js='local')
+    url = "/_dashboard_builder/plotly-{}.min.js".format(PLOTLY_JS_VERSION)
+    assert html.count(url) == 1
+
+    response = app.test_client().get(url)
+    assert response.status_code == 200
+    assert response.mimetype == "application/javascript"
+    assert "immutable" in response.headers["Cache-Control"]
+
+def test_plotly_js_added_to_custom_templates_without_it(tmp_path):
+    (tmp_path / "custom.j2").write_text(
+        "{% for output in output_components %}{{ output|safe }}{% endfor %}")
+
+    with app.test_request_context('/'):
+        html = render_plotly_dashboard(
+            template_name="custom.j2", template_path=str(tmp_path))
+    assert html.startswith("<script src=\"{}\"".format(PLOTLY_JS_CDN))
+
+def table_dashboard():
+    manager = ComponentManager(request)
+    ComponentManager.create_output_group(
+        manager_instance=manager,
+        outputs=[ComponentManager.Outputs.text("Before"),
+                 ComponentManager.Outputs.table_html(pd.DataFrame({"n": range(2500)})),
+                 ComponentManager.Outputs.text("After")]
+    )
+    return DashboardOutput(manager=manager)
+
+@app.route('/stream')
+def stream_view():
+    return table_dashboard().stream(chunk_size=1000)
+
+def test_stream_sends_tables_in_chunks():
+    response = app.test_client().get('/stream', buffered=False)
+    chunks = [chunk.decode() for chunk in response.response]
+    assert sum("<tr class" in chunk for chunk in chunks) == 3
+
+    with app.test_request_context('/'):
+        assert "".join(chunks) == table_dashboard().render()
+
+class RecordingOutput:
+    rendered = []
+
+    def render(self):
+        RecordingOutput.rendered.append(self)
+        return "<p>Recorded</p>"
+
+@app.route('/stream-head')
+def stream_head_view():
+    manager = ComponentManager(request)
+    ComponentManager.create_input_group(
+        manager_instance=manager,
+        inputs=[ComponentManager.Inputs.dropdown('pick', 'Pick', ['A', 'B'])]
+    )
+    ComponentManager.create_output_group(
+        manager_instance=manager, outputs=[RecordingOutput()])
+    return DashboardOutput(manager=manager).stream()
+
+def test_stream_sends_head_and_sidebar_before_rendering_outputs():
+    RecordingOutput.rendered.clear()
+    response = app.test_client().get('/stream-head', buffered=False)
+    chunks = iter(response.response)
+
+    head = b""
+    while b'name="pick"' not in head:
+        head += next(chunks)
+    assert b"</head>" in head
+    assert RecordingOutput.rendered == []
+
+    assert b"<p>Recorded</p>" in b"".join(chunks)
+    assert len(RecordingOutput.rendered) == 1
+
+@app.route('/deferred', methods=['GET', 'POST'])
+def deferred_view():
+    manager = ComponentManager(request)
+    ComponentManager.create_input_group(
+        manager_instance=manager,
+        inputs=[ComponentManager.Inputs.dropdown('pick', 'Pick', ['A', 'B'])]
+    )
+    pick = manager.captured_values['pick']
+    ComponentManager.create_output_group(
+        manager_instance=manager,
+        outputs=[ComponentManager.Outputs.text("Above the fold"),
+                 ComponentManager.Outputs.deferred(
+                     ComponentManager.Outputs.text(f"Expensive {pick}"))]
+    )
+    return DashboardOutput(manager=manager).render()
+
+def test_deferred_outputs_load_as_fragments():
+    client = app.test_client()
+    page = client.post('/deferred', data={'pick': 'B'}).get_data(as_text=True)
+    assert "Above the fold" in page
+    assert "Expensive" not in page
+    assert 'id="dashboard-fragment-0"' in page
+    assert '{"pick": "B"}' in page
+
+    fragment = client.post(
+        '/deferred', data={'pick': 'B', '_db_fragment': 'dashboard-fragment-0'})
+    html = fragment.get_data(as_text=True)
+    assert "Expensive B" in html and "Above the fold" not in html
+
+    missing = client.post('/deferred', data={'_db_fragment': 'dashboard-fragment-9'})
+    assert missing.status_code == 404
+
+@app.route('/partial', methods=['GET', 'POST'])
+def partial_view():
+    manager = ComponentManager(request)
+    ComponentManager.create_input_group(
+        manager_instance=manager,
+        inputs=[ComponentManager.Inputs.dropdown('pick', 'Pick', ['A', 'B']),
+                ComponentManager.Inputs.text('note', 'Note')]
+    )
+    values = manager.captured_values
+    ComponentManager.create_output_group(
+        manager_instance=manager,
+        outputs=[ComponentManager.Outputs.dependent(
+                     ComponentManager.Outputs.text(f"Picked {values['pick']}"),
+                     inputs=['pick']),
+                 ComponentManager.Outputs.dependent(
+                     ComponentManager.Outputs.text(f"Noted {values['note']}"),
+                     inputs=['note'])]
+    )
+    return DashboardOutput(manager=manager).render()
+
+def test_partial_updates_render_only_affected_outputs():
+    client = app.test_client()
+    page = client.get('/partial').get_data(as_text=True)
+    assert 'id="dashboard-output-0" data-depends-on="pick"' in page
+    assert page.count("window.dashboardPartialUpdates = true") == 1
+    # Only the dashboard's own forms are submitted as partial updates
+    assert page.count("<form ") == page.count("data-dashboard-form>")
+    assert "form.matches(dashboardForms)" in page
+
+    data = {'pick': 'B', 'note': 'hi', '_db_partial': '1', '_db_changed': 'pick'}
+    fragments = client.post('/partial', data=data).get_json()['fragments']
+    assert list(fragments) == ['dashboard-output-0']
+    assert "Picked B" in fragments['dashboard-output-0']
+    assert "data-depends-on" not in fragments['dashboard-output-0']
+
+@app.route('/table', methods=['GET', 'POST'])
+def table_view():
+    manager = ComponentManager(request)
+    ComponentManager.create_input_group(
+        manager_instance=manager,
+        inputs=[ComponentManager.Inputs.dropdown('pick', 'Pick', ['A', 'B'])]
+    )
+    frame = pd.DataFrame({'n': range(30), 'pick': manager.captured_values['pick']})
+    ComponentManager.create_output_group(
+        manager_instance=manager,
+        outputs=[ComponentManager.Outputs.table_html(frame, page_size=10)]
+    )
+    return DashboardOutput(manager=manager).render()
+
+def test_view_serves_pages_of_tables_this_process_does_not_hold():
+    client = app.test_client()
+    page = client.post('/table', data={'pick': 'B'}).get_data(as_text=True)
+    table_id = re.search(r'id="table-([0-9a-f]+)"', page).group(1)
+
+    # E.g. another worker, or the table was evicted
+    tables._tables.clear()
+    url = f"/_dashboard_builder/tables/{table_id}"
+    assert client.get(url, query_string={'page': 2}).status_code == 404
+
+    data = {'pick': 'B', '_db_table': table_id,
+            '_db_table_query': 'page=2&sort=n&order=desc'}
+    response = client.post('/table', data=data)
+    assert response.get_json()['rows'][0] == ['19', 'B']
+    # The view registered the table again
+    page = client.get(url, query_string={'page': 3}).get_json()
+    assert page['rows'][0] == ['20', 'B']
+
+    data['_db_table'] = 'unknown'
+    assert client.post('/table', data=data).status_code == 404
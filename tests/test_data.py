@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_builder import ComponentManager
+from dashboard_builder import data
+
+
+@pytest.fixture(autouse=True)
+def storage_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "_storage_dir", str(tmp_path / "datasets"))
+    return tmp_path
+
+
+def test_registered_frame_is_memory_mapped():
+    df = pd.DataFrame({"county": ["Nassau", "Suffolk", None], "beds": [10, 20, 30]})
+    ComponentManager.register_dataset("hospitals", df)
+
+    mapped = ComponentManager.get_dataset("hospitals")
+    assert mapped["county"].isna().tolist() == [False, False, True]
+    assert mapped["county"].dropna().tolist() == ["Nassau", "Suffolk"]
+    assert mapped["beds"].tolist() == [10, 20, 30]
+    beds = mapped["beds"].to_numpy()
+    assert isinstance(beds.base, np.memmap) or isinstance(beds, np.memmap)
+    assert not beds.flags.writeable
+
+    # Text columns keep their dtype unless categoricals are asked for
+    assert mapped["county"].dtype == object
+    assert mapped["county"].str.upper().tolist()[:2] == ["NASSAU", "SUFFOLK"]
+    ComponentManager.register_dataset("hospitals", df, categorical=True)
+    shared = ComponentManager.get_dataset("hospitals")["county"]
+    assert isinstance(shared.dtype, pd.CategoricalDtype)
+    assert shared.dropna().tolist() == ["Nassau", "Suffolk"]
+
+
+def test_reregistering_deletes_the_superseded_version(storage_dir):
+    first = ComponentManager.register_dataset("beds", pd.DataFrame({"beds": [1]}))
+    assert (storage_dir / "datasets" / first).is_dir()
+
+    mapped = ComponentManager.get_dataset("beds")
+    second = ComponentManager.register_dataset("beds", pd.DataFrame({"beds": [2]}))
+    assert not (storage_dir / "datasets" / first).exists()
+    assert (storage_dir / "datasets" / second).is_dir()
+    assert mapped["beds"].tolist() == [1]
+
+
+def test_file_source_is_read_once_and_versioned(storage_dir, monkeypatch):
+    path = storage_dir / "towns.csv"
+    pd.DataFrame({"town": ["A", "B"], "people": [1, 2]}).to_csv(path, index=False)
+    first = ComponentManager.register_dataset("towns", str(path))
+
+    # Another worker registering the same file maps the stored copy
+    monkeypatch.setitem(data.READERS, ".csv", pytest.fail)
+    second = ComponentManager.register_dataset("towns", str(path))
+    assert second == first
+    assert data.get_dataset_version("towns") == second
+    assert ComponentManager.get_dataset("towns")["people"].tolist() == [1, 2]
+
+
+def test_unsupported_frame_is_kept_in_memory():
+    df = pd.DataFrame({"tags": [["a"], ["b"]]})
+    with pytest.warns(UserWarning, match="kept in memory"):
+        ComponentManager.register_dataset("tags", df)
+    assert ComponentManager.get_dataset("tags") is df
+
+
+def test_version_is_a_digest_of_the_data():
+    df = pd.DataFrame({"beds": [10, 20]})
+    first = ComponentManager.register_dataset("beds", df, memory_map=False)
+    assert ComponentManager.register_dataset("beds", df.copy()) == first
+    assert ComponentManager.register_dataset("beds", df + 1) != first
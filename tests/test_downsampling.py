@@ -0,0 +1,76 @@
+import json
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from matplotlib.figure import Figure
+
+from dashboard_builder.components.outputs import (
+    OutputChart_Altair,
+    OutputChart_Matplotlib,
+    OutputChart_Plotly,
+)
+from dashboard_builder.downsampling import downsample_indices
+
+POINTS = 100_000
+
+
+def series():
+    x = np.arange(POINTS, dtype=float)
+    y = np.sin(x / 1000)
+    y[54_321] = 10  # a spike both methods must keep
+    return x, y
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsampling_keeps_ends_and_peaks(method):
+    x, y = series()
+    indices = downsample_indices(x, y, 1000, method)
+    assert len(indices) <= 1000
+    assert indices[0] == 0 and indices[-1] == POINTS - 1
+    assert (np.diff(indices) > 0).all()
+    assert 54_321 in indices
+
+
+def test_short_unsorted_or_text_series_are_kept():
+    assert downsample_indices(None, [1, 2, 3], 1000) is None
+    assert downsample_indices([3, 1, 2, 0, 5], [1, 2, 3, 4, 5], 4) is None
+    assert downsample_indices(list("abcde"), [1, 2, 3, 4, 5], 4) is None
+    with pytest.raises(ValueError):
+        downsample_indices(None, [1, 2, 3], 2, method="mean")
+
+
+def test_plotly_traces_are_downsampled():
+    x, y = series()
+    figure = go.Figure(go.Scatter(x=x, y=y, text=[str(v) for v in x]))
+    output = OutputChart_Plotly(figure, max_points=500, typed_arrays=False)
+    trace = output.figure()["data"][0]
+    assert len(trace["x"]) == len(trace["y"]) == len(trace["text"]) == 500
+    assert len(OutputChart_Plotly(figure).render()) > 20 * len(output.render())
+
+
+def test_altair_data_is_downsampled_per_series():
+    x, y = series()
+    frame = pd.DataFrame({"x": np.tile(x[:50_000], 2), "y": np.tile(y[:50_000], 2),
+                          "series": np.repeat(["a", "b"], 50_000)})
+    chart = alt.Chart(frame).mark_line().encode(x="x:Q", y="y", color="series")
+    spec = json.loads(OutputChart_Altair(chart, "t", "c", max_points=1000).chart_json())
+    (values,) = spec["datasets"].values()
+    assert len(values) == 1000
+    assert {row["series"] for row in values} == {"a", "b"}
+
+
+def test_matplotlib_lines_are_restored_after_saving(monkeypatch):
+    x, y = series()
+    fig = Figure()
+    (line,) = fig.add_subplot().plot(x, y)
+    drawn = []
+    savefig = fig.savefig
+    monkeypatch.setattr(fig, "savefig", lambda *args, **kwargs: (
+        drawn.append(len(line.get_xdata())), savefig(*args, **kwargs)))
+
+    OutputChart_Matplotlib(fig, max_points=1000).savefig_bytes()
+    assert drawn == [1000]
+    assert len(line.get_xdata()) == POINTS
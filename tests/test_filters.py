@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_builder import ComponentManager
+from dashboard_builder import data
+
+BEDS = {
+    'hospitals < 100 beds': (None, 100),
+    '100 beds >= hospitals < 300 beds': (100, 300),
+    'hospitals >= 300 beds': (300, None),
+}
+INCOME = {
+    'Positive': pd.Interval(0, np.inf, closed='neither'),
+    'Negative': (None, 0),
+}
+
+
+def mask_filter(df, hospital, beds, income):
+    # The boolean-mask filtering the engine replaces
+    output_df = df
+    if hospital != 'Select All':
+        output_df = output_df[output_df['Hospital Name'] == hospital]
+    if beds != 'Select All':
+        low, high = BEDS[beds]
+        column = output_df['Number of Beds']
+        output_df = output_df[(column >= (low or 0)) & (column < (high or np.inf))]
+    if income != 'Select All':
+        column = output_df['Net Income']
+        output_df = output_df[column > 0 if income == 'Positive' else column < 0]
+    return output_df
+
+
+@pytest.fixture
+def hospitals():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Hospital Name': rng.choice(['A', 'B', 'C', 'D'], 1000),
+        'Number of Beds': rng.integers(0, 500, 1000),
+        'Net Income': rng.normal(0, 1e6, 1000),
+    })
+
+
+def test_filters_match_boolean_masks(hospitals):
+    engine = (ComponentManager.filter_engine(hospitals)
+              .equals('hospital_selection', 'Hospital Name')
+              .ranges('bed_selection', 'Number of Beds', BEDS)
+              .ranges('net_income_selection', 'Net Income', INCOME))
+
+    for hospital in ['Select All', 'A', 'D', 'Z']:
+        for beds in ['Select All', *BEDS]:
+            for income in ['Select All', *INCOME]:
+                values = {'hospital_selection': hospital, 'bed_selection': beds,
+                          'net_income_selection': income}
+                expected = mask_filter(hospitals, hospital, beds, income)
+                pd.testing.assert_frame_equal(engine.apply(values), expected)
+
+    assert engine.apply({'hospital_selection': 'Select All'}) is hospitals
+
+
+def test_indexes_are_rebuilt_for_new_dataset_versions(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, '_storage_dir', str(tmp_path))
+    ComponentManager.register_dataset('counties', pd.DataFrame({'county': ['x', 'y']}))
+    engine = ComponentManager.filter_engine('counties').equals('county', 'county')
+    assert engine.positions({'county': 'y'}).tolist() == [1]
+
+    ComponentManager.register_dataset('counties', pd.DataFrame({'county': ['y', 'y']}))
+    assert engine.positions({'county': 'y'}).tolist() == [0, 1]
+
+
+def test_predicate_and_text_values():
+    df = pd.DataFrame({'year': [2019, 2020, 2019], 'beds': [10, 50, 90]})
+    engine = (ComponentManager.filter_engine(df)
+              .equals('year', 'year')
+              .where('min_beds', lambda frame, value: frame['beds'] >= int(value)))
+    assert engine.positions({'year': '2019', 'min_beds': '20'}).tolist() == [2]
@@ -0,0 +1,44 @@
+import gc
+
+import pandas as pd
+
+from dashboard_builder import ComponentManager
+from dashboard_builder import options
+from dashboard_builder.options import column_options
+
+
+def test_options_are_computed_once_per_frame_and_column(monkeypatch):
+    df = pd.DataFrame({"county": ["Nassau", "Suffolk", "Nassau"]})
+    calls = []
+    distinct_values = options._distinct_values
+    monkeypatch.setattr(options, "_distinct_values",
+                        lambda column: calls.append(1) or distinct_values(column))
+
+    for _ in range(3):
+        dropdown = ComponentManager.Inputs.dropdown("county", "County", (df, "county"))
+    assert dropdown.values == ["Select All", "Nassau", "Suffolk"]
+    assert len(calls) == 1
+
+    frame_id = id(df)
+    del df, dropdown
+    gc.collect()
+    assert frame_id not in options._tracked_frames
+
+
+def test_registered_dataset_options_invalidated_on_replace():
+    ComponentManager.register_dataset("places", pd.DataFrame({"town": ["A", "B"]}))
+    assert column_options("places", "town") == ["A", "B"]
+
+    ComponentManager.register_dataset("places", pd.DataFrame({"town": ["C"]}))
+    dropdown = ComponentManager.Inputs.dropdown("town", "Town", ("places", "town"))
+    assert dropdown.values == ["Select All", "C"]
+
+
+def test_categorical_options_match_unique():
+    column = pd.Series(pd.Categorical(["b", "a", None, "b", "c"],
+                                      categories=["c", "b", "a", "d"]))
+    frame = pd.DataFrame({"letter": column})
+    expected = column.unique().tolist()
+    result = column_options(frame, "letter")
+    assert result[:2] == expected[:2] == ["b", "a"]
+    assert pd.isna(result[2]) and result[3:] == expected[3:] == ["c"]
@@ -0,0 +1,270 @@
+import base64
+import os
+import re
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import altair as alt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import plotly.graph_objects as go  # noqa: E402
+import pytest  # noqa: E402
+from flask import Flask  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from dashboard_builder import assets, init_app  # noqa: E402
+from dashboard_builder.cache import LRUCache, set_default_cache  # noqa: E402
+from dashboard_builder.components.outputs import (  # noqa: E402
+    MatplotlibProfile,
+    OutputChart_Altair,
+    OutputChart_Matplotlib,
+    OutputChart_Plotly,
+    OutputMarkdown,
+    OutputTable_HTML,
+    OutputText,
+    disable_render_cache,
+    enable_render_cache,
+    render_cache_stats,
+)
+from dashboard_builder.theme_utils import set_global_theme  # noqa: E402
+from dashboard_builder.utils import render_subtemplate  # noqa: E402
+
+app = Flask(__name__)
+init_app(app)
+
+
+def small_figure():
+    fig = Figure(figsize=(2, 2))
+    fig.add_subplot().plot([1, 2, 3])
+    return fig
+
+
+def test_render_cache_serves_unchanged_outputs():
+    enable_render_cache(maxsize=8)
+    try:
+        first = OutputMarkdown("## Static explainer").render()
+        second = OutputMarkdown("## Static explainer").render()
+        assert first == second
+        assert render_cache_stats()["hits"] == 1
+        assert render_cache_stats()["misses"] == 1
+
+        OutputMarkdown("## Something else").render()
+        assert render_cache_stats()["misses"] == 2
+    finally:
+        disable_render_cache()
+
+def test_render_cache_key_depends_on_type_content_and_theme():
+    assert OutputText("a").cache_key() == OutputText("a").cache_key()
+    assert OutputText("a").cache_key() != OutputText("b").cache_key()
+    assert OutputText("a").cache_key() != OutputMarkdown("a").cache_key()
+
+    key = OutputText("a").cache_key()
+    set_global_theme("dark")
+    try:
+        assert OutputText("a").cache_key() != key
+    finally:
+        set_global_theme("light")
+
+def test_table_cache_key_tracks_dataframe_content():
+    df = pd.DataFrame({"name": ["a", "b"], "value": [1, 2]})
+    key = OutputTable_HTML(df).cache_key()
+    assert OutputTable_HTML(df.copy()).cache_key() == key
+
+    changed = df.copy()
+    changed.loc[1, "value"] = 3
+    assert OutputTable_HTML(changed).cache_key() != key
+
+def test_chart_cache_keys_hash_data_without_serializing_it(monkeypatch):
+    x = np.arange(1000, dtype="float64")
+    key = OutputChart_Plotly(go.Figure(go.Scatter(x=x, y=x))).cache_key()
+    assert OutputChart_Plotly(go.Figure(go.Scatter(x=x, y=x))).cache_key() == key
+    changed = go.Figure(go.Scatter(x=x, y=x + 1))
+    assert OutputChart_Plotly(changed).cache_key() != key
+    titled = go.Figure(go.Scatter(x=x, y=x), layout={"title": "t"})
+    assert OutputChart_Plotly(titled).cache_key() != key
+    labelled = go.Figure(go.Scatter(x=["a", "b"], y=[1, 2]))
+    assert OutputChart_Plotly(labelled).cache_key() != \
+        OutputChart_Plotly(go.Figure(go.Scatter(x=["a", "c"], y=[1, 2]))).cache_key()
+
+    df = pd.DataFrame({"x": x, "y": x})
+    key = OutputChart_Altair(alt.Chart(df).mark_line().encode(x="x", y="y"),
+                             "t", "c").cache_key()
+    df.loc[999, "y"] = 0
+    changed = alt.Chart(df).mark_line().encode(x="x", y="y")
+    assert OutputChart_Altair(changed, "t", "c").cache_key() != key
+    points = alt.Chart(df).mark_point().encode(x="x", y="y")
+    assert OutputChart_Altair(points, "t", "c").cache_key() != \
+        OutputChart_Altair(changed, "t", "c").cache_key()
+
+    # An explicit key skips hashing the figure
+    monkeypatch.setattr(go.Figure, "to_dict", None)
+    figure = go.Figure(go.Scatter(x=x, y=x))
+    assert OutputChart_Plotly(figure, cache_key="k").cache_key() == \
+        OutputChart_Plotly(go.Figure(), cache_key="k").cache_key()
+
+def test_matplotlib_url_mode_serves_image_from_asset_route(monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "_asset_dir", str(tmp_path))
+    fig = small_figure()
+    with app.test_request_context('/'):
+        html = OutputChart_Matplotlib(fig, mode="url", format="svg").render()
+        again = OutputChart_Matplotlib(fig, mode="url", format="svg").render()
+    assert "base64" not in html
+    assert html == again
+
+    url = re.search(r'src="([^"]+)"', html).group(1)
+    response = app.test_client().get(url)
+    assert response.status_code == 200
+    assert response.mimetype == "image/svg+xml"
+    assert "immutable" in response.headers["Cache-Control"]
+    assert response.data.lstrip().startswith(b"<?xml")
+
+    etag = response.headers["ETag"]
+    cached = app.test_client().get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    # Without a cache backend assets are files, so every worker finds them
+    with app.test_request_context('/'):
+        for i in range(200):
+            assets.store_asset(str(i).encode(), "text/plain", "txt")
+    assert app.test_client().get(url).status_code == 200
+    missing = app.test_client().get("/_dashboard_builder/assets/..%2Fx.png")
+    assert missing.status_code == 404
+
+def test_altair_data_url_mode_serves_data_separately(monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "_asset_dir", str(tmp_path))
+    df = pd.DataFrame({"county": ["Nassau", "Suffolk"], "beds": [120, 80]})
+    bars = alt.Chart(df).mark_bar().encode(x="county", y="beds")
+    with app.test_request_context('/'):
+        first = OutputChart_Altair(bars, "Beds", "bars", data_url=True).render()
+        second = OutputChart_Altair(
+            bars.mark_point(), "Beds", "points", data_url=True).render()
+    assert "Suffolk" not in first
+
+    # Charts of the same data load it from the same URL
+    urls = [re.search(r'const urls = (\{.*\});', html).group(1)
+            for html in (first, second)]
+    assert urls[0] == urls[1]
+    url = re.search(r'"(/_dashboard_builder/data/[^"]+)"', urls[0]).group(1)
+
+    client = app.test_client()
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "immutable" in compressed.headers["Cache-Control"]
+    plain = client.get(url)
+    assert plain.json == [{"county": "Nassau", "beds": 120},
+                          {"county": "Suffolk", "beds": 80}]
+
+def test_assets_are_kept_in_a_configured_cache_backend(monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "_asset_dir", str(tmp_path))
+    backend = LRUCache(maxsize=16)
+    set_default_cache(backend)
+    try:
+        with app.test_request_context('/'):
+            url = assets.store_asset(b"<svg/>", "image/svg+xml", "svg")
+            data_url = assets.store_chart_data([{"a": 1}])
+        client = app.test_client()
+        assert client.get(url).data == b"<svg/>"
+        assert client.get(data_url).json == [{"a": 1}]
+    finally:
+        set_default_cache(None)
+    assert len(backend) == 2
+    assert list(tmp_path.iterdir()) == []
+
+def test_prune_assets_deletes_old_and_least_recently_stored_assets(
+        monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "_asset_dir", str(tmp_path))
+    with app.test_request_context('/'):
+        old, used, new = (assets.store_asset(data, "text/plain", "txt")
+                          for data in (b"old", b"used", b"new" * 100))
+        hour_ago = time.time() - 3600
+        for path in tmp_path.iterdir():
+            os.utime(path, (hour_ago, hour_ago))
+        # Storing an asset again marks it as used
+        assets.store_asset(b"used", "text/plain", "txt")
+        assets.store_asset(b"new" * 100, "text/plain", "txt")
+
+    client = app.test_client()
+    assert assets.prune_assets(max_age=60) == 1
+    assert client.get(old).status_code == 404
+    assert client.get(used).status_code == 200
+    assert assets.prune_assets(max_size=320) == 1
+    assert client.get(used).status_code == 404
+    assert client.get(new).data == b"new" * 100
+    assert len(list(tmp_path.iterdir())) == 2
+
+def test_matplotlib_inline_mode_uses_requested_format():
+    html = OutputChart_Matplotlib(small_figure(), format="webp", dpi=50).render()
+    assert 'src="data:image/webp;base64,' in html
+
+
+def test_matplotlib_profile_restores_the_figure():
+    fig = Figure(figsize=(2, 2))
+    ax = fig.add_subplot()
+    line, = ax.plot(np.arange(6000))
+    profile = MatplotlibProfile(layout_engine="tight", rasterize_threshold=5000)
+    OutputChart_Matplotlib(fig, format="svg", profile=profile).savefig_bytes()
+    assert fig.get_layout_engine() is None
+    assert not line.get_rasterized()
+
+    fig.set_layout_engine("constrained")
+    engine = fig.get_layout_engine()
+    OutputChart_Matplotlib(fig, profile=profile).savefig_bytes()
+    assert fig.get_layout_engine() is engine
+
+def test_matplotlib_fast_profile_skips_tight_bbox():
+    output = OutputChart_Matplotlib(small_figure(), profile="fast")
+    assert output.profile.savefig_kwargs("png")["bbox_inches"] is None
+    assert output.savefig_bytes().startswith(b"\x89PNG")
+
+    with pytest.raises(ValueError):
+        OutputChart_Matplotlib(small_figure(), profile="unknown")
+
+
+def test_paginated_table_renders_first_page_and_serves_the_rest():
+    df = pd.DataFrame({"n": range(250), "name": [f"row {i}" for i in range(250)]})
+    table = OutputTable_HTML(df, page_size=100)
+
+    with app.test_request_context("/"):
+        html = table.render()
+    assert "row 99" in html and "row 100" not in html
+    assert "Page 1 of 3 (250 rows)" in html
+
+    client = app.test_client()
+    url = f"/_dashboard_builder/tables/{table.table_id}"
+    page = client.get(url, query_string={"page": 3}).get_json()
+    assert page["rows"][0] == ["200", "row 200"] and len(page["rows"]) == 50
+
+    page = client.get(url, query_string={"sort": "n", "order": "desc"}).get_json()
+    assert page["rows"][0] == ["249", "row 249"]
+
+    page = client.get(url, query_string={"q": "ROW 12"}).get_json()
+    assert page["total"] == 11 and page["pages"] == 1
+
+    assert client.get(url, query_string={"sort": "missing"}).status_code == 400
+    assert client.get("/_dashboard_builder/tables/unknown").status_code == 404
+
+
+def test_table_renderer_matches_the_template():
+    df = pd.DataFrame({
+        "n": [1, 2, 3],
+        "<name>": ["a & b", None, "<i>"],
+        "score": pd.array([1, None, 3], dtype="Int64"),
+        "when": pd.to_datetime(["2020-01-01", None, "2021-06-30"]),
+    })
+    expected = render_subtemplate(
+        "outputs/outputtable_html.j2", data=df.to_dict(orient="records"))
+    assert OutputTable_HTML(df).render() == expected
+
+def test_plotly_large_scatter_uses_webgl_and_typed_arrays():
+    x = np.arange(60_000, dtype="int64")
+    figure = go.Figure([go.Scatter(x=x, y=x * 0.5), go.Scatter(x=[1, 2], y=[3, 4])])
+    large, small = OutputChart_Plotly(figure, typed_arrays=True).figure()["data"]
+    assert large["type"] == "scattergl"
+    assert small.get("type", "scatter") == "scatter"
+    assert large["x"]["dtype"] == "i4" and large["y"]["dtype"] == "f8"
+    assert np.array_equal(
+        np.frombuffer(base64.b64decode(large["y"]["bdata"]), "<f8"), x * 0.5)
+
+    kept = OutputChart_Plotly(figure, webgl_threshold=None, typed_arrays=False)
+    assert kept.figure() is figure
@@ -0,0 +1,140 @@
+import re
+
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from flask import Flask, request
+
+from dashboard_builder import ComponentManager, DashboardOutput, init_app, tables
+
+app = Flask(__name__)
+app.secret_key = "test"
+init_app(app)
+
+
+@ComponentManager.producer(inputs=['pick'])
+def pick_output(pick):
+    return ComponentManager.Outputs.text(f"Picked {pick}")
+
+
+@ComponentManager.producer(inputs=['note'])
+def note_output(note):
+    return ComponentManager.Outputs.text(f"Noted {note}")
+
+
+
+@app.route('/', methods=['GET', 'POST'])
+def index():
+    manager = ComponentManager(request)
+    ComponentManager.create_input_group(
+        manager_instance=manager,
+        inputs=[ComponentManager.Inputs.dropdown('pick', 'Pick', ['A', 'B']),
+                ComponentManager.Inputs.text('note', 'Note')]
+    )
+    manager.register_producers(pick_output, note_output)
+    return DashboardOutput(manager=manager).render()
+
+
+def test_only_outputs_with_changed_inputs_are_recomputed():
+    client = app.test_client()
+    before = (pick_output.computations, note_output.computations)
+
+    assert "Picked A" in client.post('/', data={'pick': 'A', 'note': 'x'}).text
+
+    html = client.post('/', data={'pick': 'B', 'note': 'x'}).text
+    assert "Picked B" in html and "Noted x" in html
+
+    assert pick_output.computations - before[0] == 2
+    assert note_output.computations - before[1] == 1
+
+
+def test_produced_outputs_take_part_in_partial_updates():
+    client = app.test_client()
+    client.post('/', data={'pick': 'A', 'note': 'x'})
+    data = {'pick': 'A', 'note': 'y', '_db_partial': '1', '_db_changed': 'note'}
+    fragments = client.post('/', data=data).get_json()['fragments']
+    assert list(fragments) == ['dashboard-output-1']
+    assert "Noted y" in fragments['dashboard-output-1']
+
+
+def test_partial_updates_include_inputs_changed_since_the_sessions_last_request():
+    client = app.test_client()
+    client.post('/', data={'pick': 'A', 'note': 'x'})
+    # E.g. another tab picked B, which this page does not know about
+    client.post('/', data={'pick': 'B', 'note': 'x'})
+    data = {'pick': 'A', 'note': 'x', '_db_partial': '1'}
+    fragments = client.post('/', data=data).get_json()['fragments']
+    assert list(fragments) == ['dashboard-output-0']
+    assert "Picked A" in fragments['dashboard-output-0']
+
+    # Nothing changed since the previous request
+    assert client.post('/', data=data).get_json()['fragments'] == {}
+
+
+@ComponentManager.producer(inputs=['pick'])
+def pick_chart(pick):
+    return ComponentManager.Outputs.plotly(go.Figure(go.Bar(y=[1, 2], name=pick)))
+
+
+@app.route('/chart', methods=['GET', 'POST'])
+def chart():
+    manager = ComponentManager(request)
+    ComponentManager.create_input_group(
+        manager_instance=manager,
+        inputs=[ComponentManager.Inputs.dropdown('pick', 'Pick', ['A', 'B'])]
+    )
+    manager.register_producers(pick_chart)
+    return DashboardOutput(manager=manager).render()
+
+
+def test_pages_with_produced_plotly_charts_load_plotly_js():
+    client = app.test_client()
+    for pick in ('A', 'A', 'B'):
+        html = client.post('/chart', data={'pick': pick}).text
+        assert "Plotly.newPlot" in html
+        assert html.count('cdn.plot.ly/plotly-') == 1
+
+    # A producer known to return other components does not load plotly.js
+    client.post('/', data={'pick': 'A', 'note': 'x'})
+    html = client.post('/', data={'pick': 'B', 'note': 'z'}).text
+    assert 'cdn.plot.ly' not in html
+
+
+@ComponentManager.producer(inputs=['pick'])
+def pick_table(pick):
+    frame = pd.DataFrame({'n': range(30), 'pick': pick})
+    return ComponentManager.Outputs.table_html(frame, page_size=10)
+
+
+@ComponentManager.producer(inputs=['pick'])
+def pick_deferred(pick):
+    return ComponentManager.Outputs.deferred(ComponentManager.Outputs.text(pick))
+
+
+@app.route('/table', methods=['GET', 'POST'])
+def table():
+    manager = ComponentManager(request)
+    ComponentManager.create_input_group(
+        manager_instance=manager,
+        inputs=[ComponentManager.Inputs.dropdown('pick', 'Pick', ['A', 'B'])]
+    )
+    manager.register_producers(pick_table)
+    return DashboardOutput(manager=manager).render()
+
+
+def test_produced_paginated_tables_are_registered_on_every_render():
+    client = app.test_client()
+    client.post('/table', data={'pick': 'A'})
+    tables._tables.clear()
+
+    html = client.post('/table', data={'pick': 'A'}).text
+    table_id = re.search(r'id="table-([0-9a-f]+)"', html).group(1)
+    url = f'/_dashboard_builder/tables/{table_id}'
+    page = client.get(url, query_string={'page': 2}).get_json()
+    assert page['rows'][0] == ['10', 'A']
+
+
+def test_producers_cannot_return_deferred_outputs():
+    with app.test_request_context('/'):
+        with pytest.raises(TypeError, match="wrap the produced output"):
+            pick_deferred.output({'pick': 'A'}).render()
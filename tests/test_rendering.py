@@ -0,0 +1,107 @@
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import pytest  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from dashboard_builder.components.layouts import (  # noqa: E402
+    ColumnLayout,
+    ExpanderLayout,
+)
+from dashboard_builder.components.outputs import (  # noqa: E402
+    OutputChart_Matplotlib,
+    OutputText,
+)
+from dashboard_builder.rendering import (  # noqa: E402
+    configure_rendering,
+    render_components,
+    shutdown_rendering,
+)
+
+
+class SlowOutput:
+    def __init__(self, content, delay=0.2):
+        self.content = content
+        self.delay = delay
+
+    def render(self):
+        time.sleep(self.delay)
+        return self.content
+
+
+class FailingOutput:
+    def render(self):
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def thread_rendering():
+    configure_rendering(executor="thread", max_workers=4, timeout=1)
+    yield
+    shutdown_rendering()
+
+
+def test_sequential_rendering_is_the_default():
+    assert render_components([OutputText("a"), OutputText("b")]) == [
+        OutputText("a").render(), OutputText("b").render()]
+
+
+def test_thread_executor_renders_concurrently_in_order(thread_rendering):
+    outputs = [SlowOutput(str(i)) for i in range(4)]
+    start = time.perf_counter()
+    assert render_components(outputs) == ["0", "1", "2", "3"]
+    assert time.perf_counter() - start < 0.6
+
+
+def test_timeout_counts_from_when_a_component_starts():
+    configure_rendering(executor="thread", max_workers=2, timeout=1)
+    try:
+        outputs = [SlowOutput(str(i), delay=0.6) for i in range(4)]
+        assert render_components(outputs) == ["0", "1", "2", "3"]
+    finally:
+        shutdown_rendering()
+
+
+def test_components_queued_behind_a_timed_out_one_do_not_hang_the_page():
+    configure_rendering(executor="thread", max_workers=1, timeout=0.5)
+    try:
+        start = time.perf_counter()
+        html = render_components([SlowOutput("hung", delay=3), OutputText("fine")])
+        assert time.perf_counter() - start < 1.5
+        assert "SlowOutput could not be rendered: timed out" in html[0]
+        assert "OutputText could not be rendered: timed out" in html[1]
+    finally:
+        shutdown_rendering()
+
+
+def test_layout_children_are_rendered_from_the_shared_pool(thread_rendering):
+    column = ColumnLayout(2)
+    column.add_to_column(0, SlowOutput("left"))
+    column.add_to_column(1, ExpanderLayout("More", "more", [SlowOutput("inner")]))
+
+    start = time.perf_counter()
+    html, last = render_components([column, SlowOutput("last")])
+    assert time.perf_counter() - start < 0.5
+    assert html.index("left") < html.index("inner")
+    assert last == "last"
+
+
+def test_failures_and_timeouts_are_isolated(thread_rendering):
+    html = render_components(
+        [FailingOutput(), SlowOutput("slow", delay=2), OutputText("fine")])
+    assert "FailingOutput could not be rendered: RuntimeError" in html[0]
+    assert "SlowOutput could not be rendered: timed out" in html[1]
+    assert html[2] == OutputText("fine").render()
+
+
+def test_process_executor_rasterizes_matplotlib_figures():
+    fig = Figure(figsize=(2, 2))
+    fig.add_subplot().plot([1, 2, 3])
+    expected = OutputChart_Matplotlib(fig).render()
+
+    configure_rendering(executor="process", max_workers=2)
+    try:
+        assert render_components([OutputChart_Matplotlib(fig)]) == [expected]
+    finally:
+        shutdown_rendering()
@@ -0,0 +1,44 @@
+import datetime
+import json
+
+import numpy as np
+import plotly.io as pio
+import pytest
+
+from dashboard_builder import serialization
+from dashboard_builder.serialization import dumps_json, set_json_serializer
+
+PAYLOAD = {
+    "x": np.arange(3),
+    "y": np.array([0.5, 1.5, 2.5]),
+    "count": np.int64(3),
+    "day": datetime.date(2019, 1, 1),
+}
+EXPECTED = {"x": [0, 1, 2], "y": [0.5, 1.5, 2.5], "count": 3, "day": "2019-01-01"}
+
+
+@pytest.fixture(autouse=True)
+def restore_serializer():
+    yield
+    set_json_serializer("auto")
+
+
+@pytest.mark.parametrize("serializer", ["json", "orjson"])
+def test_named_serializers_support_numpy(serializer):
+    pytest.importorskip(serializer)
+    set_json_serializer(serializer)
+    assert json.loads(dumps_json(PAYLOAD)) == EXPECTED
+    assert pio.json.config.default_engine == serializer
+
+
+def test_auto_falls_back_to_the_standard_library(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    set_json_serializer("auto")
+    assert dumps_json({"a": 1}) == '{"a": 1}'
+    with pytest.raises(ImportError):
+        set_json_serializer("orjson")
+
+
+def test_custom_serializer():
+    set_json_serializer(lambda obj: "custom")
+    assert dumps_json({"a": 1}) == "custom"
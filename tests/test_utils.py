@@ -0,0 +1,58 @@
+import os
+import sys
+
+from dashboard_builder.utils import (
+    TemplateRegistry,
+    get_jinja_subtemplate,
+    render_markdown,
+    render_subtemplate,
+    subtemplates,
+)
+
+
+def test_subtemplates_are_compiled_once():
+    first = subtemplates.get_template("outputs/outputtext.j2")
+    second = subtemplates.get_template("outputs/outputtext.j2")
+    assert first is second
+
+def test_render_markdown_is_cached(monkeypatch):
+    from dashboard_builder import utils
+    from markdown import markdown
+
+    converted = []
+    converter = utils._markdown_converter
+    monkeypatch.setattr(utils, "_markdown_converter",
+                        lambda extensions: converted.append(1) or converter(extensions))
+
+    text = "## Cached heading\n\nSome *text*"
+    assert render_markdown(text) == render_markdown(text) == markdown(text)
+    assert len(converted) == 1
+    assert render_markdown("| a |\n|---|\n| 1 |", extensions=["tables"]).startswith(
+        "<table>")
+    assert render_markdown(None) == render_markdown("") == ""
+
+def test_render_subtemplate_without_app_context():
+    html = render_subtemplate("outputs/outputtext.j2", content="<b>hello</b>")
+    assert "&lt;b&gt;hello&lt;/b&gt;" in html
+
+def test_registry_auto_reload(tmp_path):
+    template_file = tmp_path / "sample.j2"
+    template_file.write_text("first {{ value }}")
+
+    registry = TemplateRegistry(str(tmp_path))
+    assert registry.render("sample.j2", value=1) == "first 1"
+
+    template_file.write_text("second {{ value }}")
+    mtime = os.path.getmtime(template_file) + 5
+    os.utime(template_file, (mtime, mtime))
+    assert registry.render("sample.j2", value=1) == "first 1"
+
+    registry.set_auto_reload(True)
+    assert registry.render("sample.j2", value=1) == "second 1"
+
+def test_rendering_does_not_grow_sys_path():
+    path_length = len(sys.path)
+    for _ in range(10000):
+        render_subtemplate("outputs/outputtext.j2", content="hello")
+        get_jinja_subtemplate("outputs/outputtext.j2")
+    assert len(sys.path) == path_length